@@ -36,9 +36,15 @@ from features.quick_button import QuickButtonMixin
 # UI 믹스인
 from ui.overlay import OverlayMixin
 from ui.main_window import MainWindowMixin
+from ui.key_capture import KeyCaptureMixin
 
 # 유틸리티 믹스인
 from utils.updater import UpdaterMixin
+from utils.screen_capture import ScreenCapture
+from utils.input_backend import default_input_backend
+from utils.hotkeys import NO_MODIFIER, HotkeyDispatcher, is_mouse_key
+from utils.mouse_hook import MouseHookService
+from utils.target_sweep import DEFAULT_POLICY
 
 
 class ColorClickerApp(
@@ -53,6 +59,7 @@ class ColorClickerApp(
     QuickButtonMixin,
     OverlayMixin,
     MainWindowMixin,
+    KeyCaptureMixin,
     UpdaterMixin
 ):
     """메인 애플리케이션 클래스"""
@@ -101,6 +108,15 @@ class ColorClickerApp(
 
     def init_common_vars(self):
         """공통 변수 초기화"""
+        # 공유 화면 캡처 서비스
+        self.screen_capture = ScreenCapture()
+        # 입력 백엔드 (SendInput 묶음 전송)
+        self.input_backend = default_input_backend()
+        # 핫키 디스패처 (훅 하나 + (키, 조합키) 테이블)
+        self.hotkeys = HotkeyDispatcher()
+        # 마우스 버튼 이벤트 (저수준 훅 하나 → 구독자)
+        self.mouse_hook = MouseHookService()
+
         # 월드보스 알림
         self.boss_alert_enabled = ctk.BooleanVar(value=True)
         self.boss_alerted_id = None
@@ -136,48 +152,53 @@ class ColorClickerApp(
     # 핫키 관련
     # =========================================
     def setup_hotkey(self):
-        """핫키 설정 - 5개 스킬 프리셋 지원"""
+        """핫키 설정 - 훅은 한 번만 걸고, 바뀐 바인딩만 테이블에서 교체 (5개 스킬 프리셋 지원)"""
         with self._hotkey_lock:
-            keyboard.unhook_all()
-            # 키보드 핫키 등록 (마우스 버튼 제외)
-            if not self.is_mouse_key(self.trigger_key.get()):
-                keyboard.on_press_key(self.trigger_key.get(), self.on_trigger_key, suppress=False)
-            if not self.is_mouse_key(self.inv_trigger_key.get()):
-                keyboard.on_press_key(self.inv_trigger_key.get(), self.on_inv_trigger_key, suppress=False)
-            if not self.is_mouse_key(self.discard_trigger_key.get()):
-                keyboard.on_press_key(self.discard_trigger_key.get(), self.on_discard_trigger_key, suppress=False)
-            if not self.is_mouse_key(self.sell_trigger_key.get()):
-                keyboard.on_press_key(self.sell_trigger_key.get(), self.on_sell_trigger_key, suppress=False)
-            if not self.is_mouse_key(self.consume_trigger_key.get()):
-                keyboard.on_press_key(self.consume_trigger_key.get(), self.on_consume_trigger_key, suppress=False)
-            if not self.is_mouse_key(self.consume2_trigger_key.get()):
-                keyboard.on_press_key(self.consume2_trigger_key.get(), self.on_consume2_trigger_key, suppress=False)
-
-            # 5개 스킬 프리셋 각각의 핫키 등록
-            for i, preset in enumerate(self.skill_presets):
-                key = preset['trigger_key'].get()
-                if not self.is_mouse_key(key):
-                    # 클로저로 인덱스 캡처
-                    keyboard.on_press_key(
-                        key,
-                        lambda e, idx=i: self.on_skill_preset_trigger_key(idx, e),
-                        suppress=False
-                    )
-
-            # Enter로 pause/resume (스킬 자동 + 사기)
-            keyboard.on_press_key('enter', self.on_combined_enter_pause, suppress=False)
-
-            # 긴급 정지 키 등록
-            if not self.is_mouse_key(self.emergency_stop_key.get()):
-                keyboard.on_press_key(self.emergency_stop_key.get(), self.on_emergency_stop, suppress=False)
-
-            # 마우스 폴링 시작 (한 번만)
-            if not hasattr(self, 'mouse_polling_active') or not self.mouse_polling_active:
-                self.start_mouse_polling()
+            self.hotkeys.install()
+            # 키 입력 다이얼로그 리스너 정리
+            self.hotkeys.clear_transient()
+            self.mouse_hook.clear_transient()
+
+            for name, key, modifier, handler in self._hotkey_bindings():
+                self.hotkeys.bind(name, key, modifier, handler)
+
+            # 키 입력 시 빠른 버튼 감지 주기를 즉시 최소로 (인벤토리 열기 등) - 한 번만
+            if not getattr(self, '_quick_kick_listener', None):
+                self._quick_kick_listener = self.hotkeys.listen(lambda e: self.quick_poller.kick())
+
+            # 마우스 훅 시작 (한 번만)
+            if not self.mouse_hook.running:
+                self.start_mouse_hook()
+
+    def _hotkey_bindings(self):
+        """(이름, 키, 조합키, 핸들러) 목록 - 마우스 버튼도 같은 테이블로 처리"""
+        if not hasattr(self, '_skill_hotkey_handlers'):
+            # 바인딩 비교용으로 핸들러 객체를 고정 (클로저로 인덱스 캡처)
+            self._skill_hotkey_handlers = [
+                lambda e, idx=i: self.on_skill_preset_trigger_key(idx, e)
+                for i in range(len(self.skill_presets))
+            ]
+        bindings = [
+            ('belial', self.trigger_key.get(), self.trigger_modifier.get(), self.on_trigger_key),
+            ('inventory', self.inv_trigger_key.get(), self.inv_trigger_modifier.get(), self.on_inv_trigger_key),
+            ('discard', self.discard_trigger_key.get(), self.discard_trigger_modifier.get(), self.on_discard_trigger_key),
+            ('sell', self.sell_trigger_key.get(), self.sell_trigger_modifier.get(), self.on_sell_trigger_key),
+            ('consume', self.consume_trigger_key.get(), self.consume_trigger_modifier.get(), self.on_consume_trigger_key),
+            ('consume2', self.consume2_trigger_key.get(), self.consume2_trigger_modifier.get(), self.on_consume2_trigger_key),
+        ]
+        # 5개 스킬 프리셋 각각의 핫키
+        for i, preset in enumerate(self.skill_presets):
+            bindings.append((f'skill_p{i}', preset['trigger_key'].get(), preset['trigger_modifier'].get(),
+                             self._skill_hotkey_handlers[i]))
+        # Enter로 pause/resume (스킬 자동 + 사기)
+        bindings.append(('enter_pause', 'enter', NO_MODIFIER, self.on_combined_enter_pause))
+        # 긴급 정지 (조합키 없이)
+        bindings.append(('emergency_stop', self.emergency_stop_key.get(), NO_MODIFIER, self.on_emergency_stop))
+        return bindings
 
     def is_mouse_key(self, key):
         """마우스 키 여부 확인"""
-        return key.lower() in ['mouse4', 'mouse5', 'xbutton1', 'xbutton2']
+        return is_mouse_key(key)
 
     def check_modifier(self, required_modifier):
         """조합키 체크"""
@@ -206,57 +227,20 @@ class ColorClickerApp(
         self.on_consume2_enter_pause(event)
         self.on_skill_auto_enter_pause(event)
 
-    def start_mouse_polling(self):
-        """마우스 버튼 폴링 시작"""
-        self.mouse_polling_active = True
-
-        def poll_mouse():
-            import win32api
-            import win32con
-            import time
-
-            last_x1_state = False
-            last_x2_state = False
-
-            while self.mouse_polling_active:
-                try:
-                    x1_state = win32api.GetAsyncKeyState(win32con.VK_XBUTTON1) & 0x8000 != 0
-                    x2_state = win32api.GetAsyncKeyState(win32con.VK_XBUTTON2) & 0x8000 != 0
-
-                    # Mouse4 (XButton1) 처리
-                    if x1_state and not last_x1_state:
-                        self.on_mouse_button('mouse4')
-                    last_x1_state = x1_state
-
-                    # Mouse5 (XButton2) 처리
-                    if x2_state and not last_x2_state:
-                        self.on_mouse_button('mouse5')
-                    last_x2_state = x2_state
-
-                except:
-                    pass
-                time.sleep(0.01)
+    def start_mouse_hook(self):
+        """마우스 버튼 훅 시작 - 누름 이벤트를 핫키 테이블로"""
+        self.mouse_hook.subscribe(self._on_mouse_event)
+        # 클릭으로 창을 열 때도 (상인/보관함 등) 빠른 버튼 감지 주기를 즉시 최소로
+        self.mouse_hook.subscribe(lambda e: e.down and self.quick_poller.kick())
+        self.mouse_hook.start()
 
-        threading.Thread(target=poll_mouse, daemon=True).start()
+    def _on_mouse_event(self, event):
+        if event.down and event.button in ('mouse4', 'mouse5'):
+            self.on_mouse_button(event.button)
 
     def on_mouse_button(self, button):
-        """마우스 버튼 핸들러 - 5개 스킬 프리셋 지원"""
-        if self.trigger_key.get().lower() == button:
-            self.on_trigger_key(None)
-        if self.inv_trigger_key.get().lower() == button:
-            self.on_inv_trigger_key(None)
-        if self.discard_trigger_key.get().lower() == button:
-            self.on_discard_trigger_key(None)
-        if self.sell_trigger_key.get().lower() == button:
-            self.on_sell_trigger_key(None)
-        if self.consume_trigger_key.get().lower() == button:
-            self.on_consume_trigger_key(None)
-        if self.consume2_trigger_key.get().lower() == button:
-            self.on_consume2_trigger_key(None)
-        # 5개 스킬 프리셋 마우스 핫키 체크
-        for i, preset in enumerate(self.skill_presets):
-            if preset['trigger_key'].get().lower() == button:
-                self.on_skill_preset_trigger_key(i, None)
+        """마우스 버튼 핸들러 - 키보드 핫키와 같은 테이블에서 조회"""
+        self.hotkeys.dispatch_mouse(button)
 
     # =========================================
     # Home 탭 토글 함수들
@@ -291,33 +275,13 @@ class ColorClickerApp(
 
     def change_emergency_key(self):
         """긴급 정지 키 변경"""
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("긴급 정지 키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 긴급 정지 키를 누르세요...",
-                     font=ctk.CTkFont(family=DEFAULT_FONT, size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                self.emergency_stop_key.set(event.name)
-                self.emergency_key_display.configure(text=event.name.upper())
-                self.setup_hotkey()
-                dialog.destroy()
-
-        keyboard.on_press(on_key, suppress=False)
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
+        def apply(key_name):
+            self.emergency_stop_key.set(key_name)
+            self.emergency_key_display.configure(text=key_name.upper())
+            self.setup_hotkey()
 
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        # 키보드만 (마우스 버튼은 받지 않음)
+        self.open_key_capture("긴급 정지 키 설정", apply, prompt="새 긴급 정지 키를 누르세요...", mouse_buttons=())
 
     def on_emergency_stop(self, event=None):
         """긴급 정지 - 실행 중인 클릭/매크로 동작만 즉시 중지 (5개 스킬 프리셋 지원)"""
@@ -334,6 +298,7 @@ class ColorClickerApp(
         for i, preset in enumerate(self.skill_presets):
             preset['active'] = False
             preset['paused'] = False
+            preset['_wake'].set()
             if preset['running'] and preset['_status_label']:
                 preset['_status_label'].configure(
                     text=f"🔴 [{preset['trigger_key'].get().upper()}] 키로 시작"
@@ -506,6 +471,7 @@ class ColorClickerApp(
             'trigger_modifier': self.trigger_modifier.get(),
             'click_type': self.click_type.get(),
             'click_delay': self.click_delay.get(),
+            'target_policy': self.target_policy.get(),
             'use_full_screen': self.use_full_screen.get(),
             'cooldown_distance': self.cooldown_distance.get(),
             'cooldown_time': self.cooldown_time.get(),
@@ -516,6 +482,7 @@ class ColorClickerApp(
                 'y2': self.search_y2.get()
             },
             'search_step': self.search_step.get(),
+            'search_tile_size': self.search_tile_size.get(),
             'inventory': {
                 'keep_color': self.inv_keep_color.get(),
                 'tolerance': self.inv_tolerance.get(),
@@ -539,7 +506,8 @@ class ColorClickerApp(
                 'move_duration': self.inv_move_duration.get(),
                 'panel_delay': self.inv_panel_delay.get(),
                 'space_delay': self.inv_space_delay.get(),
-                'click_delay': self.inv_click_delay.get()
+                'click_delay': self.inv_click_delay.get(),
+                'skip_empty': self.inv_skip_empty.get()
             },
             'discard': {
                 'trigger_key': self.discard_trigger_key.get(),
@@ -566,6 +534,7 @@ class ColorClickerApp(
                 'action_key': self.consume2_action_key.get()
             },
             'skill_auto': {
+                'key_gap': self.skill_key_gap.get(),
                 'presets': [
                     {
                         'name': preset['name'].get(),
@@ -618,7 +587,13 @@ class ColorClickerApp(
                 'detect_color1': self.detect_color1.get(),
                 'detect_pos2_x': self.detect_pos2_x.get(),
                 'detect_pos2_y': self.detect_pos2_y.get(),
-                'detect_color2': self.detect_color2.get()
+                'detect_color2': self.detect_color2.get(),
+                'detect_sell_x': self.detect_sell_x.get(),
+                'detect_sell_y': self.detect_sell_y.get(),
+                'detect_sell_color': self.detect_sell_color.get(),
+                'detect_stash_x': self.detect_stash_x.get(),
+                'detect_stash_y': self.detect_stash_y.get(),
+                'detect_stash_color': self.detect_stash_color.get()
             }
         }
 
@@ -654,6 +629,7 @@ class ColorClickerApp(
             self.trigger_modifier.set(config.get('trigger_modifier', '없음'))
             self.click_type.set(config.get('click_type', 'fkey'))
             self.click_delay.set(config.get('click_delay', 0.01))
+            self.target_policy.set(config.get('target_policy', DEFAULT_POLICY))
             self.use_full_screen.set(config.get('use_full_screen', False))
             self.cooldown_distance.set(config.get('cooldown_distance', 50))
             self.cooldown_time.set(config.get('cooldown_time', 0.1))
@@ -665,6 +641,7 @@ class ColorClickerApp(
             self.search_y2.set(area.get('y2', 1168))
 
             self.search_step.set(config.get('search_step', 5))
+            self.search_tile_size.set(config.get('search_tile_size', 64))
 
             # 신화장난꾸러기 설정
             inv = config.get('inventory', {})
@@ -693,6 +670,7 @@ class ColorClickerApp(
                 self.inv_panel_delay.set(inv.get('panel_delay', 0.08))
                 self.inv_space_delay.set(inv.get('space_delay', 0.05))
                 self.inv_click_delay.set(inv.get('click_delay', 0.01))
+                self.inv_skip_empty.set(inv.get('skip_empty', False))
 
                 if hasattr(self, 'inv_key_display'):
                     self.inv_key_display.configure(text=self.inv_trigger_key.get().upper())
@@ -748,6 +726,7 @@ class ColorClickerApp(
             # 스킬 자동 설정 (5개 프리셋 지원 + 마이그레이션)
             skill_auto = config.get('skill_auto', {})
             if skill_auto:
+                self.skill_key_gap.set(skill_auto.get('key_gap', 0.02))
                 presets_data = skill_auto.get('presets', [])
 
                 # 기존 단일 프리셋 설정 마이그레이션
@@ -843,6 +822,12 @@ class ColorClickerApp(
                 old_color = quick_btn.get('detect_color', '#E4DBCA')
                 self.detect_color1.set(quick_btn.get('detect_color1', old_color))
                 self.detect_color2.set(quick_btn.get('detect_color2', old_color))
+                self.detect_sell_x.set(quick_btn.get('detect_sell_x', 330))
+                self.detect_sell_y.set(quick_btn.get('detect_sell_y', 105))
+                self.detect_sell_color.set(quick_btn.get('detect_sell_color', '#E4DBCA'))
+                self.detect_stash_x.set(quick_btn.get('detect_stash_x', 330))
+                self.detect_stash_y.set(quick_btn.get('detect_stash_y', 120))
+                self.detect_stash_color.set(quick_btn.get('detect_stash_color', '#E4DBCA'))
 
             if hasattr(self, 'key_display'):
                 self.key_display.configure(text=self.trigger_key.get().upper())
@@ -33,8 +33,31 @@ python -m PyInstaller --onefile --noconsole --name "Wonryeol_Helper" ^
     --hidden-import=ui ^
     --hidden-import=ui.overlay ^
     --hidden-import=ui.main_window ^
+    --hidden-import=ui.key_capture ^
     --hidden-import=utils ^
     --hidden-import=utils.updater ^
+    --hidden-import=utils.color_match ^
+    --hidden-import=utils.blob_detect ^
+    --hidden-import=utils.exclude_field ^
+    --hidden-import=utils.screen_capture ^
+    --hidden-import=utils.pixel_probe ^
+    --hidden-import=utils.template_match ^
+    --hidden-import=utils.ui_state ^
+    --hidden-import=utils.adaptive_poll ^
+    --hidden-import=utils.tile_gate ^
+    --hidden-import=utils.frame_record ^
+    --hidden-import=utils.replay_harness ^
+    --hidden-import=utils.input_backend ^
+    --hidden-import=utils.burst ^
+    --hidden-import=utils.precise_timer ^
+    --hidden-import=utils.cooldown_queue ^
+    --hidden-import=utils.settings_snapshot ^
+    --hidden-import=utils.hotkeys ^
+    --hidden-import=utils.mouse_hook ^
+    --hidden-import=utils.target_sweep ^
+    --hidden-import=utils.motion_planner ^
+    --hidden-import=utils.inventory_scan ^
+    --hidden-import=utils.inventory_grid ^
     main.py
 
 echo.
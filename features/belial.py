@@ -6,12 +6,36 @@
 import threading
 import time
 from PIL import Image
-import mss
 import pyautogui
 import keyboard
 import win32api
 
 from constants import COLORS
+from utils.exclude_field import ExclusionField
+from utils.motion_planner import win32_cursor_mover
+from utils.precise_timer import RateLoop, precise_sleep, release_thread as release_timer_thread
+from utils.settings_snapshot import SnapshotPublisher, frozen_settings
+from utils.target_sweep import (DEFAULT_POLICY, MAX_SWEEP_TARGETS, order_targets, relocate_target,
+                                 sweep_targets, target_from_blob, verify_target)
+from utils.tile_gate import DEFAULT_TILE, TileMaskCache
+
+
+@frozen_settings
+class BelialSettings:
+    """감지 루프가 읽는 벨리알 설정 (불변 스냅샷)"""
+    search_x1: int
+    search_y1: int
+    search_x2: int
+    search_y2: int
+    search_step: int
+    tolerance: int
+    exclude_range: int
+    search_tile_size: int
+    cooldown_distance: int
+    cooldown_time: float
+    click_type: str
+    click_delay: float
+    target_policy: str
 
 
 class BelialMixin:
@@ -51,12 +75,45 @@ class BelialMixin:
         self.search_y2 = ctk.IntVar(value=1168)
         self.search_step = ctk.IntVar(value=5)
 
+        # 변화 감지 타일 (바뀐 타일만 다시 검색)
+        self.search_tile_size = ctk.IntVar(value=DEFAULT_TILE)
+        self.search_tiles = TileMaskCache(DEFAULT_TILE)
+
         # 쿨다운 시스템
         self.last_click_pos = None
         self.last_click_time = 0
         self.cooldown_distance = ctk.IntVar(value=50)
         self.cooldown_time = ctk.DoubleVar(value=0.1)
 
+        # 한 프레임에서 찾은 대상들의 클릭 순서 (utils.target_sweep 정책 이름)
+        self.target_policy = ctk.StringVar(value=DEFAULT_POLICY)
+
+        # 커서 이동 계획기 (궤적을 고해상도 타이머 마감에 맞춰 재생)
+        self.cursor_mover = win32_cursor_mover()
+
+        # 감지 스레드는 Tk 변수 대신 이 스냅샷만 읽는다 (값이 바뀔 때 메인 스레드에서 재생성)
+        self.belial_settings = SnapshotPublisher(self._build_belial_settings, [
+            self.search_x1, self.search_y1, self.search_x2, self.search_y2, self.search_step,
+            self.tolerance, self.exclude_range, self.search_tile_size,
+            self.cooldown_distance, self.cooldown_time, self.click_type, self.click_delay,
+            self.target_policy,
+        ])
+
+    def _build_belial_settings(self):
+        return BelialSettings(
+            search_x1=self.search_x1.get(), search_y1=self.search_y1.get(),
+            search_x2=self.search_x2.get(), search_y2=self.search_y2.get(),
+            search_step=max(1, self.search_step.get()),
+            tolerance=self.tolerance.get(),
+            exclude_range=self.exclude_range.get(),
+            search_tile_size=self.search_tile_size.get(),
+            cooldown_distance=self.cooldown_distance.get(),
+            cooldown_time=self.cooldown_time.get(),
+            click_type=self.click_type.get(),
+            click_delay=self.click_delay.get(),
+            target_policy=self.target_policy.get(),
+        )
+
     def toggle_running(self):
         """벨리알 시작/중지"""
         self.is_running = not self.is_running
@@ -77,223 +134,120 @@ class BelialMixin:
     def run_detection(self):
         """감지 루프 실행"""
         def detection_loop():
-            while self.is_running:
-                try:
-                    if self.detection_active:
-                        found = self.search_and_click()
-                        if found:
-                            self.after(0, lambda: self.status_label.configure(text="🟢 클릭!"))
-                            time.sleep(self.click_delay.get())
-                except Exception as e:
-                    print(f"Error: {e}")
-                time.sleep(0.01)
+            # 100Hz 주기 (절대 마감 기준 - 검색 시간이 주기에 더해지지 않음)
+            loop = RateLoop(0.01)
+            try:
+                while self.is_running:
+                    try:
+                        if self.detection_active:
+                            found = self.search_and_click()
+                            if found:
+                                # 실제/요청 이동 시간 (궤적 재생 정확도)
+                                moved = self.cursor_mover.stats_text()
+                                self.after(0, lambda: self.status_label.configure(text=f"🟢 클릭! ({moved})"))
+                                precise_sleep(self.belial_settings.current.click_delay)
+                                loop.reset()
+                    except Exception as e:
+                        print(f"Error: {e}")
+                    loop.wait()
+            finally:
+                # 재시작 때마다 새 스레드이므로 이 스레드의 캡처 자원과 타이머 핸들은 닫는다
+                self.screen_capture.release_thread()
+                release_timer_thread()
 
         threading.Thread(target=detection_loop, daemon=True).start()
 
     def search_and_click(self):
-        """색상 검색 및 클릭"""
+        """색상 검색 후 이 프레임의 대상들을 정책 순서로 한 번에 클릭 - 클릭한 수 반환"""
         if not self.colors:
-            return False
+            return 0
 
-        x1, y1 = self.search_x1.get(), self.search_y1.get()
-        x2, y2 = self.search_x2.get(), self.search_y2.get()
-        step = max(1, self.search_step.get())
-        tol = self.tolerance.get()
-        exclude_range = self.exclude_range.get()
+        settings = self.belial_settings.current
+        x1, y1 = settings.search_x1, settings.search_y1
+        x2, y2 = settings.search_x2, settings.search_y2
+        step = settings.search_step
+        tol = settings.tolerance
+        exclude_range = settings.exclude_range
 
         try:
-            with mss.mss() as sct:
-                monitor = {"top": y1, "left": x1, "width": x2 - x1, "height": y2 - y1}
-                screenshot = sct.grab(monitor)
-                img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-                pixels = img.load()
-                width, height = img.size
-
-            visited_centers = set()
-
-            for hex_color, _ in self.colors:
-                target_r = int(hex_color[1:3], 16)
-                target_g = int(hex_color[3:5], 16)
-                target_b = int(hex_color[5:7], 16)
-
-                for y in range(0, height, step):
-                    for x in range(0, width, step):
-                        try:
-                            pixel = pixels[x, y]
-                            r, g, b = pixel[0], pixel[1], pixel[2]
-
-                            if (abs(r - target_r) <= tol and
-                                abs(g - target_g) <= tol and
-                                abs(b - target_b) <= tol):
-
-                                center_x, center_y = self.find_text_center(
-                                    pixels, x, y, width, height, hex_color, tol
-                                )
-
-                                center_key = (center_x // 20, center_y // 20)
-                                if center_key in visited_centers:
-                                    continue
-                                visited_centers.add(center_key)
-
-                                screen_x = x1 + center_x
-                                screen_y = y1 + center_y
-
-                                if self.last_click_pos:
-                                    dist_to_last = ((screen_x - self.last_click_pos[0])**2 +
-                                                    (screen_y - self.last_click_pos[1])**2)**0.5
-                                    time_passed = time.time() - self.last_click_time
-                                    if dist_to_last < self.cooldown_distance.get() and time_passed < self.cooldown_time.get():
-                                        continue
-
-                                if self.exclude_colors:
-                                    if self.has_exclude_color_nearby(pixels, center_x, center_y, width, height, exclude_range, tol):
-                                        continue
-
-                                self.smooth_move_to(screen_x, screen_y, duration=0.15)
-
-                                if self.click_type.get() == "right":
-                                    pyautogui.rightClick()
-                                elif self.click_type.get() == "fkey":
-                                    keyboard.press_and_release('f')
-
-                                self.last_click_pos = (screen_x, screen_y)
-                                self.last_click_time = time.time()
-                                return True
-
-                        except:
-                            continue
+            # 공유 캡처: 검색 영역 (+ 다른 감지 기능이 등록한 영역) 을 캡처해 공유
+            frame = self.screen_capture.region(x1, y1, x2 - x1, y2 - y1, share=True)
+
+            # 모든 색상을 한 번에 마스크로 만들고 텍스트 블롭 단위로 검색
+            # (이전 프레임과 달라진 타일만 다시 계산)
+            tile = max(step, settings.search_tile_size)
+            if tile != self.search_tiles.tile:
+                self.search_tiles.tile = tile
+                self.search_tiles.invalidate()
+            blobs = self.search_tiles.find_text_blobs(frame, self.colors, tol, step)
+
+            candidates = [target_from_blob(blob, x1, y1) for blob in blobs]
+            candidates = [t for t in candidates if not self._in_click_cooldown(t.x, t.y, settings)]
+
+            # 제외 색상 주변 검사는 프레임당 한 번, 후보 주변만
+            targets = candidates
+            if self.exclude_colors and candidates:
+                exclude_field = ExclusionField(frame, self.exclude_colors, tol, exclude_range,
+                                               points=[(t.x - x1, t.y - y1) for t in candidates])
+                targets = [t for t in candidates if not exclude_field.blocked(t.x - x1, t.y - y1)]
+            if not targets:
+                return 0
+
+            # 한 번에 이어서 클릭 - 두 번째부터는 전체 재검색 대신 주변만 재확인
+            targets = order_targets(targets, win32api.GetCursorPos(), settings.target_policy)
+            result = sweep_targets(
+                targets[:MAX_SWEEP_TARGETS],
+                click=lambda target: self._click_target(target, settings),
+                verify=lambda target: verify_target(self.screen_capture, target, self.colors,
+                                                    self.exclude_colors, tol, exclude_range),
+                should_continue=lambda: self.is_running and self.detection_active)
+            return len(result.clicked)
         except Exception as e:
             print(f"Search error: {e}")
 
-        return False
-
-    def color_matches(self, pixel, hex_color, tol):
-        """픽셀이 특정 색상과 일치하는지 확인"""
-        r, g, b = pixel[0], pixel[1], pixel[2]
-        target_r = int(hex_color[1:3], 16)
-        target_g = int(hex_color[3:5], 16)
-        target_b = int(hex_color[5:7], 16)
-        return (abs(r - target_r) <= tol and
-                abs(g - target_g) <= tol and
-                abs(b - target_b) <= tol)
-
-    def has_exclude_color_nearby(self, pixels, cx, cy, width, height, check_range, tol):
-        """주변에 제외 색상이 있는지 확인"""
-        for ex_hex, _ in self.exclude_colors:
-            ex_r = int(ex_hex[1:3], 16)
-            ex_g = int(ex_hex[3:5], 16)
-            ex_b = int(ex_hex[5:7], 16)
-
-            for dy in range(-check_range, check_range + 1, 3):
-                for dx in range(-check_range, check_range + 1, 3):
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < width and 0 <= ny < height:
-                        try:
-                            pixel = pixels[nx, ny]
-                            r, g, b = pixel[0], pixel[1], pixel[2]
-                            if (abs(r - ex_r) <= tol and
-                                abs(g - ex_g) <= tol and
-                                abs(b - ex_b) <= tol):
-                                return True
-                        except:
-                            continue
-        return False
-
-    def find_text_center(self, pixels, start_x, start_y, width, height, hex_color, tol):
-        """시작 픽셀에서 연결된 텍스트 영역의 중앙 좌표 반환"""
-        # 수평 스캔 - 왼쪽 끝 찾기
-        left_x = start_x
-        while left_x > 0:
-            try:
-                pixel = pixels[left_x - 1, start_y]
-                if not self.color_matches(pixel, hex_color, tol):
-                    break
-                left_x -= 1
-            except:
-                break
-
-        # 수평 스캔 - 오른쪽 끝 찾기
-        right_x = start_x
-        while right_x < width - 1:
-            try:
-                pixel = pixels[right_x + 1, start_y]
-                if not self.color_matches(pixel, hex_color, tol):
-                    break
-                right_x += 1
-            except:
-                break
-
-        center_x = (left_x + right_x) // 2
+        return 0
 
-        # 수직 스캔 - 위쪽 끝 찾기
-        top_y = start_y
-        while top_y > 0:
-            try:
-                pixel = pixels[center_x, top_y - 1]
-                if not self.color_matches(pixel, hex_color, tol):
-                    break
-                top_y -= 1
-            except:
-                break
-
-        # 수직 스캔 - 아래쪽 끝 찾기
-        bottom_y = start_y
-        while bottom_y < height - 1:
-            try:
-                pixel = pixels[center_x, bottom_y + 1]
-                if not self.color_matches(pixel, hex_color, tol):
-                    break
-                bottom_y += 1
-            except:
-                break
-
-        center_y = (top_y + bottom_y) // 2
-
-        return center_x, center_y
-
-    def find_all_exclude_positions(self, pixels, width, height, step, tol):
-        """모든 제외 색상(B) 픽셀 위치 수집"""
-        exclude_positions = []
-        for ex_hex, _ in self.exclude_colors:
-            ex_r = int(ex_hex[1:3], 16)
-            ex_g = int(ex_hex[3:5], 16)
-            ex_b = int(ex_hex[5:7], 16)
-
-            for y in range(0, height, step):
-                for x in range(0, width, step):
-                    try:
-                        pixel = pixels[x, y]
-                        r, g, b = pixel[0], pixel[1], pixel[2]
-                        if (abs(r - ex_r) <= tol and
-                            abs(g - ex_g) <= tol and
-                            abs(b - ex_b) <= tol):
-                            exclude_positions.append((x, y))
-                    except:
-                        continue
-        return exclude_positions
-
-    def calculate_min_distance_to_exclude(self, center_x, center_y, exclude_positions):
-        """A 중앙에서 가장 가까운 B까지의 거리 계산"""
-        if not exclude_positions:
-            return float('inf')  # B가 없으면 무한대 거리 (가장 안전)
-
-        min_dist = float('inf')
-        for ex_x, ex_y in exclude_positions:
-            dist = ((center_x - ex_x) ** 2 + (center_y - ex_y) ** 2) ** 0.5
-            if dist < min_dist:
-                min_dist = dist
-        return min_dist
+    def _in_click_cooldown(self, screen_x, screen_y, settings):
+        """방금 클릭한 위치 근처면 True (같은 대상 연속 클릭 방지)"""
+        if not self.last_click_pos:
+            return False
+        dist_to_last = ((screen_x - self.last_click_pos[0])**2 +
+                        (screen_y - self.last_click_pos[1])**2)**0.5
+        time_passed = time.time() - self.last_click_time
+        return dist_to_last < settings.cooldown_distance and time_passed < settings.cooldown_time
+
+    def _click_target(self, target, settings):
+        """대상으로 이동 후 클릭 - 이동 중 글씨가 밀리면 따라간다"""
+        current = [target]
+
+        def track():
+            # 옮긴 위치도 제외 색상 확인을 통과해야 따라간다
+            moved = relocate_target(self.screen_capture, current[0], self.colors, settings.tolerance,
+                                    exclude_colors=self.exclude_colors, exclude_range=settings.exclude_range)
+            if moved is None:
+                return None
+            current[0] = moved
+            return moved.x, moved.y
+
+        self.smooth_move_to(target.x, target.y, duration=0.15, track=track)
+
+        if settings.click_type == "right":
+            pyautogui.rightClick()
+        elif settings.click_type == "fkey":
+            keyboard.press_and_release('f')
+
+        self.last_click_pos = (current[0].x, current[0].y)
+        self.last_click_time = time.time()
 
     def check_nearby_exclude(self, screen_x, screen_y, check_range, tol):
         """이동 후 주변에 제외 색상이 있는지 확인"""
-        from PIL import ImageGrab
         try:
             x1 = max(0, screen_x - check_range)
             y1 = max(0, screen_y - check_range)
             x2 = screen_x + check_range
             y2 = screen_y + check_range
 
-            img = ImageGrab.grab(bbox=(x1, y1, x2, y2))
+            img = self.screen_capture.grab_image(x1, y1, x2 - x1, y2 - y1)
             pixels = img.load()
             img_width, img_height = img.size
 
@@ -320,10 +274,9 @@ class BelialMixin:
 
     def verify_before_click(self, screen_x, screen_y, tol):
         """클릭 직전에 현재 위치 색상 확인 - 제외 색상이면 False 반환"""
-        from PIL import ImageGrab
         try:
             # 현재 마우스 위치의 색상 캡처
-            img = ImageGrab.grab(bbox=(screen_x-2, screen_y-2, screen_x+3, screen_y+3))
+            img = self.screen_capture.grab_image(screen_x - 2, screen_y - 2, 5, 5)
             pixels = img.load()
 
             # 중앙 픽셀 확인
@@ -345,19 +298,12 @@ class BelialMixin:
         except:
             return True  # 오류 시 일단 클릭
 
-    def smooth_move_to(self, target_x, target_y, duration=0.15):
-        """초부드러운 마우스 이동 - 144fps급"""
-        start_x, start_y = win32api.GetCursorPos()
-        steps = max(20, int(duration * 144))
-
-        for i in range(1, steps + 1):
-            t = i / steps
-            t = t * t * (3 - 2 * t)  # ease-in-out
+    def smooth_move_to(self, target_x, target_y, duration=0.15, track=None):
+        """부드러운 마우스 이동 - 궤적을 절대 시각 기준으로 재생 (요청한 시간만큼만 블록)
 
-            x = int(start_x + (target_x - start_x) * t)
-            y = int(start_y + (target_y - start_y) * t)
-            win32api.SetCursorPos((x, y))
-            time.sleep(duration / steps)
+        track(): 이동 중 새 목표 (x, y) 를 돌려주면 남은 시간 안에 그쪽으로 방향을 바꾼다.
+        """
+        return self.cursor_mover.move_to(target_x, target_y, duration, track=track)
 
     def on_trigger_key(self, event):
         """트리거 키 핸들러"""
@@ -408,7 +354,7 @@ class BelialMixin:
     def start_magnifier_picker(self, target="colors"):
         """돋보기 색상 추출 창"""
         import tkinter as tk
-        from PIL import ImageGrab, ImageTk
+        from PIL import ImageTk
         import pyautogui
 
         self.picker_mode = True
@@ -505,7 +451,7 @@ class BelialMixin:
                         return
 
                 # 화면 캡처
-                img = ImageGrab.grab(bbox=(x - half, y - half, x + half + 1, y + half + 1))
+                img = self.screen_capture.grab_image(x - half, y - half, capture_size, capture_size)
 
                 # 중앙 픽셀 색상
                 center_color = img.getpixel((half, half))
@@ -665,83 +611,4 @@ class BelialMixin:
 
     def change_trigger_key(self):
         """트리거 키 변경"""
-        import customtkinter as ctk
-        import threading
-
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("핫키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 핫키를 누르세요...\n(마우스 4/5번도 가능)",
-                     font=ctk.CTkFont(size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                # 충돌 체크 - 충돌 시 설정 안 함
-                conflict_msg = self.check_hotkey_conflict(event.name)
-                if conflict_msg:
-                    from tkinter import messagebox
-                    self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
-                    dialog.destroy()
-                    return
-                self.trigger_key.set(event.name)
-                if hasattr(self, 'key_display'):
-                    self.key_display.configure(text=event.name.upper())
-                self.setup_hotkey()
-                dialog.destroy()
-
-        # 딜레이 후 키 감지 시작 (버튼 클릭 잔여 입력 방지)
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        # 마우스 버튼 폴링
-        def poll_mouse():
-            time.sleep(0.3)  # 딜레이
-            # 모든 버튼 떼어질 때까지 대기
-            while dialog_active[0]:
-                if not (win32api.GetAsyncKeyState(0x05) & 0x8000) and not (win32api.GetAsyncKeyState(0x06) & 0x8000):
-                    break
-                time.sleep(0.01)
-            time.sleep(0.1)  # 추가 안정화 딜레이
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.trigger_key.set("mouse4"))
-                    self.after(0, lambda: self.key_display.configure(text="MOUSE4") if hasattr(self, 'key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x05) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.trigger_key.set("mouse5"))
-                    self.after(0, lambda: self.key_display.configure(text="MOUSE5") if hasattr(self, 'key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x06) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
-
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        self.open_hotkey_capture(self.trigger_key, 'key_display')
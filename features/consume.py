@@ -9,6 +9,8 @@ import keyboard
 import win32api
 
 from constants import COLORS
+from utils.input_backend import INJECTED_TAG
+from utils.precise_timer import RateLoop, release_thread as release_timer_thread
 
 
 class ConsumeMixin:
@@ -55,40 +57,45 @@ class ConsumeMixin:
         self.after(0, lambda: self.consume_status_label.configure(text=f"🍖 먹는 중... ({action_key})"))
 
         consumed = 0
-        while self.consume_active and self.consume_running:
-            # Enter로 일시정지된 상태
-            if self.consume_paused:
-                time.sleep(0.01)
-                continue
-
-            # 마우스 클릭
-            if action_key == "좌클릭" or action_key == "왼클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-            elif action_key == "우클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, 0)
-            elif action_key.lower() == "mouse4":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, 0)
-            elif action_key.lower() == "mouse5":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, 0)
-            else:
-                # 키보드 키
-                try:
-                    keyboard.press_and_release(action_key.lower())
-                except:
-                    pass
-
-            consumed += 1
-
-            if delay > 0.001:
-                time.sleep(delay)
-
-            # 진행상황 (100개마다)
-            if consumed % 100 == 0:
-                self.after(0, lambda c=consumed: self.consume_progress_label.configure(text=f"{c}회"))
+        loop = RateLoop(delay)  # 입력 주기 (절대 마감 기준, 작업 시간 포함)
+        try:
+            while self.consume_active and self.consume_running:
+                # Enter로 일시정지된 상태
+                if self.consume_paused:
+                    time.sleep(0.01)
+                    loop.reset()
+                    continue
+
+                # 마우스 클릭
+                if action_key == "좌클릭" or action_key == "왼클릭":
+                    win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, INJECTED_TAG)
+                    win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, INJECTED_TAG)
+                elif action_key == "우클릭":
+                    win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, INJECTED_TAG)
+                    win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, INJECTED_TAG)
+                elif action_key.lower() == "mouse4":
+                    win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
+                    win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
+                elif action_key.lower() == "mouse5":
+                    win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
+                    win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
+                else:
+                    # 키보드 키
+                    try:
+                        keyboard.press_and_release(action_key.lower())
+                    except:
+                        pass
+
+                consumed += 1
+
+                if delay > 0.001:
+                    loop.wait()
+
+                # 진행상황 (100개마다)
+                if consumed % 100 == 0:
+                    self.after(0, lambda c=consumed: self.consume_progress_label.configure(text=f"{c}회"))
+        finally:
+            release_timer_thread()  # 이 스레드의 타이머 핸들 닫기
 
         self.consume_active = False
         self.after(0, lambda: self.consume_status_label.configure(text="⏹️ 중지됨"))
@@ -135,165 +142,15 @@ class ConsumeMixin:
 
     def change_consume_trigger_key(self):
         """먹기 핫키 변경"""
-        import customtkinter as ctk
-        import threading
-        import win32api
-
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("핫키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 핫키를 누르세요...\n(마우스 4/5번도 가능)",
-                     font=ctk.CTkFont(size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                # 충돌 체크 - 충돌 시 설정 안 함
-                conflict_msg = self.check_hotkey_conflict(event.name)
-                if conflict_msg:
-                    from tkinter import messagebox
-                    self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
-                    dialog.destroy()
-                    return
-                self.consume_trigger_key.set(event.name)
-                if hasattr(self, 'consume_key_display'):
-                    self.consume_key_display.configure(text=event.name.upper())
-                self.setup_hotkey()
-                dialog.destroy()
-
-        # 딜레이 후 키 감지 시작 (버튼 클릭 잔여 입력 방지)
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        # 마우스 버튼 폴링
-        def poll_mouse():
-            time.sleep(0.3)  # 딜레이
-            # 모든 버튼 떼어질 때까지 대기
-            while dialog_active[0]:
-                if not (win32api.GetAsyncKeyState(0x05) & 0x8000) and not (win32api.GetAsyncKeyState(0x06) & 0x8000):
-                    break
-                time.sleep(0.01)
-            time.sleep(0.1)  # 추가 안정화 딜레이
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.consume_trigger_key.set("mouse4"))
-                    self.after(0, lambda: self.consume_key_display.configure(text="MOUSE4") if hasattr(self, 'consume_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x05) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.consume_trigger_key.set("mouse5"))
-                    self.after(0, lambda: self.consume_key_display.configure(text="MOUSE5") if hasattr(self, 'consume_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x06) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
-
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        self.open_hotkey_capture(self.consume_trigger_key, 'consume_key_display')
 
     def change_consume_action_key(self):
         """아이템 먹기 - 누를 키 변경 (마우스 클릭 포함)"""
-        import customtkinter as ctk
-        import threading
-
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("누를 키 설정")
-        dialog.geometry("320x180")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="누를 키를 입력하세요\n(키보드 또는 마우스 버튼)",
-                     font=ctk.CTkFont(size=14)).pack(pady=15)
-
-        ctk.CTkLabel(dialog, text="마우스: 좌클릭, 우클릭, Mouse4, Mouse5",
-                     font=ctk.CTkFont(size=11), text_color="#888888").pack()
-
-        dialog_active = [True]
-
         def update_action_key(key_name):
             """누를 키 업데이트"""
             self.consume_action_key.set(key_name)
-            display_text = key_name.upper()
             if hasattr(self, 'consume_action_display'):
-                self.consume_action_display.configure(text=display_text)
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                key_name = event.name.upper()
-                self.after(0, lambda: update_action_key(key_name))
-                dialog.destroy()
-
-        keyboard.on_press(on_key, suppress=False)
-
-        def poll_mouse():
-            # 버튼 클릭이 해제될 때까지 대기 (0.3초)
-            time.sleep(0.3)
-            # 기존 마우스 상태 클리어
-            win32api.GetAsyncKeyState(0x01)
-            win32api.GetAsyncKeyState(0x02)
-            win32api.GetAsyncKeyState(0x05)
-            win32api.GetAsyncKeyState(0x06)
-
-            while dialog_active[0]:
-                # 좌클릭
-                if win32api.GetAsyncKeyState(0x01) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_action_key("좌클릭"))
-                    self.after(0, dialog.destroy)
-                    break
-                # 우클릭
-                if win32api.GetAsyncKeyState(0x02) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_action_key("우클릭"))
-                    self.after(0, dialog.destroy)
-                    break
-                # Mouse4
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_action_key("mouse4"))
-                    self.after(0, dialog.destroy)
-                    break
-                # Mouse5
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_action_key("mouse5"))
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
+                self.consume_action_display.configure(text=key_name.upper())
 
-        def on_close():
-            dialog_active[0] = False
-            keyboard.unhook_all()
-            self.setup_hotkey()
-            dialog.destroy()
+        self.open_action_key_capture(update_action_key)
 
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
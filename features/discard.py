@@ -5,9 +5,11 @@
 
 import time
 import pyautogui
-import keyboard
 
 from constants import COLORS
+from utils.burst import BurstExecutor
+from utils.input_backend import slot_ctrl_click
+from utils.precise_timer import release_thread as release_timer_thread
 
 
 class DiscardMixin:
@@ -40,74 +42,65 @@ class DiscardMixin:
         self.update_home_status_now()
 
     def run_discard_loop(self):
-        """버리기 루프 실행 - 인벤토리 전체 한 번 버리기"""
-        import win32api
-        import win32con
-
-        positions = self.get_inventory_positions()
+        """버리기 루프 실행 - 인벤토리 아이템 칸을 한 번씩 버리기 (빈칸 제외)"""
+        # 빈칸은 입력을 보내지 않음 - 아이템 칸을 다 처리하면 바로 끝
+        positions, skipped, saved = self.get_occupied_positions(slot_ctrl_click)
+        self.screen_capture.release_thread()  # 이 스레드는 더 캡처하지 않음
         total = len(positions)
         delay = self.discard_delay.get()
 
         self.after(0, lambda: self.discard_status_label.configure(text="🗑️ 버리는 중..."))
 
         discarded = 0
-        for i, (x, y, col) in enumerate(positions):
-            if not self.discard_active:
-                break
-
-            # 초고속: 텔레포트 + 즉시 Ctrl+클릭
-            win32api.SetCursorPos((x, y))
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-            discarded += 1
+        if delay <= 0.001:
+            # 딜레이 없음: 한 바퀴 전체를 SendInput 한 번으로
+            if self.discard_active:
+                self.input_backend.send([e for x, y, col in positions for e in slot_ctrl_click(x, y)])
+                discarded = total
+        else:
+            for i, (x, y, col) in enumerate(positions):
+                if not self.discard_active:
+                    break
 
-            if delay > 0.001:
-                time.sleep(delay)
+                # 텔레포트 + Ctrl+클릭을 한 번에 전송
+                self.input_backend.send(slot_ctrl_click(x, y))
+                discarded += 1
+                if i < total - 1:
+                    time.sleep(delay)
 
-            # 진행상황 (10개마다)
-            if i % 10 == 0:
-                self.after(0, lambda idx=i, t=total: self.discard_progress_label.configure(text=f"{idx+1}/{t}"))
+                # 진행상황 (10개마다)
+                if i % 10 == 0:
+                    self.after(0, lambda idx=i, t=total: self.discard_progress_label.configure(text=f"{idx+1}/{t}"))
 
         self.discard_active = False
         self.after(0, lambda: self.discard_status_label.configure(text="✅ 완료!"))
-        self.after(0, lambda d=discarded: self.discard_progress_label.configure(text=f"총 {d}개 버림"))
+        if skipped:
+            print(f"[Discard] 빈칸 {skipped}칸 건너뜀 - 입력 이벤트 {saved}개 절약 (아이템 칸 {total}개)")
+        self.after(0, lambda d=discarded, k=skipped: self.discard_progress_label.configure(
+            text=f"총 {d}개 버림" + (f" (빈칸 {k}칸 건너뜀)" if k else "")))
 
     def run_discard_simultaneous(self):
-        """테스트: 동시 버리기 - 모든 위치에 동시에 Ctrl+클릭"""
-        import win32api
-        import win32con
-        import threading
+        """테스트: 동시 버리기 - 한 스레드에서 슬롯별 Ctrl+클릭을 4ms 간격으로 연속 전송
 
+        시작할 때 discard_active 를 켜고, 버리기 키로 끄면 남은 슬롯은 건너뛴다.
+        """
+        self.discard_active = True
         positions = self.get_inventory_positions()
         total = len(positions)
 
         self.after(0, lambda: self.discard_status_label.configure(text="⚡ 동시 버리기 중..."))
 
-        def click_at(x, y):
-            win32api.SetCursorPos((x, y))
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        threads = []
-        for x, y, col in positions:
-            t = threading.Thread(target=click_at, args=(x, y))
-            threads.append(t)
-
-        # 모든 스레드 동시 시작
-        for t in threads:
-            t.start()
-
-        # 완료 대기
-        for t in threads:
-            t.join()
+        groups = [slot_ctrl_click(x, y) for x, y, col in positions]
+        result = BurstExecutor(self.input_backend, spacing=0.004).run(
+            groups, should_continue=lambda: self.discard_active)
+        release_timer_thread()  # 이 스레드는 더 대기하지 않음
+        print(f"[Discard] 버스트: {len(result.sent)}/{total}개, {result.events_per_sec:.0f} 이벤트/초, "
+              f"건너뜀 {len(result.skipped)}, 지연 {result.late}회 (최대 {result.max_lag * 1000:.1f}ms)")
 
         self.discard_active = False
         self.after(0, lambda: self.discard_status_label.configure(text="✅ 동시 버리기 완료!"))
-        self.after(0, lambda t=total: self.discard_progress_label.configure(text=f"총 {t}개 시도"))
+        self.after(0, lambda s=len(result.sent), k=len(result.skipped): self.discard_progress_label.configure(
+            text=f"총 {s}개 시도" + (f" (건너뜀 {k}개)" if k else "")))
 
     def on_discard_trigger_key(self, event):
         """버리기 트리거 키 핸들러"""
@@ -136,84 +129,5 @@ class DiscardMixin:
 
     def change_discard_trigger_key(self):
         """버리기 핫키 변경"""
-        import customtkinter as ctk
-        import threading
-        import win32api
-
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("핫키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 핫키를 누르세요...\n(마우스 4/5번도 가능)",
-                     font=ctk.CTkFont(size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                # 충돌 체크 - 충돌 시 설정 안 함
-                conflict_msg = self.check_hotkey_conflict(event.name)
-                if conflict_msg:
-                    from tkinter import messagebox
-                    self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
-                    dialog.destroy()
-                    return
-                self.discard_trigger_key.set(event.name)
-                if hasattr(self, 'discard_key_display'):
-                    self.discard_key_display.configure(text=event.name.upper())
-                self.setup_hotkey()
-                dialog.destroy()
-
-        # 딜레이 후 키 감지 시작 (버튼 클릭 잔여 입력 방지)
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        # 마우스 버튼 폴링
-        def poll_mouse():
-            time.sleep(0.3)  # 딜레이
-            # 모든 버튼 떼어질 때까지 대기
-            while dialog_active[0]:
-                if not (win32api.GetAsyncKeyState(0x05) & 0x8000) and not (win32api.GetAsyncKeyState(0x06) & 0x8000):
-                    break
-                time.sleep(0.01)
-            time.sleep(0.1)  # 추가 안정화 딜레이
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.discard_trigger_key.set("mouse4"))
-                    self.after(0, lambda: self.discard_key_display.configure(text="MOUSE4") if hasattr(self, 'discard_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x05) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.discard_trigger_key.set("mouse5"))
-                    self.after(0, lambda: self.discard_key_display.configure(text="MOUSE5") if hasattr(self, 'discard_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x06) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
+        self.open_hotkey_capture(self.discard_trigger_key, 'discard_key_display')
 
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
@@ -6,13 +6,15 @@
 import threading
 import time
 from PIL import Image
-import mss
-import numpy as np
 import pyautogui
 import keyboard
-import win32api
 
 from constants import COLORS
+from utils.input_backend import VK_CONTROL, modified_click, move
+from utils.inventory_grid import EMPTY, GridAnalyzer
+from utils.inventory_scan import PanelDetector, keep_color_analyzer, scan_slots, timing_summary
+from utils.motion_planner import win32_cursor_mover
+from utils.precise_timer import release_thread as release_timer_thread
 
 
 class InventoryMixin:
@@ -45,6 +47,17 @@ class InventoryMixin:
         self.inv_space_delay = ctk.DoubleVar(value=0.05)
         self.inv_click_delay = ctk.DoubleVar(value=0.01)
         self.inv_area_overlay = None
+        # 스캔용 커서 이동기 (벨리알 이동 통계와 따로)
+        self.inv_cursor_mover = win32_cursor_mover()
+        # 설명 패널 표시 감지 (고정 panel_delay 대신, 배운 서명/지연 통계는 실행 간 유지)
+        # 스캔 분석 executor - None 이면 스캔마다 작업 스레드 1개
+        self.inv_panel_detector = PanelDetector(lambda *rect: self.screen_capture.grab(*rect))
+        self.inv_scan_executor = None
+        self.inv_last_scan = None
+        # 인벤토리 격자 분석 (캡처 한 번으로 빈칸/즐겨찾기 칸을 골라 호버/버리기에서 제외)
+        self.inv_skip_empty = ctk.BooleanVar(value=False)
+        self.inv_grid_analyzer = GridAnalyzer()
+        self.inv_last_grid = None
 
     def toggle_inv_running(self):
         """인벤토리 정리 시작/중지"""
@@ -88,10 +101,40 @@ class InventoryMixin:
 
         return positions
 
+    def capture_inventory_grid(self):
+        """인벤토리 영역을 한 번 캡처해 칸별 분류 (GridMap) - 실패하면 None"""
+        try:
+            grid = self.inv_grid_analyzer.capture(self.screen_capture, self.inv_x1.get(), self.inv_y1.get(),
+                                                  self.inv_x2.get(), self.inv_y2.get(),
+                                                  self.inv_cols.get(), self.inv_rows.get())
+        except Exception as e:
+            print(f"[Inventory] 격자 분석 실패: {e}")
+            return None
+        self.inv_last_grid = grid
+        print(f"[Inventory] 격자: {grid.summary()}")
+        return grid
+
+    def get_occupied_positions(self, make_events):
+        """버리기/팔기용 슬롯 목록 → ((x, y, col) 목록, 건너뛴 빈칸 수, 아낀 입력 이벤트 수)
+
+        격자 분석 한 번으로 빈칸 (안쪽 밝기 표준편차) 만 뺀다 - 즐겨찾기 표시 판정은 쓰지 않음
+        (빈칸 건너뛰기 꺼짐/분석 실패 시 전체).
+        make_events(x, y): 슬롯 하나에 보낼 이벤트 목록 (아낀 수 계산용)
+        """
+        positions = self.get_inventory_positions()
+        grid = self.capture_inventory_grid() if self.inv_skip_empty.get() else None
+        if grid is None:
+            return positions, 0, 0
+        occupied, saved = [], 0
+        for x, y, col in positions:
+            if grid.state_at(x, y) == EMPTY:
+                saved += len(make_events(x, y))
+            else:
+                occupied.append((x, y, col))
+        return occupied, len(positions) - len(occupied), saved
+
     def run_inventory_cleanup(self):
         """인벤토리 정리 - 1단계: 스캔+즐겨찾기, 2단계: 나머지 버리기"""
-        import win32con
-
         def cleanup_loop():
             positions = self.get_inventory_positions()
             keep_color = self.inv_keep_color.get()
@@ -101,10 +144,6 @@ class InventoryMixin:
                 self.after(0, lambda: self.inv_status_label.configure(text="❌ 유효하지 않은 색상"))
                 return
 
-            target_r = int(keep_color[1:3], 16)
-            target_g = int(keep_color[3:5], 16)
-            target_b = int(keep_color[5:7], 16)
-
             total = len(positions)
             cols = self.inv_cols.get()
             inv_x1 = self.inv_x1.get()
@@ -118,74 +157,64 @@ class InventoryMixin:
             desc_width = desc_x2 - desc_x1
             desc_height = desc_y2 - desc_y1
 
-            # 딜레이 값
+            # 딜레이 값 (panel_delay 는 패널 표시 감지의 최대 대기)
             move_duration = self.inv_move_duration.get()
             panel_delay = self.inv_panel_delay.get()
             space_delay = self.inv_space_delay.get()
             click_delay = self.inv_click_delay.get()
 
-            # 즐겨찾기된 슬롯 저장
-            favorite_slots = set()
+            # 빈칸 / 이미 즐겨찾기된 칸은 호버하지도 버리지도 않음 (격자 분석 실패 시 전체)
+            grid = self.capture_inventory_grid() if self.inv_skip_empty.get() else None
+            skip = set()
+            if grid is not None:
+                skip = {i for i, (x, y, col) in enumerate(positions)
+                        if grid.state_at(x, y) == EMPTY or grid.is_favorited(x, y)}
 
             # ========== 1단계: 스캔 + 즐겨찾기 ==========
             self.after(0, lambda: self.inv_status_label.configure(text="🔍 1단계: 스캔 중..."))
 
+            # 슬롯별 설명 패널 영역 (열마다 X 오프셋)
+            slots = [(i, x, y, (desc_x1 + int(col * cell_w), desc_y1, desc_width, desc_height))
+                     for i, (x, y, col) in enumerate(positions) if i not in skip]
+            slot_by_index = {slot[0]: slot for slot in slots}
+
             # 첫 번째 슬롯에서 0.3초 호버링 (게임 초기 인식)
-            if positions:
-                first_x, first_y, first_col = positions[0]
-                self.smooth_move_to(first_x, first_y, duration=move_duration)
+            if slots:
+                _, first_x, first_y, _ = slots[0]
+                self.inv_cursor_mover.move_to(first_x, first_y, move_duration)
                 time.sleep(0.3)
 
-            with mss.mss() as sct:
-                for i, (x, y, col) in enumerate(positions):
-                    if not self.inv_cleanup_active:
-                        break
-
-                    # 부드럽게 슬롯으로 이동
-                    self.smooth_move_to(x, y, duration=move_duration)
-                    time.sleep(panel_delay)
-
-                    # 해당 슬롯의 설명 패널 X 오프셋 계산
-                    x_offset = int(col * cell_w)
-                    current_desc_x1 = desc_x1 + x_offset
-
-                    try:
-                        # 설명 패널 영역 캡처
-                        monitor = {
-                            "top": desc_y1,
-                            "left": current_desc_x1,
-                            "width": desc_width,
-                            "height": desc_height
-                        }
-                        screenshot = sct.grab(monitor)
-
-                        # numpy 초고속 벡터 스캔
-                        img_array = np.frombuffer(screenshot.raw, dtype=np.uint8)
-                        img_array = img_array.reshape((desc_height, desc_width, 4))
-
-                        b_diff = np.abs(img_array[:, :, 0].astype(np.int16) - target_b)
-                        g_diff = np.abs(img_array[:, :, 1].astype(np.int16) - target_g)
-                        r_diff = np.abs(img_array[:, :, 2].astype(np.int16) - target_r)
-
-                        found_keep_color = np.any((r_diff <= tol) & (g_diff <= tol) & (b_diff <= tol))
-
-                        # 신화장난꾸러기 발견! 스페이스바 2번 (즐겨찾기)
-                        if found_keep_color:
-                            favorite_slots.add(i)
-                            keyboard.press_and_release('space')
-                            time.sleep(space_delay)
-                            keyboard.press_and_release('space')
-                            time.sleep(space_delay)
-                            self.after(0, lambda idx=i: self.inv_progress_label.configure(
-                                text=f"⭐ 즐겨찾기: 슬롯 {idx+1}"))
-
-                    except Exception as e:
-                        print(f"Scan error: {e}")
-
-                    # 진행 상황 (3개마다)
-                    if i % 3 == 0:
-                        self.after(0, lambda idx=i, t=total, f=len(favorite_slots): self.inv_progress_label.configure(
-                            text=f"스캔: {idx+1}/{t} (즐겨찾기: {f})"))
+            def on_slot(i):
+                # 진행 상황 (3개마다)
+                if i % 3 == 0:
+                    self.after(0, lambda idx=i, t=total: self.inv_progress_label.configure(
+                        text=f"스캔: {idx+1}/{t}"))
+
+            # 캡처까지만 슬롯 위에서, 색상 분석은 다음 슬롯으로 이동하는 동안 작업 스레드에서
+            scan = scan_slots(slots, lambda x, y: self.inv_cursor_mover.move_to(x, y, move_duration),
+                              self.inv_panel_detector, keep_color_analyzer(keep_color, tol), panel_delay,
+                              should_continue=lambda: self.inv_cleanup_active, on_slot=on_slot,
+                              executor=self.inv_scan_executor, clock=time.perf_counter)
+            self.inv_last_scan = scan
+            print(f"[Inventory] {timing_summary(scan, panel_delay)}")
+            print(f"[Inventory] 패널 표시 지연: {self.inv_panel_detector.histogram_text()}")
+
+            # 즐겨찾기 (스페이스 2번) 는 커서가 그 슬롯 위에 있어야 하므로 보존 슬롯만 다시 방문
+            # (2단계 버리기처럼 바로 이동 후 패널이 뜰 때까지만 대기)
+            favorite_slots = set()
+            for i in scan.keep:
+                if not self.inv_cleanup_active:
+                    break
+                _, x, y, rect = slot_by_index[i]
+                self.input_backend.send(move(x, y))
+                self.inv_panel_detector.wait(rect, panel_delay)
+                favorite_slots.add(i)
+                keyboard.press_and_release('space')
+                time.sleep(space_delay)
+                keyboard.press_and_release('space')
+                time.sleep(space_delay)
+                self.after(0, lambda idx=i: self.inv_progress_label.configure(
+                    text=f"⭐ 즐겨찾기: 슬롯 {idx+1}"))
 
             if not self.inv_cleanup_active:
                 self.after(0, lambda: self.inv_status_label.configure(text="⏹️ 중지됨"))
@@ -201,19 +230,16 @@ class InventoryMixin:
                 if not self.inv_cleanup_active:
                     break
 
-                # 즐겨찾기된 슬롯은 스킵
-                if i in favorite_slots:
+                # 즐겨찾기된 슬롯 / 빈칸은 스킵
+                if i in favorite_slots or i in skip:
                     continue
 
                 # 빠르게 이동 (텔레포트)
-                win32api.SetCursorPos((x, y))
+                self.input_backend.send(move(x, y))
                 time.sleep(0.02)
 
-                # Ctrl + 클릭으로 버리기
-                win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-                win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
+                # Ctrl + 클릭으로 버리기 (한 번에 전송)
+                self.input_backend.send(modified_click(VK_CONTROL, 'left'))
                 discarded += 1
                 time.sleep(click_delay)
 
@@ -223,10 +249,17 @@ class InventoryMixin:
 
             self.inv_cleanup_active = False
             self.after(0, lambda: self.inv_status_label.configure(text="✅ 완료!"))
-            self.after(0, lambda f=len(favorite_slots), d=discarded: self.inv_progress_label.configure(
-                text=f"⭐ 보존: {f}개 | 🗑️ 버림: {d}개"))
+            self.after(0, lambda f=len(favorite_slots), d=discarded, k=len(skip): self.inv_progress_label.configure(
+                text=f"⭐ 보존: {f}개 | 🗑️ 버림: {d}개" + (f" | 건너뜀: {k}칸" if k else "")))
 
-        threading.Thread(target=cleanup_loop, daemon=True).start()
+        def cleanup_thread():
+            try:
+                cleanup_loop()
+            finally:
+                self.screen_capture.release_thread()
+                release_timer_thread()
+
+        threading.Thread(target=cleanup_thread, daemon=True).start()
 
     def on_inv_trigger_key(self, event):
         """인벤토리 정리 트리거 키 핸들러 - 토글 방식"""
@@ -254,88 +287,7 @@ class InventoryMixin:
 
     def change_inv_trigger_key(self):
         """인벤토리 핫키 변경"""
-        import customtkinter as ctk
-        import threading
-        import time
-        import win32api
-
-        dialog = ctk.CTkToplevel(self)
-        dialog.title("핫키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 핫키를 누르세요...\n(마우스 4/5번도 가능)",
-                     font=ctk.CTkFont(size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                # 충돌 체크 - 충돌 시 설정 안 함
-                conflict_msg = self.check_hotkey_conflict(event.name)
-                if conflict_msg:
-                    from tkinter import messagebox
-                    self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
-                    dialog.destroy()
-                    return
-                self.inv_trigger_key.set(event.name)
-                if hasattr(self, 'inv_key_display'):
-                    self.inv_key_display.configure(text=event.name.upper())
-                self.setup_hotkey()
-                dialog.destroy()
-
-        # 딜레이 후 키 감지 시작 (버튼 클릭 잔여 입력 방지)
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        # 마우스 버튼 폴링
-        def poll_mouse():
-            time.sleep(0.3)  # 딜레이
-            # 모든 버튼 떼어질 때까지 대기
-            while dialog_active[0]:
-                if not (win32api.GetAsyncKeyState(0x05) & 0x8000) and not (win32api.GetAsyncKeyState(0x06) & 0x8000):
-                    break
-                time.sleep(0.01)
-            time.sleep(0.1)  # 추가 안정화 딜레이
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.inv_trigger_key.set("mouse4"))
-                    self.after(0, lambda: self.inv_key_display.configure(text="MOUSE4") if hasattr(self, 'inv_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x05) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: self.inv_trigger_key.set("mouse5"))
-                    self.after(0, lambda: self.inv_key_display.configure(text="MOUSE5") if hasattr(self, 'inv_key_display') else None)
-                    # 버튼 떼어질 때까지 대기
-                    while win32api.GetAsyncKeyState(0x06) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
-
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        self.open_hotkey_capture(self.inv_trigger_key, 'inv_key_display')
 
     def select_inv_area(self):
         """인벤토리 영역 드래그 선택"""
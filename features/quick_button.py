@@ -5,13 +5,22 @@
 
 import tkinter as tk
 import threading
-import time
 import os
 import json
-import mss
 from PIL import Image
 import numpy as np
 
+from utils.template_match import TemplateMatcher
+from utils.ui_state import UiState, UiStateClassifier
+from utils.adaptive_poll import AdaptivePoller
+from utils.settings_snapshot import SnapshotPublisher, frozen_settings
+
+
+@frozen_settings
+class QuickButtonSettings:
+    """감시 루프가 읽는 빠른 버튼 설정 (불변 스냅샷) - 인식 좌표/색은 프로브가 따로 추적"""
+    enabled: bool
+
 
 class QuickButtonMixin:
     """빠른 버튼 기능 믹스인"""
@@ -30,11 +39,15 @@ class QuickButtonMixin:
             os.path.dirname(os.path.dirname(__file__)), "sell.png"
         )
         self.sell_template = None
+        self.sell_matcher = None
         self._load_sell_template()
 
         # 버리기 빠른 버튼
         self.quick_btn_window = None
         self.quick_btn_enabled = ctk.BooleanVar(value=True)
+        self.quick_btn_settings = SnapshotPublisher(
+            lambda: QuickButtonSettings(self.quick_btn_enabled.get()), [self.quick_btn_enabled],
+            on_publish=lambda snapshot: self.quick_poller.kick() if hasattr(self, 'quick_poller') else None)
         self.quick_btn_x = ctk.IntVar(value=1812)
         self.quick_btn_y = ctk.IntVar(value=898)
 
@@ -55,6 +68,31 @@ class QuickButtonMixin:
         self.detect_pos2_x = ctk.IntVar(value=1859)
         self.detect_pos2_y = ctk.IntVar(value=280)
         self.detect_color2 = ctk.StringVar(value="#E4DBCA")
+        # 상인 판매창 / 창고 인식 (기본값은 자리표시 - 해상도에 맞게 설정에서 지정)
+        self.detect_sell_x = ctk.IntVar(value=330)
+        self.detect_sell_y = ctk.IntVar(value=105)
+        self.detect_sell_color = ctk.StringVar(value="#E4DBCA")
+        self.detect_stash_x = ctk.IntVar(value=330)
+        self.detect_stash_y = ctk.IntVar(value=120)
+        self.detect_stash_color = ctk.StringVar(value="#E4DBCA")
+
+        # UI 상태 분류기 (2틱 연속 같은 판정일 때만 상태 전환)
+        self.ui_state = UiStateClassifier(debounce=2)
+        self.ui_state.subscribe(self._on_ui_state_changed)
+
+        # 감지 주기 (화면이 그대로면 점점 느리게, 변화/입력 시 즉시 빠르게)
+        self.quick_poller = AdaptivePoller(min_interval=0.03, max_interval=0.25)
+
+        # 인식 프로브 (한 번의 캡처로 모든 위치 확인, 정확히 일치할 때만 감지)
+        self.detect_probes = self.ui_state.probes
+        self.detect_probes.bind('inventory1', self.detect_pos1_x, self.detect_pos1_y, self.detect_color1, tol=0)
+        self.detect_probes.bind('inventory2', self.detect_pos2_x, self.detect_pos2_y, self.detect_color2, tol=0)
+        self.detect_probes.bind('sell', self.detect_sell_x, self.detect_sell_y, self.detect_sell_color, tol=0)
+        self.detect_probes.bind('stash', self.detect_stash_x, self.detect_stash_y, self.detect_stash_color, tol=0)
+        # 판매창/창고는 인벤토리도 함께 열리므로 먼저 등록 (먼저 일치한 상태가 선택됨)
+        self.ui_state.add_probe_signature(UiState.SELL, ['sell'])
+        self.ui_state.add_probe_signature(UiState.STASH, ['stash'])
+        self.ui_state.add_probe_signature(UiState.INVENTORY, ['inventory1', 'inventory2'])
 
         self.quick_btn_monitoring = False
         self.inventory_open = False
@@ -100,6 +138,10 @@ class QuickButtonMixin:
                         self.detect_color2.set(config['detect_color2'])
                     elif 'detect_color' in config:  # 이전 버전 호환
                         self.detect_color2.set(config['detect_color'])
+                    for key in ('detect_sell_x', 'detect_sell_y', 'detect_sell_color',
+                                'detect_stash_x', 'detect_stash_y', 'detect_stash_color'):
+                        if key in config:
+                            getattr(self, key).set(config[key])
                     print(f"[QuickBtn] 설정 불러옴")
         except Exception as e:
             print(f"[QuickBtn] 설정 로드 실패: {e}")
@@ -121,7 +163,13 @@ class QuickButtonMixin:
                 'detect_color1': self.detect_color1.get(),
                 'detect_pos2_x': self.detect_pos2_x.get(),
                 'detect_pos2_y': self.detect_pos2_y.get(),
-                'detect_color2': self.detect_color2.get()
+                'detect_color2': self.detect_color2.get(),
+                'detect_sell_x': self.detect_sell_x.get(),
+                'detect_sell_y': self.detect_sell_y.get(),
+                'detect_sell_color': self.detect_sell_color.get(),
+                'detect_stash_x': self.detect_stash_x.get(),
+                'detect_stash_y': self.detect_stash_y.get(),
+                'detect_stash_color': self.detect_stash_color.get()
             }
             with open(self.quick_btn_config_path, 'w') as f:
                 json.dump(config, f)
@@ -134,8 +182,10 @@ class QuickButtonMixin:
         try:
             img = Image.open(self.door_image_path).convert('RGB')
             self.door_template = np.array(img)
+            self.door_matcher = TemplateMatcher(self.door_template)
         except:
             self.door_template = None
+            self.door_matcher = None
 
     def _load_sell_template(self):
         """sell.png 템플릿 이미지 로드"""
@@ -143,41 +193,35 @@ class QuickButtonMixin:
             if os.path.exists(self.sell_template_path):
                 img = Image.open(self.sell_template_path).convert('RGB')
                 self.sell_template = np.array(img)
+                # 매칭용 float 배열/피라미드는 로드할 때 한 번만 계산
+                self.sell_matcher = TemplateMatcher(self.sell_template)
                 print(f"[QuickBtn] sell.png 로드 완료: {self.sell_template.shape}")
             else:
                 print(f"[QuickBtn] sell.png 없음: {self.sell_template_path}")
                 self.sell_template = None
+                self.sell_matcher = None
         except Exception as e:
             print(f"[QuickBtn] sell.png 로드 실패: {e}")
             self.sell_template = None
+            self.sell_matcher = None
 
     def match_template(self, screenshot_np, template_np, threshold=0.8):
-        """간단한 템플릿 매칭 (numpy only)"""
+        """템플릿 매칭 (FFT + 피라미드) → (일치 여부, 위치)
+
+        template_np 는 미리 만든 TemplateMatcher (sell_matcher 등) 또는 RGB 배열
+        """
         if template_np is None:
             return False, None
 
-        sh, sw = screenshot_np.shape[:2]
-        th, tw = template_np.shape[:2]
+        if isinstance(template_np, TemplateMatcher):
+            matcher = template_np
+        else:
+            matcher = TemplateMatcher(template_np)
 
-        if sh < th or sw < tw:
+        best_match, best_pos = matcher.match(screenshot_np)
+        if best_pos is None:
             return False, None
 
-        # 슬라이딩 윈도우로 검색 (빠른 검색을 위해 stride 사용)
-        stride = 4
-        best_match = 0
-        best_pos = None
-
-        for y in range(0, sh - th, stride):
-            for x in range(0, sw - tw, stride):
-                region = screenshot_np[y:y+th, x:x+tw]
-                # 간단한 유사도 계산 (평균 절대 차이)
-                diff = np.abs(region.astype(np.float32) - template_np.astype(np.float32))
-                similarity = 1 - (np.mean(diff) / 255)
-
-                if similarity > best_match:
-                    best_match = similarity
-                    best_pos = (x, y)
-
         if best_match > 0.5:  # 디버그: 50% 이상일 때만 출력
             print(f"[QuickBtn] 템플릿 유사도: {best_match:.2%}")
         return best_match >= threshold, best_pos
@@ -189,101 +233,87 @@ class QuickButtonMixin:
             threading.Thread(target=self.monitor_inventory_image, daemon=True).start()
 
     def monitor_inventory_image(self):
-        """인벤토리/팔기 감지 루프 (mss 사용)"""
-        tolerance = 0  # 정확히 일치할 때만 감지
-
+        """인벤토리/팔기 감지 루프 (UI 상태 분류기 사용)"""
         print(f"[QuickBtn] 인식 설정: 위치1({self.detect_pos1_x.get()}, {self.detect_pos1_y.get()}) 색깔1={self.detect_color1.get()}, 위치2({self.detect_pos2_x.get()}, {self.detect_pos2_y.get()}) 색깔2={self.detect_color2.get()}")
+        print(f"[QuickBtn] 판매창 인식: ({self.detect_sell_x.get()}, {self.detect_sell_y.get()}) {self.detect_sell_color.get()}, "
+              f"창고 인식: ({self.detect_stash_x.get()}, {self.detect_stash_y.get()}) {self.detect_stash_color.get()}")
 
-        with mss.mss() as sct:
+        try:
             while self.quick_btn_monitoring:
+                self.quick_poller.begin_tick()
                 try:
-                    if not self.quick_btn_enabled.get():
-                        if self.inventory_open:
-                            self.after(0, self.hide_quick_button)
-                        if self.sell_ui_open:
-                            self.after(0, self.hide_quick_sell)
-                        if self.bundle_ui_open:
-                            self.after(0, self.hide_quick_bundle)
-                        time.sleep(0.1)
-                        continue
-
-                    # === 인벤토리 감지 (버리기/팔기/꾸러미 ON일 때) ===
-                    found_discard = False
-                    bundle_on = getattr(self, 'inv_running', False)  # 신화장난꾸러미
-                    if self.discard_running or self.sell_running or bundle_on:
-                        # 위치 1 설정값
-                        pos1_x = self.detect_pos1_x.get()
-                        pos1_y = self.detect_pos1_y.get()
-                        hex_color1 = self.detect_color1.get().lstrip('#')
-                        target1_r = int(hex_color1[0:2], 16)
-                        target1_g = int(hex_color1[2:4], 16)
-                        target1_b = int(hex_color1[4:6], 16)
-
-                        # 위치 2 설정값
-                        pos2_x = self.detect_pos2_x.get()
-                        pos2_y = self.detect_pos2_y.get()
-                        hex_color2 = self.detect_color2.get().lstrip('#')
-                        target2_r = int(hex_color2[0:2], 16)
-                        target2_g = int(hex_color2[2:4], 16)
-                        target2_b = int(hex_color2[4:6], 16)
-
-                        # 위치 1 확인
-                        monitor1 = {"top": pos1_y, "left": pos1_x, "width": 1, "height": 1}
-                        screenshot1 = sct.grab(monitor1)
-                        img1 = Image.frombytes("RGB", screenshot1.size, screenshot1.bgra, "raw", "BGRX")
-                        color1 = img1.getpixel((0, 0))
-                        found1 = (abs(color1[0] - target1_r) <= tolerance and
-                                 abs(color1[1] - target1_g) <= tolerance and
-                                 abs(color1[2] - target1_b) <= tolerance)
-
-                        # 위치 2 확인
-                        monitor2 = {"top": pos2_y, "left": pos2_x, "width": 1, "height": 1}
-                        screenshot2 = sct.grab(monitor2)
-                        img2 = Image.frombytes("RGB", screenshot2.size, screenshot2.bgra, "raw", "BGRX")
-                        color2 = img2.getpixel((0, 0))
-                        found2 = (abs(color2[0] - target2_r) <= tolerance and
-                                 abs(color2[1] - target2_g) <= tolerance and
-                                 abs(color2[2] - target2_b) <= tolerance)
-
-                        found_discard = found1 or found2
-
-                    # === 버리기 버튼 표시 ===
-                    if self.discard_running:
-                        if found_discard and not self.inventory_open:
-                            self.inventory_open = True
-                            self.after(0, self.show_quick_button)
-                        elif not found_discard and self.inventory_open:
-                            self.after(0, self.hide_quick_button)
-                    else:
-                        if self.inventory_open:
-                            self.after(0, self.hide_quick_button)
-
-                    # === 팔기 버튼 표시 ===
-                    if self.sell_running:
-                        if found_discard and not self.sell_ui_open:
-                            self.sell_ui_open = True
-                            self.after(0, self.show_quick_sell)
-                        elif not found_discard and self.sell_ui_open:
-                            self.after(0, self.hide_quick_sell)
-                    else:
-                        if self.sell_ui_open:
-                            self.after(0, self.hide_quick_sell)
-
-                    # === 꾸러미 버튼 표시 ===
-                    if bundle_on:
-                        if found_discard and not self.bundle_ui_open:
-                            self.bundle_ui_open = True
-                            self.after(0, self.show_quick_bundle)
-                        elif not found_discard and self.bundle_ui_open:
-                            self.after(0, self.hide_quick_bundle)
+                    if not self.quick_btn_settings.current.enabled:
+                        self.ui_state.reset()
+                        self.screen_capture.set_consumer('quick_button', None)
+                        self._sync_quick_buttons(False)
+                        self.quick_poller.observe(None)
                     else:
-                        if self.bundle_ui_open:
-                            self.after(0, self.hide_quick_bundle)
+                        # === UI 상태 감지 (버리기/팔기/꾸러미 ON일 때) ===
+                        bundle_on = getattr(self, 'inv_running', False)  # 신화장난꾸러미
+                        if self.discard_running or self.sell_running or bundle_on:
+                            # 한 번의 캡처로 모든 서명 평가 (최근 공유 프레임이 있으면 재사용)
+                            # 읽을 영역을 등록해 두면 벨리알의 공유 캡처가 함께 덮는다
+                            self.screen_capture.set_consumer('quick_button', self.ui_state.regions())
+                            self.ui_state.update(self.screen_capture, max_age=0.03)
+                            self.quick_poller.observe(self.ui_state.last_frame)
+                            # 디바운스 중이면 빠르게 확정
+                            if self.ui_state.pending:
+                                self.quick_poller.hurry()
+                        else:
+                            self.ui_state.reset()
+                            self.screen_capture.set_consumer('quick_button', None)
+                            self.quick_poller.observe(None)
+
+                        self._sync_quick_buttons(bundle_on)
 
                 except Exception as e:
                     pass
 
-                time.sleep(0.03)  # 0.03초 간격 (~33fps)
+                self.quick_poller.end_tick()
+                self.quick_poller.wait()  # 0.03초(~33fps) ~ 0.25초 적응형 간격
+        finally:
+            self.screen_capture.set_consumer('quick_button', None)
+            self.screen_capture.release_thread()
+
+    def _on_ui_state_changed(self, old, new):
+        """UI 상태 변경 알림 (디바운스된 상태만 전달됨)"""
+        print(f"[QuickBtn] UI 상태: {old.value} → {new.value}")
+        self.quick_poller.hurry()
+
+    def _sync_quick_buttons(self, bundle_on):
+        """현재 UI 상태에 맞게 버튼 표시/숨기기 (바뀔 때만 after 호출)
+
+        버튼마다 쓰는 화면이 다르다: 버리기는 인벤토리/판매창, 팔기는 판매창,
+        꾸러미(인벤토리 정리)는 인벤토리/창고.
+        """
+        state = self.ui_state.state
+
+        # === 버리기 버튼 ===
+        show = self.discard_running and state in (UiState.INVENTORY, UiState.SELL)
+        if show and not self.inventory_open:
+            self.inventory_open = True
+            self.after(0, self.show_quick_button)
+        elif not show and self.inventory_open:
+            self.inventory_open = False
+            self.after(0, self.hide_quick_button)
+
+        # === 팔기 버튼 ===
+        show = self.sell_running and state == UiState.SELL
+        if show and not self.sell_ui_open:
+            self.sell_ui_open = True
+            self.after(0, self.show_quick_sell)
+        elif not show and self.sell_ui_open:
+            self.sell_ui_open = False
+            self.after(0, self.hide_quick_sell)
+
+        # === 꾸러미 버튼 ===
+        show = bundle_on and state in (UiState.INVENTORY, UiState.STASH)
+        if show and not self.bundle_ui_open:
+            self.bundle_ui_open = True
+            self.after(0, self.show_quick_bundle)
+        elif not show and self.bundle_ui_open:
+            self.bundle_ui_open = False
+            self.after(0, self.hide_quick_bundle)
 
     def color_changed(self, color1, color2, threshold):
         """두 색상이 임계값 이상 다른지 확인"""
@@ -622,7 +652,7 @@ class QuickButtonMixin:
     def start_detect_picker(self, position_num):
         """인식 위치 픽커 시작 (돋보기)"""
         import pyautogui
-        from PIL import ImageGrab, ImageTk
+        from PIL import ImageTk
         import win32api
 
         self._detect_picker_mode = True
@@ -713,7 +743,7 @@ class QuickButtonMixin:
                         select_position()
                         return
 
-                img = ImageGrab.grab(bbox=(x - half, y - half, x + half + 1, y + half + 1))
+                img = self.screen_capture.grab_image(x - half, y - half, capture_size, capture_size)
                 center_color = img.getpixel((half, half))
                 hex_color = '#{:02x}{:02x}{:02x}'.format(*center_color).upper()
 
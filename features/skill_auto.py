@@ -9,6 +9,17 @@ import keyboard
 import win32api
 
 from constants import COLORS
+from utils.cooldown_queue import SkillSpec, SkillTimeline
+from utils.input_backend import INJECTED_TAG
+from utils.precise_timer import release_thread as release_timer_thread
+from utils.settings_snapshot import SnapshotPublisher, frozen_settings
+
+
+@frozen_settings
+class SkillPresetSettings:
+    """스킬 워커가 읽는 프리셋 설정 (불변 스냅샷) - specs 는 사용 가능한 슬롯만"""
+    specs: tuple
+    honryeongsa: bool
 
 
 class SkillAutoMixin:
@@ -20,6 +31,14 @@ class SkillAutoMixin:
         """스킬 자동 관련 변수 초기화 - 5개 프리셋"""
         import customtkinter as ctk
 
+        # 모든 프리셋을 한 스레드에서 실행 (한 시간축 + 키 출력 최소 간격)
+        self.skill_key_gap = ctk.DoubleVar(value=0.02)
+        self.skill_timeline = SkillTimeline(key_gap=self.skill_key_gap.get())
+        self.skill_wake = threading.Event()  # 설정 변경/시작/중지/일시정지 시 워커 깨우기
+        self.skill_key_gap.trace_add('write', lambda *args: self._apply_skill_key_gap())
+        self._skill_worker = None
+        self._skill_worker_lock = threading.Lock()
+
         # 5개 프리셋 배열
         self.skill_presets = []
         for i in range(self.SKILL_PRESET_COUNT):
@@ -32,8 +51,9 @@ class SkillAutoMixin:
                 'trigger_modifier': ctk.StringVar(value="없음"),
                 'last_trigger_time': 0,
                 'slots': [],               # 9개 슬롯
-                'last_used': [0.0] * 9,    # 각 스킬별 마지막 사용 시간
                 'honryeongsa_mode': ctk.BooleanVar(value=False),
+                '_settings': None,         # SkillPresetSettings 게시자 (슬롯 설정이 바뀔 때 재생성)
+                '_wake': self.skill_wake,  # 설정 변경/중지/일시정지 시 워커 깨우기 (공용)
                 # UI 위젯 참조 (동적 생성)
                 '_start_btn': None,
                 '_status_label': None,
@@ -49,6 +69,7 @@ class SkillAutoMixin:
                     'hold': ctk.BooleanVar(value=False)  # hold 모드: 꾹 누르기
                 }
                 preset['slots'].append(slot)
+            self._publish_skill_preset_settings(preset)
             self.skill_presets.append(preset)
 
         # 현재 UI에서 선택된 프리셋 인덱스
@@ -63,22 +84,49 @@ class SkillAutoMixin:
         self.skill_slots = self.skill_presets[0]['slots']
         self.honryeongsa_mode = self.skill_presets[0]['honryeongsa_mode']
 
+    def _apply_skill_key_gap(self):
+        """키 입력 간격 변경 → 타임라인에 반영"""
+        try:
+            self.skill_timeline.key_gap = max(0.0, self.skill_key_gap.get())
+        except:
+            pass
+
+    def _publish_skill_preset_settings(self, preset):
+        """슬롯 설정 변수 → SkillPresetSettings 게시 (바뀌면 워커 깨우기)"""
+        variables = [preset['honryeongsa_mode']]
+        for slot in preset['slots']:
+            variables += [slot['enabled'], slot['key'], slot['cooldown'], slot['hold']]
+        preset['_settings'] = SnapshotPublisher(
+            lambda: self._build_skill_preset_settings(preset), variables,
+            on_publish=lambda snapshot: preset['_wake'].set())
+
+    def _build_skill_preset_settings(self, preset):
+        specs = []
+        for i, slot in enumerate(preset['slots']):
+            if not slot['enabled'].get():
+                continue
+            cooldown = slot['cooldown'].get()
+            if cooldown <= 0:
+                continue
+            specs.append(SkillSpec(i, slot['key'].get(), cooldown, slot['hold'].get()))
+        return SkillPresetSettings(tuple(specs), preset['honryeongsa_mode'].get())
+
     def _execute_skill_key(self, key):
         """스킬 키 입력 실행 (공통 함수)"""
         import win32con
         try:
             if key == "좌클릭" or key == "왼클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, INJECTED_TAG)
+                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, INJECTED_TAG)
             elif key == "우클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, INJECTED_TAG)
+                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, INJECTED_TAG)
             elif key.lower() == "mouse4":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
             elif key.lower() == "mouse5":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, 0)
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
             else:
                 keyboard.press_and_release(key.lower())
         except:
@@ -89,13 +137,13 @@ class SkillAutoMixin:
         import win32con
         try:
             if key == "좌클릭" or key == "왼클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, INJECTED_TAG)
             elif key == "우클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, INJECTED_TAG)
             elif key.lower() == "mouse4":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
             elif key.lower() == "mouse5":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XDOWN, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
             else:
                 keyboard.press(key.lower())
         except:
@@ -106,13 +154,13 @@ class SkillAutoMixin:
         import win32con
         try:
             if key == "좌클릭" or key == "왼클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, INJECTED_TAG)
             elif key == "우클릭":
-                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, 0, 0, 0, INJECTED_TAG)
             elif key.lower() == "mouse4":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON1, INJECTED_TAG)
             elif key.lower() == "mouse5":
-                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, 0)
+                win32api.mouse_event(win32con.MOUSEEVENTF_XUP, 0, 0, win32con.XBUTTON2, INJECTED_TAG)
             else:
                 keyboard.release(key.lower())
         except:
@@ -146,6 +194,7 @@ class SkillAutoMixin:
             # 중지
             preset['active'] = False
             preset['paused'] = False
+            preset['_wake'].set()
             if preset['_start_btn']:
                 preset['_start_btn'].configure(
                     text="▶️ 시작",
@@ -164,83 +213,125 @@ class SkillAutoMixin:
         self.update_home_status_now()
         self._update_skill_preset_summary()
 
-    def run_skill_auto_loop(self, preset_idx):
-        """스킬 자동 루프 - 특정 프리셋에 대해 실행"""
-        preset = self.skill_presets[preset_idx]
+    def _ensure_skill_worker(self):
+        """스킬 워커 스레드 시작 (이미 돌고 있으면 깨우기만)"""
+        with self._skill_worker_lock:
+            if self._skill_worker is None or not self._skill_worker.is_alive():
+                self._skill_worker = threading.Thread(target=self.run_skill_worker, daemon=True)
+                self._skill_worker.start()
+        self.skill_wake.set()
 
-        # 상태 라벨 업데이트
+    def _on_skill_preset_started(self, preset_idx):
+        preset = self.skill_presets[preset_idx]
         if preset['_status_label']:
             self.after(0, lambda: preset['_status_label'].configure(text="⚡ 스킬 실행 중..."))
-
-        # 오버레이 상태 업데이트
         self.after(0, lambda: self._update_overlay_preset_status(preset_idx, "active"))
 
-        # 마지막 사용 시간 초기화
-        preset['last_used'] = [0.0] * 9
-
-        # hold 모드 키 상태 추적 (눌려있는지 여부)
-        hold_key_pressed = [False] * 9
+    def _on_skill_preset_finished(self, preset_idx):
+        preset = self.skill_presets[preset_idx]
+        preset['active'] = False
+        if preset['_status_label']:
+            self.after(0, lambda: preset['_status_label'].configure(text="⏹️ 중지됨"))
+        if preset['_pause_label']:
+            self.after(0, lambda: preset['_pause_label'].configure(text=""))
+        self.after(0, lambda: self._update_overlay_preset_status(preset_idx, "stopped"))
 
-        while preset['active'] and preset['running']:
-            if preset['paused']:
-                # 일시정지 시 hold 키 모두 떼기
-                for i, slot in enumerate(preset['slots']):
-                    if hold_key_pressed[i] and slot['hold'].get():
-                        self._release_skill_key(slot['key'].get())
-                        hold_key_pressed[i] = False
-                time.sleep(0.01)
+    def _release_skill_holds(self, held, preset_idx):
+        """프리셋의 hold 키 모두 떼기 (held: (프리셋, 슬롯) → 키)"""
+        for slot_key in [k for k in held if k[0] == preset_idx]:
+            self._release_skill_key(held.pop(slot_key))
+
+    def _sync_skill_presets(self, states, versions, honryeongsa, held):
+        """프리셋 시작/일시정지/중지/설정 변경을 타임라인에 반영"""
+        timeline = self.skill_timeline
+        for idx, preset in enumerate(self.skill_presets):
+            if preset['active'] and preset['running']:
+                state = 'paused' if preset['paused'] else 'active'
+            else:
+                state = None
+            previous = states.get(idx)
+
+            if state != 'active':
+                # 일시정지/중지 시 hold 키 모두 떼기
+                self._release_skill_holds(held, idx)
+
+            if state is None:
+                if previous is not None:
+                    timeline.remove_group(idx)
+                    versions.pop(idx, None)
+                    del states[idx]
+                    self._on_skill_preset_finished(idx)
                 continue
 
-            current_time = time.time()
+            if previous is None:
+                self._on_skill_preset_started(idx)
+            states[idx] = state
 
-            for i, slot in enumerate(preset['slots']):
-                if not slot['enabled'].get():
-                    # 비활성화된 슬롯의 hold 키 떼기
-                    if hold_key_pressed[i]:
-                        self._release_skill_key(slot['key'].get())
-                        hold_key_pressed[i] = False
-                    continue
+            if state == 'paused':
+                if previous == 'active':
+                    timeline.set_group(idx, [])  # 마지막 사용 시각은 유지
+                    versions[idx] = None         # 재개 시 스냅샷 다시 반영
+                continue
 
-                cooldown = slot['cooldown'].get()
-                if cooldown <= 0:
-                    continue
+            # 새 스냅샷이 게시됐을 때만 반영
+            settings = preset['_settings'].current
+            if versions.get(idx) is not settings:
+                versions[idx] = settings
+                specs = settings.specs
+                honryeongsa[idx] = settings.honryeongsa
+                by_index = {spec.index: spec for spec in specs}
+                for slot_key in [k for k in held if k[0] == idx]:
+                    spec = by_index.get(slot_key[1])
+                    if spec is None or not spec.hold or spec.key != held[slot_key]:
+                        # 비활성화/변경된 슬롯의 hold 키 떼기
+                        self._release_skill_key(held.pop(slot_key))
+                timeline.set_group(idx, specs)
+
+    def run_skill_worker(self):
+        """스킬 워커 - 모든 실행 중 프리셋의 슬롯을 한 시간축에서 순서대로 입력
+
+        가장 이른 마감까지만 자고, 키 출력 사이에는 skill_key_gap 이상 간격을 둔다.
+        프리셋 시작/중지/설정 변경은 skill_wake 로 깨워서 반영한다 (스레드 재시작 없음).
+        """
+        timeline = self.skill_timeline
+        wake = self.skill_wake
+        states = {}       # 프리셋 번호 → 'active' | 'paused'
+        versions = {}     # 프리셋 번호 → 마지막으로 반영한 설정 스냅샷
+        honryeongsa = {}  # 프리셋 번호 → 혼령사 모드
+        held = {}         # (프리셋, 슬롯) → hold 모드로 눌려 있는 키
+
+        while True:
+            self._sync_skill_presets(states, versions, honryeongsa, held)
+            if not states:
+                # 실행 중인 프리셋 없음 - 타이머 핸들은 닫고 다음 시작까지 대기
+                release_timer_thread()
+                wake.wait()
+                wake.clear()
+                continue
 
-                key = slot['key'].get()
-                is_hold = slot['hold'].get()
-
-                if current_time - preset['last_used'][i] >= cooldown:
-                    # 혼령사 모드
-                    if preset['honryeongsa_mode'].get() and key.lower() == "space":
-                        if win32api.GetAsyncKeyState(0x20) & 0x8000:
-                            continue
-
-                    if is_hold:
-                        # hold 모드: 아직 안 눌렸으면 누르기
-                        if not hold_key_pressed[i]:
-                            self._press_skill_key(key)
-                            hold_key_pressed[i] = True
+            now = timeline.clock()
+            item = timeline.pop_next(now)
+            while item is not None:
+                idx, _, spec = item
+                if honryeongsa.get(idx) and spec.key.lower() == "space" and win32api.GetAsyncKeyState(0x20) & 0x8000:
+                    # 혼령사 모드: 스페이스 누르는 중이면 잠시 뒤 다시
+                    timeline.defer(idx, spec, 0.01, now)
+                elif spec.hold:
+                    # hold 모드: 아직 안 눌렸으면 누르기
+                    if (idx, spec.index) not in held:
+                        self._press_skill_key(spec.key)
+                        held[(idx, spec.index)] = spec.key
+                        timeline.fired_at(idx, spec, now)
                     else:
-                        # 일반 모드: 누르고 떼기
-                        self._execute_skill_key(key)
-
-                    preset['last_used'][i] = current_time
-
-            time.sleep(0.01)
+                        timeline.fired_at(idx, spec, now, output=False)
+                else:
+                    # 일반 모드: 누르고 떼기
+                    self._execute_skill_key(spec.key)
+                    timeline.fired_at(idx, spec, now)
+                now = timeline.clock()
+                item = timeline.pop_next(now)
 
-        # 루프 종료 시 모든 hold 키 떼기
-        for i, slot in enumerate(preset['slots']):
-            if hold_key_pressed[i]:
-                self._release_skill_key(slot['key'].get())
-                hold_key_pressed[i] = False
-
-        preset['active'] = False
-        if preset['_status_label']:
-            self.after(0, lambda: preset['_status_label'].configure(text="⏹️ 중지됨"))
-        if preset['_pause_label']:
-            self.after(0, lambda: preset['_pause_label'].configure(text=""))
-
-        # 오버레이 상태 업데이트
-        self.after(0, lambda: self._update_overlay_preset_status(preset_idx, "stopped"))
+            timeline.wait(wake)
 
     def on_skill_preset_trigger_key(self, preset_idx, event=None):
         """프리셋별 핫키 핸들러"""
@@ -264,6 +355,7 @@ class SkillAutoMixin:
             # 중지
             preset['active'] = False
             preset['paused'] = False
+            preset['_wake'].set()
             if preset['_status_label']:
                 self.after(0, lambda: preset['_status_label'].configure(text="⏹️ 중지됨"))
             if preset['_pause_label']:
@@ -273,7 +365,7 @@ class SkillAutoMixin:
             # 시작
             preset['active'] = True
             preset['paused'] = False
-            threading.Thread(target=self.run_skill_auto_loop, args=(preset_idx,), daemon=True).start()
+            self._ensure_skill_worker()
 
     def on_skill_auto_enter_pause(self, event):
         """Enter 키로 모든 활성 프리셋 pause/resume 토글"""
@@ -282,6 +374,7 @@ class SkillAutoMixin:
                 continue
 
             preset['paused'] = not preset['paused']
+            preset['_wake'].set()
             if preset['paused']:
                 if preset['_pause_label']:
                     self.after(0, lambda p=preset: p['_pause_label'].configure(
@@ -334,87 +427,17 @@ class SkillAutoMixin:
 
     def change_skill_preset_trigger_key(self, preset_idx):
         """특정 프리셋의 핫키 변경"""
-        import customtkinter as ctk
-
         preset = self.skill_presets[preset_idx]
 
-        dialog = ctk.CTkToplevel(self)
-        dialog.title(f"프리셋 {preset_idx + 1} 핫키 설정")
-        dialog.geometry("300x150")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="새 핫키를 누르세요...\n(마우스 4/5번도 가능)",
-                     font=ctk.CTkFont(size=14)).pack(pady=20)
-
-        dialog_active = [True]
-
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                # 충돌 체크
-                conflict_msg = self.check_skill_preset_hotkey_conflict(preset_idx, event.name)
-                if conflict_msg:
-                    from tkinter import messagebox
-                    self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
-                    dialog.destroy()
-                    return
-                preset['trigger_key'].set(event.name)
-                if hasattr(self, 'skill_preset_key_display') and self.skill_current_preset_idx.get() == preset_idx:
-                    self.skill_preset_key_display.configure(text=event.name.upper())
-                self._update_skill_preset_summary()
-                self.setup_hotkey()
-                dialog.destroy()
-
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        def poll_mouse():
-            time.sleep(0.3)
-            while dialog_active[0]:
-                if not (win32api.GetAsyncKeyState(0x05) & 0x8000) and not (win32api.GetAsyncKeyState(0x06) & 0x8000):
-                    break
-                time.sleep(0.01)
-            time.sleep(0.1)
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: preset['trigger_key'].set("mouse4"))
-                    if hasattr(self, 'skill_preset_key_display') and self.skill_current_preset_idx.get() == preset_idx:
-                        self.after(0, lambda: self.skill_preset_key_display.configure(text="MOUSE4"))
-                    while win32api.GetAsyncKeyState(0x05) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self._update_skill_preset_summary)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: preset['trigger_key'].set("mouse5"))
-                    if hasattr(self, 'skill_preset_key_display') and self.skill_current_preset_idx.get() == preset_idx:
-                        self.after(0, lambda: self.skill_preset_key_display.configure(text="MOUSE5"))
-                    while win32api.GetAsyncKeyState(0x06) & 0x8000:
-                        time.sleep(0.01)
-                    time.sleep(0.1)
-                    self.after(0, self._update_skill_preset_summary)
-                    self.after(0, self.setup_hotkey)
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            self.setup_hotkey()  # Lock 안에서 unhook_all + 재등록
-            dialog.destroy()
-
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        def apply(key_name):
+            preset['trigger_key'].set(key_name)
+            if hasattr(self, 'skill_preset_key_display') and self.skill_current_preset_idx.get() == preset_idx:
+                self.skill_preset_key_display.configure(text=key_name.upper())
+            self._update_skill_preset_summary()
+            self.setup_hotkey()
+
+        self.open_key_capture(f"프리셋 {preset_idx + 1} 핫키 설정", apply,
+                              conflict_check=lambda key: self.check_skill_preset_hotkey_conflict(preset_idx, key))
 
     def check_skill_preset_hotkey_conflict(self, preset_idx, new_key):
         """프리셋 핫키 충돌 체크"""
@@ -432,80 +455,14 @@ class SkillAutoMixin:
 
     def change_skill_preset_slot_key(self, preset_idx, slot_idx):
         """특정 프리셋의 슬롯 키 변경"""
-        import customtkinter as ctk
-
         preset = self.skill_presets[preset_idx]
 
-        dialog = ctk.CTkToplevel(self)
-        dialog.title(f"프리셋 {preset_idx + 1} - 슬롯 {slot_idx + 1} 키 설정")
-        dialog.geometry("320x180")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        ctk.CTkLabel(dialog, text="누를 키를 입력하세요\n(키보드 또는 마우스 버튼)",
-                     font=ctk.CTkFont(size=14)).pack(pady=15)
-        ctk.CTkLabel(dialog, text="마우스: 좌클릭, 우클릭, Mouse4, Mouse5",
-                     font=ctk.CTkFont(size=11), text_color="#888888").pack()
-
-        dialog_active = [True]
-
         def update_slot_key(key_name):
             preset['slots'][slot_idx]['key'].set(key_name)
             if preset['_slot_widgets'] and slot_idx < len(preset['_slot_widgets']):
                 preset['_slot_widgets'][slot_idx]['key_label'].configure(text=key_name.upper())
 
-        def on_key(event):
-            if dialog_active[0]:
-                dialog_active[0] = False
-                self.after(0, lambda: update_slot_key(event.name))
-                dialog.destroy()
-
-        def start_key_detection():
-            time.sleep(0.3)
-            if dialog_active[0]:
-                keyboard.on_press(on_key, suppress=False)
-
-        threading.Thread(target=start_key_detection, daemon=True).start()
-
-        def poll_mouse():
-            time.sleep(0.3)
-            win32api.GetAsyncKeyState(0x01)
-            win32api.GetAsyncKeyState(0x02)
-            win32api.GetAsyncKeyState(0x05)
-            win32api.GetAsyncKeyState(0x06)
-
-            while dialog_active[0]:
-                if win32api.GetAsyncKeyState(0x01) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_slot_key("좌클릭"))
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x02) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_slot_key("우클릭"))
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x05) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_slot_key("mouse4"))
-                    self.after(0, dialog.destroy)
-                    break
-                if win32api.GetAsyncKeyState(0x06) & 0x8000:
-                    dialog_active[0] = False
-                    self.after(0, lambda: update_slot_key("mouse5"))
-                    self.after(0, dialog.destroy)
-                    break
-                time.sleep(0.01)
-
-        threading.Thread(target=poll_mouse, daemon=True).start()
-
-        def on_close():
-            dialog_active[0] = False
-            keyboard.unhook_all()
-            self.setup_hotkey()
-            dialog.destroy()
-
-        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        self.open_action_key_capture(update_slot_key, title=f"프리셋 {preset_idx + 1} - 슬롯 {slot_idx + 1} 키 설정")
 
     # ===============================
     # 하위 호환성을 위한 래퍼 메서드들
@@ -5,8 +5,10 @@ UI 모듈
 
 from .overlay import OverlayMixin
 from .main_window import MainWindowMixin
+from .key_capture import KeyCaptureMixin
 
 __all__ = [
     'OverlayMixin',
     'MainWindowMixin',
+    'KeyCaptureMixin',
 ]
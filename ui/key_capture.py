@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+키 입력 다이얼로그 (핫키 / 누를 키 설정 공용)
+"""
+
+import threading
+import time
+
+from utils.mouse_hook import BUTTON_KEY_NAMES, CLICK_BUTTONS, SIDE_BUTTONS
+
+# 다이얼로그를 연 클릭/키 입력이 잡히지 않도록 무시하는 시간
+ARM_DELAY = 0.3
+
+HOTKEY_PROMPT = "새 핫키를 누르세요...\n(마우스 4/5번도 가능)"
+ACTION_PROMPT = "누를 키를 입력하세요\n(키보드 또는 마우스 버튼)"
+ACTION_HINT = "마우스: 좌클릭, 우클릭, Mouse4, Mouse5"
+
+
+class KeyCapture:
+    """입력 하나 받기 - 키보드 디스패처 리스너와 마우스 훅 구독을 하나씩 빌린다
+
+    스레드를 만들지 않고 (ARM_DELAY 는 이벤트 시각으로 거름),
+    입력을 받거나 release() 하면 빌린 리스너를 바로 돌려준다.
+    on_capture(키 이름) 는 schedule 을 통해 (메인 스레드) 한 번만 불린다.
+    """
+
+    def __init__(self, hotkeys, mouse_hook, on_capture, schedule, mouse_buttons=SIDE_BUTTONS,
+                 arm_delay=ARM_DELAY, clock=time.perf_counter):
+        self.hotkeys = hotkeys
+        self.mouse_hook = mouse_hook
+        self.on_capture = on_capture
+        self.schedule = schedule
+        self.mouse_buttons = tuple(mouse_buttons)
+        self.arm_delay = arm_delay
+        self.clock = clock
+        self.active = False
+        self._lock = threading.Lock()
+        self._armed_at = 0.0
+        self._listener = None
+        self._mouse = None
+
+    def start(self):
+        self.active = True
+        self._armed_at = self.clock() + self.arm_delay
+        self._listener = self.hotkeys.listen(self._on_key, transient=True)
+        if self.mouse_buttons:
+            self._mouse = self.mouse_hook.capture_button(self._on_mouse, self.mouse_buttons, self.arm_delay)
+        return self
+
+    def _on_key(self, event):
+        if self.clock() >= self._armed_at:
+            self._finish(event.name)
+
+    def _on_mouse(self, button):
+        self._finish(BUTTON_KEY_NAMES.get(button, button))
+
+    def _finish(self, key_name):
+        # 키보드 훅 스레드와 마우스 디스패치 스레드가 동시에 올 수 있음
+        with self._lock:
+            if not self.active:
+                return
+            self.release()
+        self.schedule(lambda: self.on_capture(key_name))
+
+    def release(self):
+        """리스너 반납 (여러 번 불러도 됨)"""
+        self.active = False
+        if self._listener is not None:
+            self.hotkeys.unlisten(self._listener)
+            self._listener = None
+        if self._mouse is not None:
+            self.mouse_hook.unsubscribe(self._mouse)
+            self._mouse = None
+
+
+class KeyCaptureMixin:
+    """키 입력 다이얼로그 믹스인"""
+
+    def open_key_capture(self, title, on_capture, prompt=HOTKEY_PROMPT, hint=None,
+                         mouse_buttons=SIDE_BUTTONS, conflict_check=None, geometry="300x150"):
+        """키 입력 다이얼로그 - 입력 하나를 받아 on_capture(키 이름) 호출 (메인 스레드)
+
+        conflict_check(키 이름) 가 메시지를 돌려주면 경고만 띄우고 설정하지 않는다.
+        """
+        import customtkinter as ctk
+
+        dialog = ctk.CTkToplevel(self)
+        dialog.title(title)
+        dialog.geometry(geometry)
+        dialog.transient(self)
+        dialog.grab_set()
+
+        ctk.CTkLabel(dialog, text=prompt, font=ctk.CTkFont(size=14)).pack(pady=15 if hint else 20)
+        if hint:
+            ctk.CTkLabel(dialog, text=hint, font=ctk.CTkFont(size=11), text_color="#888888").pack()
+
+        def on_key(key_name):
+            dialog.destroy()
+            conflict_msg = conflict_check(key_name) if conflict_check else None
+            if conflict_msg:
+                from tkinter import messagebox
+                self.after(100, lambda: messagebox.showwarning("핫키 충돌", conflict_msg))
+                return
+            on_capture(key_name)
+
+        capture = KeyCapture(self.hotkeys, self.mouse_hook, on_key,
+                             lambda fn: self.after(0, fn), mouse_buttons).start()
+
+        def on_close():
+            capture.release()
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        return capture
+
+    def open_hotkey_capture(self, key_var, display_attr, title="핫키 설정", conflict_check=None,
+                            on_change=None):
+        """트리거 핫키 변경 - key_var 저장, 표시 라벨 갱신, 바뀐 바인딩만 교체"""
+        def apply(key_name):
+            key_var.set(key_name)
+            display = getattr(self, display_attr, None)
+            if display is not None:
+                display.configure(text=key_name.upper())
+            if on_change is not None:
+                on_change()
+            self.setup_hotkey()
+
+        return self.open_key_capture(title, apply,
+                                     conflict_check=conflict_check or self.check_hotkey_conflict)
+
+    def open_action_key_capture(self, on_capture, title="누를 키 설정"):
+        """누를 키 변경 - 키보드 키 또는 좌클릭/우클릭/Mouse4/Mouse5"""
+        return self.open_key_capture(title, on_capture, prompt=ACTION_PROMPT, hint=ACTION_HINT,
+                                     mouse_buttons=CLICK_BUTTONS, geometry="320x180")
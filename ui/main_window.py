@@ -9,6 +9,7 @@ import tkinter as tk
 import threading
 
 from constants import VERSION, DEFAULT_FONT, COLORS
+from utils.target_sweep import TARGET_POLICIES, policy_from_label, policy_label
 
 
 def create_numeric_entry(parent, variable, width=50, is_float=True):
@@ -461,6 +462,17 @@ class MainWindowMixin:
         ctk.CTkLabel(delay_frame, text="딜레이(ms):", font=ctk.CTkFont(family=DEFAULT_FONT, size=11)).pack(side="left")
         create_numeric_entry(delay_frame, self.click_delay, width=50, is_float=True).pack(side="right")
 
+        # 클릭 순서 (한 프레임에서 찾은 대상들을 한 번에 클릭)
+        order_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        order_frame.pack(fill="x", pady=2)
+        ctk.CTkLabel(order_frame, text="클릭 순서:", font=ctk.CTkFont(family=DEFAULT_FONT, size=11)).pack(side="left")
+        order_menu = ctk.CTkComboBox(order_frame, values=[label for label, _ in TARGET_POLICIES.values()],
+                                     width=95, height=22, state="readonly",
+                                     command=lambda label: self.target_policy.set(policy_from_label(label)))
+        order_menu.set(policy_label(self.target_policy.get()))
+        order_menu.pack(side="right")
+        self.target_policy.trace_add('write', lambda *args: order_menu.set(policy_label(self.target_policy.get())))
+
         # 핫키
         key_frame = ctk.CTkFrame(parent, fg_color="transparent")
         key_frame.pack(fill="x", pady=2)
@@ -582,7 +594,7 @@ class MainWindowMixin:
 
         panel_row = ctk.CTkFrame(settings_box, fg_color="transparent")
         panel_row.pack(fill="x", pady=1)
-        ctk.CTkLabel(panel_row, text="패널대기:", font=ctk.CTkFont(family=DEFAULT_FONT, size=10)).pack(side="left")
+        ctk.CTkLabel(panel_row, text="패널최대:", font=ctk.CTkFont(family=DEFAULT_FONT, size=10)).pack(side="left")
         create_numeric_entry(panel_row, self.inv_panel_delay, width=45, is_float=True).pack(side="right")
 
         space_row = ctk.CTkFrame(settings_box, fg_color="transparent")
@@ -595,6 +607,10 @@ class MainWindowMixin:
         ctk.CTkLabel(click_row, text="슬롯간격:", font=ctk.CTkFont(family=DEFAULT_FONT, size=10)).pack(side="left")
         create_numeric_entry(click_row, self.inv_click_delay, width=45, is_float=True).pack(side="right")
 
+        ctk.CTkCheckBox(settings_box, text="빈칸 건너뛰기", variable=self.inv_skip_empty,
+                        font=ctk.CTkFont(family=DEFAULT_FONT, size=10),
+                        checkbox_width=16, checkbox_height=16).pack(anchor="w", pady=1)
+
         # 컨트롤
         ctrl_box = self.create_section_box(row1, "컨트롤", "🎮")
         ctrl_box.master.pack(side="left", fill="both", expand=True, padx=2)
@@ -904,6 +920,13 @@ class MainWindowMixin:
         # 초기 UI 빌드 (프리셋 0)
         self.build_skill_preset_ui(0)
 
+        # === 공통: 키 입력 최소 간격 (모든 프리셋 입력은 한 스레드에서 순서대로) ===
+        gap_frame = ctk.CTkFrame(parent, fg_color="#2a2a4e", corner_radius=8)
+        gap_frame.pack(fill="x", pady=5, padx=5)
+        ctk.CTkLabel(gap_frame, text="⌨️ 키 입력 최소 간격(초):",
+                     font=ctk.CTkFont(family=DEFAULT_FONT, size=12, weight="bold")).pack(side="left", padx=10, pady=8)
+        create_numeric_entry(gap_frame, self.skill_key_gap, width=60, is_float=True).pack(side="right", padx=10)
+
         # === 하단: 전체 프리셋 상태 요약 ===
         summary_box = self.create_section_box(parent, "프리셋 상태 요약", "📊")
 
@@ -938,6 +961,8 @@ class MainWindowMixin:
         help_frame.pack(fill="x", pady=5, padx=5)
         ctk.CTkLabel(help_frame, text="💡 각 프리셋은 독립적인 핫키로 동시 실행 가능",
                      font=ctk.CTkFont(family=DEFAULT_FONT, size=11), text_color="#cccccc").pack(pady=3)
+        ctk.CTkLabel(help_frame, text="💡 동시 실행 시 입력이 겹치지 않게 최소 간격을 두고 순서대로 입력",
+                     font=ctk.CTkFont(family=DEFAULT_FONT, size=11), text_color="#cccccc").pack(pady=(0, 3))
         ctk.CTkLabel(help_frame, text="💡 Enter: 채팅할 때 pause / F12: 긴급정지",
                      font=ctk.CTkFont(family=DEFAULT_FONT, size=11), text_color="#cccccc").pack(pady=(0, 3))
 
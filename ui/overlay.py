@@ -174,6 +174,11 @@ class OverlayMixin:
                                                  font=('맑은 고딕', self.overlay_font_size_small))
         self.overlay_emergency_label.pack(side='left', padx=5)
 
+        # 빠른 버튼 감지 주기 / 틱당 CPU 시간
+        self.overlay_poll_label = tk.Label(keys_row, text="", bg=bg_color, fg='#888888', anchor='e',
+                                           font=('맑은 고딕', self.overlay_font_size_small))
+        self.overlay_poll_label.pack(side='right')
+
         boss_row = tk.Frame(main_frame, bg=bg_color)
         boss_row.pack(fill='x', pady=(5, 1))
 
@@ -273,6 +278,13 @@ class OverlayMixin:
             except:
                 pass
 
+        # 감지 주기 업데이트
+        if hasattr(self, 'overlay_poll_label') and self.overlay_poll_label:
+            try:
+                self.overlay_poll_label.configure(text=f"감지 {self.quick_poller.stats_text()}")
+            except:
+                pass
+
         # 월드보스는 app.py의 update_world_boss_timer에서 직접 업데이트함
 
         if self.overlay_window:
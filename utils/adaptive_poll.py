@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+적응형 폴링 스케줄러
+
+감시 영역 바이트의 해시가 그대로면 대기 간격을 지수적으로 늘리고,
+바뀌거나 kick() (상태 전환/사용자 입력) 이 들어오면 바로 최소 간격으로 돌아간다.
+현재 Hz 와 틱당 CPU 시간을 제공하여 오버레이에 표시할 수 있다.
+"""
+
+import threading
+import time
+import zlib
+
+
+class AdaptivePoller:
+    """감시 루프 대기 간격 조절기"""
+
+    def __init__(self, min_interval=0.03, max_interval=0.25, backoff=1.5, smoothing=0.2):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.interval = min_interval
+        self._last_hash = None
+        self._wake = threading.Event()
+
+        # 통계 (지수 이동 평균)
+        self.hz = 0.0
+        self.cpu_ms = 0.0
+        self._tick_cpu = None
+        self._last_tick = None
+
+    def hurry(self):
+        """다음 대기부터 최소 간격으로 (감시 스레드 안에서 호출)"""
+        self.interval = self.min_interval
+
+    def kick(self):
+        """즉시 최소 간격으로 (다른 스레드에서 호출 가능, 대기 중이면 깨움)"""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def observe(self, data):
+        """감시 영역 바이트 관찰 - 바뀌었으면 True
+
+        data 는 bytes 또는 NumPy 배열 (또는 그 목록), None 이면 '변화 없음' 으로 취급한다.
+        """
+        if data is None:
+            digest = None
+        else:
+            digest = 0
+            for part in (data if isinstance(data, (list, tuple)) else [data]):
+                digest = zlib.crc32(part if isinstance(part, bytes) else part.tobytes(), digest)
+        changed = digest is not None and digest != self._last_hash
+        self._last_hash = digest
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changed
+
+    def begin_tick(self):
+        """틱 시작 - Hz / CPU 시간 측정"""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            period = now - self._last_tick
+            if period > 0:
+                self.hz += self.smoothing * (1.0 / period - self.hz)
+        self._last_tick = now
+        self._tick_cpu = time.thread_time()
+
+    def end_tick(self):
+        """틱 종료 - 이번 틱 CPU 시간 반영"""
+        if self._tick_cpu is not None:
+            cpu_ms = (time.thread_time() - self._tick_cpu) * 1000
+            self.cpu_ms += self.smoothing * (cpu_ms - self.cpu_ms)
+            self._tick_cpu = None
+
+    def wait(self):
+        """현재 간격만큼 대기 (kick 되면 즉시 깨어남)"""
+        self._wake.wait(self.interval)
+        self._wake.clear()
+
+    def stats_text(self):
+        """오버레이 표시용 문자열"""
+        return f"{self.hz:4.0f}Hz {self.cpu_ms:.2f}ms"
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+텍스트 블롭 검출 (연결 요소 라벨링)
+
+색상 마스크 전체를 한 번에 라벨링하여 블롭별 영역/중심/픽셀 수를 구한다.
+SciPy가 있으면 ndimage.label 을 쓰고, 없으면 순수 NumPy 런 기반 라벨링을 쓴다.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from utils.color_match import match_mask
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+
+# x1, y1 은 포함 좌표, (cx, cy) 는 픽셀 무게중심
+Blob = namedtuple('Blob', ['x0', 'y0', 'x1', 'y1', 'cx', 'cy', 'count'])
+
+
+def bridge_gaps(mask, gap):
+    """가로 방향으로 gap 픽셀 이하 간격을 이어붙인 마스크 (글자 사이 연결)"""
+    if gap <= 0:
+        return mask
+    bridged = mask.copy()
+    for s in range(1, gap + 1):
+        bridged[:, s:] |= mask[:, :-s]
+    return bridged
+
+
+def _union_find(n, a, b):
+    """런 쌍 (a, b) 를 합쳐 각 런의 루트(가장 작은 런 번호) 배열 반환"""
+    parent = np.arange(n + 1)
+    while True:
+        ra, rb = parent[a], parent[b]
+        diff = ra != rb
+        if not diff.any():
+            return parent
+        ra, rb = ra[diff], rb[diff]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        # 경로 압축
+        while True:
+            nxt = parent[parent]
+            if np.array_equal(nxt, parent):
+                break
+            parent = nxt
+
+
+def _label_runs(mask, connectivity=8):
+    """순수 NumPy 라벨링 - 행별 런을 만들고 위아래로 겹치는 런을 합친다"""
+    h, w = mask.shape
+    starts = mask.copy()
+    starts[:, 1:] &= ~mask[:, :-1]
+    run_id = np.cumsum(starts.ravel(), dtype=np.int32).reshape(h, w)
+    run_id[~mask] = 0
+    n_runs = int(run_id.max()) if run_id.size else 0
+    if n_runs == 0:
+        return np.zeros((h, w), dtype=np.int32), 0
+
+    upper, lower = run_id[:-1], run_id[1:]
+    pairs = [(upper, lower)]
+    if connectivity == 8:
+        pairs.append((upper[:, :-1], lower[:, 1:]))
+        pairs.append((upper[:, 1:], lower[:, :-1]))
+
+    a_list, b_list = [], []
+    for a, b in pairs:
+        sel = (a > 0) & (b > 0)
+        a_list.append(a[sel])
+        b_list.append(b[sel])
+    a = np.concatenate(a_list)
+    b = np.concatenate(b_list)
+
+    parent = _union_find(n_runs, a, b)
+    roots = np.unique(parent[1:])
+    compact = np.zeros(n_runs + 1, dtype=np.int32)
+    compact[roots] = np.arange(1, len(roots) + 1, dtype=np.int32)
+    return compact[parent][run_id], len(roots)
+
+
+def label_mask(mask, connectivity=8, gap=0):
+    """마스크 라벨링 → (labels, n). 라벨은 첫 픽셀의 래스터 순서대로 부여된다"""
+    bridged = bridge_gaps(mask, gap)
+    if ndimage is not None:
+        structure = np.ones((3, 3), dtype=bool) if connectivity == 8 else None
+        labels, n = ndimage.label(bridged, structure=structure)
+    else:
+        labels, n = _label_runs(bridged, connectivity)
+    if gap > 0:
+        labels = np.where(mask, labels, 0)
+    return labels, n
+
+
+def blob_stats(labels, n):
+    """라벨 이미지 → Blob 목록 (라벨 순서)"""
+    ys, xs = np.nonzero(labels)
+    if n == 0 or len(xs) == 0:
+        return []
+    lab = labels[ys, xs]
+    count = np.bincount(lab, minlength=n + 1)
+    sum_x = np.bincount(lab, weights=xs, minlength=n + 1)
+    sum_y = np.bincount(lab, weights=ys, minlength=n + 1)
+
+    big = np.iinfo(np.int64).max
+    x0 = np.full(n + 1, big, dtype=np.int64)
+    y0 = np.full(n + 1, big, dtype=np.int64)
+    x1 = np.full(n + 1, -1, dtype=np.int64)
+    y1 = np.full(n + 1, -1, dtype=np.int64)
+    np.minimum.at(x0, lab, xs)
+    np.minimum.at(y0, lab, ys)
+    np.maximum.at(x1, lab, xs)
+    np.maximum.at(y1, lab, ys)
+
+    blobs = []
+    for i in range(1, n + 1):
+        c = int(count[i])
+        blobs.append(Blob(int(x0[i]), int(y0[i]), int(x1[i]), int(y1[i]),
+                          float(sum_x[i] / max(c, 1)), float(sum_y[i] / max(c, 1)), c))
+    return blobs
+
+
+def find_blobs(mask, connectivity=8, gap=0, min_pixels=1):
+    """마스크의 모든 블롭 반환"""
+    labels, n = label_mask(mask, connectivity, gap)
+    return [b for b in blob_stats(labels, n) if b.count >= min_pixels]
+
+
+def blob_color_rank(masks, labels, n):
+    """블롭별 가장 앞선 색상 인덱스 (n + 1,) - 해당 색상이 없으면 K"""
+    rank = np.full(n + 1, masks.shape[0], dtype=np.int64)
+    for k in range(masks.shape[0] - 1, -1, -1):
+        rank[np.unique(labels[masks[k]])] = k
+    return rank
+
+
+def refine_blob(frame, blob, colors, tol, step):
+    """샘플 격자 블롭 → 원본 해상도 Blob (주변 한 칸 여유 포함)"""
+    height, width = frame.shape[:2]
+    xa, ya = max(0, (blob.x0 - 1) * step), max(0, (blob.y0 - 1) * step)
+    xb, yb = min(width, (blob.x1 + 2) * step), min(height, (blob.y1 + 2) * step)
+    fine = match_mask(frame[ya:yb, xa:xb], colors, tol, 1).any(axis=0)
+    fys, fxs = np.nonzero(fine)
+    return Blob(xa + int(fxs.min()), ya + int(fys.min()),
+                xa + int(fxs.max()), ya + int(fys.max()),
+                xa + float(fxs.mean()), ya + float(fys.mean()), len(fxs))
+
+
+def find_text_blobs(frame, colors, tol=0, step=1, gap=1, min_pixels=1, masks=None, refine=None):
+    """프레임에서 색상 텍스트 블롭 검색
+
+    step 간격 샘플 격자에서 라벨링한 뒤 각 블롭 영역만 원본 해상도로 다시 계산한다.
+    반환 순서는 기존 검색과 같이 (가장 앞선 색상 → 첫 픽셀 래스터 순서).
+    masks 에 미리 계산한 match_mask 결과를 넘기면 매칭을 건너뛴다.
+    refine(coarse_blob) 을 넘기면 원본 해상도 계산을 대신한다 (캐시용).
+    """
+    if masks is None:
+        masks = match_mask(frame, colors, tol, step)
+    if masks.shape[0] == 0:
+        return []
+    any_mask = masks.any(axis=0)
+    labels, n = label_mask(any_mask, 8, gap)
+    if n == 0:
+        return []
+
+    rank = blob_color_rank(masks, labels, n)
+    coarse = blob_stats(labels, n)
+    if step > 1:
+        if refine is None:
+            blobs = [refine_blob(frame, b, colors, tol, step) for b in coarse]
+        else:
+            blobs = [refine(b) for b in coarse]
+    else:
+        blobs = coarse
+
+    order = sorted(range(n), key=lambda i: (rank[i + 1], i))
+    return [blobs[i] for i in order if blobs[i].count >= min_pixels]
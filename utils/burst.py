@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+입력 버스트 실행기
+
+슬롯별 이벤트 묶음을 순서대로 한 스레드에서 일정 간격으로 재생한다.
+간격은 절대 마감 시각 기준으로 맞추며 (precise_timer.sleep_until: 고해상도 대기 + 마지막 구간 스핀),
+달성한 초당 이벤트 수와 건너뛴 슬롯을 보고한다.
+"""
+
+import time
+from collections import namedtuple
+
+from utils.precise_timer import sleep_until
+
+# sent / skipped: 전송한 / 중지로 건너뛴 슬롯 번호 목록
+# late: 마감보다 max_lag 이상 늦게 보낸 슬롯 수, max_lag: 최대 지연(초)
+BurstResult = namedtuple('BurstResult', ['sent', 'skipped', 'late', 'max_lag', 'duration', 'events', 'events_per_sec'])
+
+
+class BurstExecutor:
+    """이벤트 묶음 목록을 일정 간격으로 재생 (sleep=None 이면 precise_timer 의 고해상도 대기)"""
+
+    def __init__(self, backend, spacing=0.004, late_threshold=0.002,
+                 clock=time.perf_counter, sleep=None):
+        self.backend = backend
+        self.spacing = spacing
+        self.late_threshold = late_threshold
+        self.clock = clock
+        self.sleep = sleep
+
+    def run(self, groups, should_continue=None):
+        """groups: 슬롯별 이벤트 목록, should_continue(): False 면 남은 슬롯 건너뜀"""
+        sent, skipped = [], []
+        late = 0
+        max_lag = 0.0
+        events = 0
+        start = self.clock()
+
+        if self.spacing <= 0:
+            # 간격 없음: 전체를 한 번에
+            if should_continue is None or should_continue():
+                self.backend.send([e for group in groups for e in group])
+                sent = list(range(len(groups)))
+                events = sum(len(group) for group in groups)
+            else:
+                skipped = list(range(len(groups)))
+        else:
+            for i, group in enumerate(groups):
+                if should_continue is not None and not should_continue():
+                    skipped.extend(range(i, len(groups)))
+                    break
+                deadline = start + i * self.spacing
+                sleep_until(deadline, self.clock, self.sleep)
+                lag = self.clock() - deadline
+                max_lag = max(max_lag, lag)
+                if lag > self.late_threshold:
+                    late += 1
+                self.backend.send(group)
+                sent.append(i)
+                events += len(group)
+
+        duration = self.clock() - start
+        rate = events / duration if duration > 0 else float('inf')
+        return BurstResult(sent, skipped, late, max_lag, duration, events, rate)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+색상 매칭 엔진 (NumPy 벡터화)
+
+mss BGRA 버퍼 전체를 한 번에 비교하여 모든 색상의 일치 마스크를 만든다.
+벤치마크: python -m utils.color_match
+"""
+
+import numpy as np
+
+
+def hex_to_rgb(hex_color):
+    """'#RRGGBB' → (r, g, b)"""
+    hex_color = hex_color.lstrip('#')
+    return int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+
+
+def colors_to_bgr(colors):
+    """색상 목록 ([[hex, hex], ...] 또는 [hex, ...]) → (K, 3) BGR int16 배열"""
+    targets = []
+    for color in colors:
+        hex_color = color[0] if isinstance(color, (list, tuple)) else color
+        r, g, b = hex_to_rgb(hex_color)
+        targets.append((b, g, r))
+    return np.array(targets, dtype=np.int16).reshape(-1, 3)
+
+
+def bgra_view(screenshot):
+    """mss 스크린샷 → (H, W, 4) BGRA 배열 (복사 없음)"""
+    return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+        screenshot.height, screenshot.width, 4)
+
+
+def match_mask(frame, colors, tol=0, step=1, band=256):
+    """색상별 일치 마스크 (K, H', W') 반환
+
+    frame은 (H, W, 3|4) BGR(A) 배열, step 간격으로 샘플링한다.
+    메모리 사용량을 제한하기 위해 band 행 단위로 나누어 비교한다.
+    """
+    targets = colors_to_bgr(colors)
+    sub = frame[::step, ::step, :3]
+    h, w = sub.shape[:2]
+    mask = np.empty((len(targets), h, w), dtype=bool)
+    if len(targets) == 0:
+        return mask
+
+    # 채널별 2차원 비교 (마지막 축 reduce 보다 빠름)
+    channels = [sub[:, :, c] for c in range(3)]
+    for k, (tb, tg, tr) in enumerate(targets.tolist()):
+        for r0 in range(0, h, band):
+            r1 = r0 + band
+            out = mask[k, r0:r1]
+            if tol <= 0:
+                np.equal(channels[0][r0:r1], tb, out=out)
+                out &= channels[1][r0:r1] == tg
+                out &= channels[2][r0:r1] == tr
+            else:
+                out[...] = np.abs(channels[0][r0:r1].astype(np.int16) - tb) <= tol
+                out &= np.abs(channels[1][r0:r1].astype(np.int16) - tg) <= tol
+                out &= np.abs(channels[2][r0:r1].astype(np.int16) - tr) <= tol
+    return mask
+
+
+def find_color_hits(frame, colors, tol=0, step=1):
+    """일치 픽셀 후보 반환 - (color_idx, xs, ys) 배열
+
+    기존 루프와 같은 순서 (색상 → y → x) 로 정렬되며 좌표는 원본 프레임 기준.
+    """
+    mask = match_mask(frame, colors, tol, step)
+    color_idx, ys, xs = np.nonzero(mask)
+    return color_idx, xs * step, ys * step
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _legacy_scan(img, colors, tol, step):
+    """기존 search_and_click 의 PIL 이중 루프 (비교용)"""
+    pixels = img.load()
+    width, height = img.size
+    hits = []
+    for k, (hex_color, _) in enumerate(colors):
+        target_r, target_g, target_b = hex_to_rgb(hex_color)
+        for y in range(0, height, step):
+            for x in range(0, width, step):
+                r, g, b = pixels[x, y][:3]
+                if (abs(r - target_r) <= tol and
+                    abs(g - target_g) <= tol and
+                    abs(b - target_b) <= tol):
+                    hits.append((k, x, y))
+    return hits
+
+
+def _synthetic_frame(width, height, colors, seed=0):
+    """노이즈 배경 + 텍스트 색상 블록이 있는 BGRA 프레임"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 120, size=(height, width, 4), dtype=np.uint8)
+    targets = colors_to_bgr(colors).astype(np.uint8)
+    for i in range(40):
+        x = int(rng.integers(0, width - 80))
+        y = int(rng.integers(0, height - 12))
+        frame[y:y + 12, x:x + 80, :3] = targets[i % len(targets)]
+    return frame
+
+
+def _benchmark():
+    import time
+    from PIL import Image
+    from constants import DEFAULT_COLORS
+
+    colors = DEFAULT_COLORS
+    step, tol = 5, 0
+    for name, (w, h) in (("1080p", (1920, 1080)), ("1440p", (2560, 1440))):
+        frame = _synthetic_frame(w, h, colors)
+        img = Image.frombytes("RGB", (w, h), frame.tobytes(), "raw", "BGRX")
+
+        t0 = time.perf_counter()
+        legacy = _legacy_scan(img, colors, tol, step)
+        legacy_t = time.perf_counter() - t0
+
+        runs = 20
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            k, xs, ys = find_color_hits(frame, colors, tol, step)
+        vec_t = (time.perf_counter() - t0) / runs
+
+        same = legacy == list(zip(k.tolist(), xs.tolist(), ys.tolist()))
+        print(f"{name}: legacy {1 / legacy_t:7.2f} fps | numpy {1 / vec_t:8.1f} fps "
+              f"| x{legacy_t / vec_t:.0f} | hits {len(legacy)} | same order: {same}")
+
+
+if __name__ == "__main__":
+    _benchmark()
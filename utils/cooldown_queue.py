@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+스킬 쿨다운 스케줄러 (우선순위 큐)
+
+슬롯 설정을 Tk 변수에서 한 번 읽어 SkillSpec 튜플로 고정하고,
+다음 사용 시각을 힙에 넣어 가장 빠른 스킬의 마감까지만 잔다.
+10ms 마다 9개 슬롯을 훑는 폴링 대신 사용 시점에만 깨어난다.
+SkillTimeline 은 여러 프리셋을 한 스레드의 한 시간축으로 합치고 키 출력 간격을 보장한다.
+벤치마크: python -m utils.cooldown_queue
+"""
+
+import heapq
+import threading
+import time
+from collections import namedtuple
+
+from utils.precise_timer import SPIN_THRESHOLD, sleep_until
+
+# index: 슬롯 번호, key: 누를 키, cooldown: 초, hold: 꾹 누르기 (한 번 누르고 유지)
+SkillSpec = namedtuple('SkillSpec', ['index', 'key', 'cooldown', 'hold'])
+
+# 대기 상한 (상태 플래그 확인용 - 정상 경로는 wake 이벤트)
+MAX_WAIT = 0.1
+# 마감 이만큼 전부터는 이벤트 대신 정밀 대기 (Windows 기본 타이머 틱 15.6ms)
+COARSE_MARGIN = 0.016
+
+
+class CooldownScheduler:
+    """SkillSpec 목록의 다음 사용 시각 힙
+
+    처음에는 모든 스킬이 즉시 사용 가능하다 (기존 루프와 동일).
+    일반 스킬은 실제 사용 시각 + 쿨다운에 다시 들어가고, hold 스킬은 한 번 누른 뒤 빠진다.
+    spin: 마감 직전 스핀 시간 (0 이면 스핀 없이 타이머만 - CPU 최소, 정확도 타이머 해상도)
+    """
+
+    def __init__(self, specs, clock=time.perf_counter, spin=SPIN_THRESHOLD):
+        self.clock = clock
+        self.spin = spin
+        self.fired = 0
+        self.last_fired = {}  # 슬롯 번호 → 마지막 사용 시각
+        self.replace_specs(specs)
+
+    def replace_specs(self, specs):
+        """설정 변경 - 새 목록으로 힙 재구성 (마지막 사용 시각은 유지)"""
+        now = self.clock()
+        self.specs = tuple(specs)
+        self._heap = []
+        for spec in self.specs:
+            last = self.last_fired.get(spec.index)
+            deadline = now if last is None else max(now, last + spec.cooldown)
+            self._heap.append((deadline, spec.index, spec))
+        heapq.heapify(self._heap)
+
+    def reset(self):
+        """모든 스킬을 지금 사용 가능으로"""
+        self.last_fired.clear()
+        self.replace_specs(self.specs)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def next_deadline(self):
+        """가장 빠른 사용 시각 (없으면 None)"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """now 까지 마감된 스킬 [(마감, spec), ...] 을 꺼냄 - 다시 넣는 것은 호출자 몫"""
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, spec = heapq.heappop(self._heap)
+            due.append((deadline, spec))
+        return due
+
+    def pop(self):
+        """가장 이른 (마감, spec) 하나를 꺼냄"""
+        deadline, _, spec = heapq.heappop(self._heap)
+        return deadline, spec
+
+    def fired_at(self, spec, when):
+        """사용 완료 - 일반 스킬은 when + cooldown 에 다시 예약"""
+        self.fired += 1
+        self.last_fired[spec.index] = when
+        if not spec.hold:
+            heapq.heappush(self._heap, (when + spec.cooldown, spec.index, spec))
+
+    def defer(self, spec, delay, now=None):
+        """이번에는 건너뜀 - delay 초 뒤 다시 시도 (혼령사 모드 Space 누름 중 등)"""
+        now = self.clock() if now is None else now
+        heapq.heappush(self._heap, (now + delay, spec.index, spec))
+
+    def wait(self, wake=None, max_wait=MAX_WAIT):
+        """다음 마감까지 대기 - wake 이벤트가 set 되면 즉시 반환 (반환값: 깨워졌는지)"""
+        return wait_for_deadline(self.next_deadline(), wake, self.clock, self.spin, max_wait)
+
+
+def wait_for_deadline(deadline, wake=None, clock=time.perf_counter, spin=SPIN_THRESHOLD, max_wait=MAX_WAIT):
+    """deadline (None 이면 max_wait) 까지 대기 - wake 가 set 되면 즉시 True 반환
+
+    Event.wait 는 OS 타이머 틱 단위라 마감 COARSE_MARGIN 전까지만 이벤트로 기다리고,
+    나머지는 고해상도 타이머 + 스핀 (sleep_until) 으로 맞춘다.
+    """
+    limit = clock() + max_wait
+    precise = deadline is not None and deadline <= limit
+    target = deadline if precise else limit
+
+    coarse = target - clock() - (COARSE_MARGIN if precise else 0.0)
+    if coarse > 0:
+        if wake is not None:
+            if wake.wait(coarse):
+                wake.clear()
+                return True
+        else:
+            time.sleep(coarse)
+    if precise:
+        sleep_until(target, clock, spin=spin)
+    return False
+
+
+class SkillTimeline:
+    """여러 프리셋의 CooldownScheduler 를 한 시간축으로 합친 것
+
+    그룹(프리셋) 마다 스케줄러를 두고, 가장 이른 마감부터 하나씩 꺼낸다.
+    키 출력 사이에는 key_gap 초 이상 간격을 둔다 (동시에 마감된 스킬도 순서대로).
+    그룹 추가/교체/제거는 실행 중에도 가능하다 (같은 스레드에서 호출).
+    """
+
+    def __init__(self, key_gap=0.0, clock=time.perf_counter, spin=0.0):
+        self.key_gap = key_gap
+        self.clock = clock
+        self.spin = spin
+        self.groups = {}   # 그룹 → CooldownScheduler
+        self.last_output = None
+
+    def set_group(self, group, specs):
+        """그룹 추가 또는 설정 교체 (기존 그룹이면 마지막 사용 시각 유지)"""
+        scheduler = self.groups.get(group)
+        if scheduler is None:
+            self.groups[group] = CooldownScheduler(specs, self.clock, self.spin)
+        else:
+            scheduler.replace_specs(specs)
+
+    def remove_group(self, group):
+        self.groups.pop(group, None)
+
+    def _earliest(self):
+        """(마감, 그룹) - 없으면 (None, None)"""
+        best, best_group = None, None
+        for group, scheduler in self.groups.items():
+            deadline = scheduler.next_deadline()
+            if deadline is not None and (best is None or deadline < best):
+                best, best_group = deadline, group
+        return best, best_group
+
+    def next_deadline(self):
+        """다음 키 출력 가능 시각 - 스킬 마감과 키 간격 중 늦은 쪽"""
+        deadline, _ = self._earliest()
+        if deadline is not None and self.last_output is not None:
+            deadline = max(deadline, self.last_output + self.key_gap)
+        return deadline
+
+    def pop_next(self, now=None):
+        """지금 출력할 스킬 하나 (그룹, 마감, spec) - 없거나 키 간격 전이면 None"""
+        now = self.clock() if now is None else now
+        if self.last_output is not None and now < self.last_output + self.key_gap:
+            return None
+        deadline, group = self._earliest()
+        if deadline is None or deadline > now:
+            return None
+        _, spec = self.groups[group].pop()
+        return group, deadline, spec
+
+    def fired_at(self, group, spec, when, output=True):
+        """사용 완료 - output 이면 키 간격 기준 시각 갱신"""
+        scheduler = self.groups.get(group)
+        if scheduler is not None:
+            scheduler.fired_at(spec, when)
+        if output:
+            self.last_output = when
+
+    def defer(self, group, spec, delay, now=None):
+        scheduler = self.groups.get(group)
+        if scheduler is not None:
+            scheduler.defer(spec, delay, now)
+
+    def wait(self, wake=None, max_wait=MAX_WAIT):
+        return wait_for_deadline(self.next_deadline(), wake, self.clock, self.spin, max_wait)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(duration=3.0):
+    specs = [SkillSpec(i, str(i + 1), cd, False)
+             for i, cd in enumerate((0.25, 0.4, 0.55, 0.7, 1.0, 1.3, 2.0, 0.33, 0.9))]
+
+    def run_polling():
+        # 기존 방식: 10ms 마다 모든 슬롯 확인
+        last_used = [0.0] * len(specs)
+        errors, wakeups = [], 0
+        start = time.perf_counter()
+        due = [start] * len(specs)
+        while time.perf_counter() - start < duration:
+            wakeups += 1
+            now = time.perf_counter()
+            for spec in specs:
+                if now - last_used[spec.index] >= spec.cooldown:
+                    errors.append(now - due[spec.index])
+                    last_used[spec.index] = now
+                    due[spec.index] = now + spec.cooldown
+            time.sleep(0.01)
+        return errors, wakeups
+
+    def run_queue(spin):
+        sched = CooldownScheduler(specs, spin=spin)
+        wake = threading.Event()
+        errors, wakeups = [], 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            sched.wait(wake)
+            wakeups += 1
+            now = time.perf_counter()
+            for deadline, spec in sched.pop_due(now):
+                errors.append(now - deadline)
+                sched.fired_at(spec, now)
+        return errors, wakeups
+
+    def run_timeline(spin, gap=0.02):
+        # 프리셋 2개가 같은 슬롯 구성 - 마감이 겹쳐도 키 출력은 gap 이상 벌어져야 함
+        timeline = SkillTimeline(gap, spin=spin)
+        for group in range(2):
+            timeline.set_group(group, specs)
+        wake = threading.Event()
+        errors, wakeups, outputs = [], 0, []
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            timeline.wait(wake)
+            wakeups += 1
+            now = time.perf_counter()
+            item = timeline.pop_next(now)
+            while item is not None:
+                group, deadline, spec = item
+                errors.append(now - deadline)
+                outputs.append(now)
+                timeline.fired_at(group, spec, now)
+                item = timeline.pop_next(now)
+        gaps = [b - a for a, b in zip(outputs, outputs[1:])]
+        print(f"  프리셋 2개 타임라인: 최소 키 간격 {min(gaps) * 1000:.2f} ms (설정 {gap * 1000:.0f} ms)")
+        return errors, wakeups
+
+    runners = (("10ms 폴링", run_polling),
+               ("힙 (스핀)", lambda: run_queue(SPIN_THRESHOLD)),
+               ("힙 (스핀 없음)", lambda: run_queue(0.0)),
+               ("타임라인 x2", lambda: run_timeline(0.0)))
+    for name, runner in runners:
+        cpu0 = time.process_time()
+        errors, wakeups = runner()
+        cpu = time.process_time() - cpu0
+        errors.sort()
+        p50 = errors[len(errors) // 2] * 1000
+        p99 = errors[min(len(errors) - 1, int(len(errors) * 0.99))] * 1000
+        print(f"{name:10s}: 사용 {len(errors):3d}회 | 깨어남 {wakeups:4d}회 | "
+              f"사용 지연 p50 {p50:6.3f} ms / p99 {p99:6.3f} ms | CPU {cpu * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
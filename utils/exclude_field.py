@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+제외 색상 거리 필드
+
+기존 has_exclude_color_nearby 와 같은 픽셀을 본다 - 후보 (cx, cy) 마다
+cx+dx, cy+dy (dx, dy 는 range(-r, r+1, 3), 화면 밖은 무시) 샘플 중 제외 색상이 있으면 막힘.
+후보가 드문드문하면 후보 샘플만 한 번에 모아 비교하고,
+촘촘하면 후보 경계 (r 만큼 넓힘) 에서만 제외 색상 마스크를 만들어 같은 간격으로 시프트 OR 한 필드를 조회한다.
+벤치마크: python -m utils.exclude_field
+"""
+
+import numpy as np
+
+from utils.color_match import colors_to_bgr, match_mask
+
+# 기존 has_exclude_color_nearby 의 3픽셀 샘플 간격과 동일
+EXCLUDE_STEP = 3
+
+
+def sample_offsets(radius, step=EXCLUDE_STEP):
+    """후보 기준 샘플 오프셋 - range(-r, r+1, step)"""
+    radius = max(0, radius)
+    return np.arange(-radius, radius + 1, max(1, step))
+
+
+def shift_or(mask, offsets):
+    """field[y, x] = OR(mask[y+dy, x+dx]) (dx, dy 는 offsets, 범위 밖 샘플은 무시) - 가로/세로 분리"""
+    h, w = mask.shape
+    rows = np.zeros_like(mask)
+    for d in offsets.tolist():
+        if d >= 0:
+            rows[:h - d] |= mask[d:]
+        else:
+            rows[-d:] |= mask[:h + d]
+    out = np.zeros_like(mask)
+    for d in offsets.tolist():
+        if d >= 0:
+            out[:, :w - d] |= rows[:, d:]
+        else:
+            out[:, -d:] |= rows[:, :w + d]
+    return out
+
+
+class ExclusionField:
+    """제외 색상 주변 검사 (프레임 1장 기준)
+
+    points: 검사할 후보 좌표 [(x, y), ...] (프레임 좌표) - 주면 그 주변만 계산한다.
+      후보 샘플 수 합이 후보 경계 면적보다 작으면 후보 샘플만 한 번에 모아 비교하고,
+      아니면 후보 경계 (radius 만큼 넓힘) 에서만 필드를 만든다.
+    없으면 프레임 전체 필드.
+    """
+
+    def __init__(self, frame, exclude_colors, tol, radius, step=EXCLUDE_STEP, points=None):
+        self.frame = frame
+        self.tol = tol
+        self.radius = max(0, radius)
+        self.offsets = sample_offsets(radius, step)
+        self.targets = colors_to_bgr(exclude_colors)
+        self.height, self.width = frame.shape[:2]
+        self.field = None
+        self.x0 = self.y0 = 0
+        self._probed = {}  # 후보 샘플을 직접 비교한 결과 {(x, y): bool}
+
+        x0, y0, x1, y1 = 0, 0, self.width, self.height
+        if points is not None:
+            if not len(points):
+                return
+            xs = np.array([p[0] for p in points])
+            ys = np.array([p[1] for p in points])
+            x0, y0 = max(0, int(xs.min()) - self.radius), max(0, int(ys.min()) - self.radius)
+            x1 = min(self.width, int(xs.max()) + self.radius + 1)
+            y1 = min(self.height, int(ys.max()) + self.radius + 1)
+            if len(points) * len(self.offsets) ** 2 < (x1 - x0) * (y1 - y0):
+                hits = self._probe_many(xs, ys)
+                self._probed = dict(zip(zip(xs.tolist(), ys.tolist()), hits.tolist()))
+                return
+        if x0 >= x1 or y0 >= y1:
+            return
+        mask = match_mask(frame[y0:y1, x0:x1], exclude_colors, tol).any(axis=0)
+        self.field = shift_or(mask, self.offsets)
+        self.x0, self.y0 = x0, y0
+
+    def _probe_many(self, xs, ys):
+        """후보마다 (cx+dx, cy+dy) 샘플을 한 번에 모아 비교 → bool 배열"""
+        if len(self.targets) == 0:
+            return np.zeros(len(xs), dtype=bool)
+        sy = ys[:, None] + self.offsets  # (N, k)
+        sx = xs[:, None] + self.offsets
+        valid = (((sy >= 0) & (sy < self.height))[:, :, None]
+                 & ((sx >= 0) & (sx < self.width))[:, None, :])  # (N, k, k)
+        pixels = self.frame[np.clip(sy, 0, self.height - 1)[:, :, None],
+                            np.clip(sx, 0, self.width - 1)[:, None, :], :3].astype(np.int16)
+        hits = np.zeros(pixels.shape[:3], dtype=bool)
+        for target in self.targets.tolist():
+            hits |= (np.abs(pixels - target) <= self.tol).all(axis=3)
+        return (hits & valid).any(axis=(1, 2))
+
+    def blocked(self, x, y):
+        """(x, y) 주변에 제외 색상이 있으면 True"""
+        probed = self._probed.get((x, y))
+        if probed is not None:
+            return probed
+        if self.field is not None:
+            fx, fy = x - self.x0, y - self.y0
+            h, w = self.field.shape
+            if 0 <= fx < w and 0 <= fy < h:
+                return bool(self.field[fy, fx])
+        # 후보로 받지 않은 좌표
+        return bool(self._probe_many(np.array([x]), np.array([y]))[0])
+
+    def blocked_many(self, xs, ys):
+        """좌표 배열 일괄 검사 → bool 배열"""
+        return np.array([self.blocked(x, y) for x, y in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist())],
+                        dtype=bool)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _legacy_nearby(pixels, exclude_colors, cx, cy, width, height, check_range, tol):
+    """기존 has_exclude_color_nearby (비교용)"""
+    for ex_hex, _ in exclude_colors:
+        ex_r = int(ex_hex[1:3], 16)
+        ex_g = int(ex_hex[3:5], 16)
+        ex_b = int(ex_hex[5:7], 16)
+        for dy in range(-check_range, check_range + 1, 3):
+            for dx in range(-check_range, check_range + 1, 3):
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    r, g, b = pixels[nx, ny][:3]
+                    if (abs(r - ex_r) <= tol and
+                        abs(g - ex_g) <= tol and
+                        abs(b - ex_b) <= tol):
+                        return True
+    return False
+
+
+def _benchmark():
+    import time
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    w, h = 2131, 1161
+    radius, tol = 6, 0
+    frame = rng.integers(0, 255, size=(h, w, 4), dtype=np.uint8)
+
+    # 재현 예: 후보 바로 위의 제외 색상 한 점
+    small = np.zeros((60, 60, 4), dtype=np.uint8)
+    small[20, 10, :3] = (0xD5, 0xEA, 0x37)  # #37EAD5 (BGR)
+    repro = ExclusionField(small, [['#37EAD5', '']], 0, radius, points=[(10, 20)]).blocked(10, 20)
+    print(f"후보 위 제외 색상 (10, 20), r={radius}: 막힘 {repro}")
+
+    def best_ms(run, repeat=5):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = run()
+            times.append((time.perf_counter() - t0) * 1000)
+        return min(times), result
+
+    print("colors candidates | legacy ms | full field ms | candidate ms | 기존과 일치")
+    for n_colors in (1, 4, 16):
+        colors = [['#%06X' % int(c), ''] for c in rng.integers(0, 0xFFFFFF, n_colors)]
+        # 제외 색상 점을 흩뿌려 막힘/통과가 섞이게
+        test = frame.copy()
+        spots = rng.integers(0, w * h, 20000)
+        test.reshape(-1, 4)[spots, :3] = colors_to_bgr(colors)[rng.integers(0, n_colors, len(spots))]
+        img = Image.frombytes("RGB", (w, h), test.tobytes(), "raw", "BGRX")
+        pixels = img.load()
+        for n_cand in (10, 100, 1000):
+            xs = rng.integers(0, w, n_cand)
+            ys = rng.integers(0, h, n_cand)
+            points = list(zip(xs.tolist(), ys.tolist()))
+
+            legacy_ms, legacy = best_ms(lambda: [_legacy_nearby(pixels, colors, x, y, w, h, radius, tol)
+                                                 for x, y in points])
+            field_ms, full = best_ms(lambda: ExclusionField(test, colors, tol, radius).blocked_many(xs, ys))
+
+            def candidates():
+                near = ExclusionField(test, colors, tol, radius, points=points)
+                return [near.blocked(x, y) for x, y in points]
+
+            near_ms, found = best_ms(candidates)
+            same = found == legacy and full.tolist() == legacy
+            print(f"{n_colors:6d} {n_cand:10d} | {legacy_ms:9.2f} | {field_ms:13.2f} | {near_ms:12.2f} | "
+                  f"{same} (막힘 {sum(legacy)})")
+
+
+if __name__ == "__main__":
+    _benchmark()
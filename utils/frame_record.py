@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+화면 캡처 녹화/재생
+
+RecordingBackend 로 실제 캡처를 감싸면 모든 grab 결과가 타임스탬프와 함께 저장된다.
+ReplayBackend 는 녹화된 캡처를 시간 순서대로 가상 화면에 붙여 넣고,
+같은 감지 코드가 그 화면을 캡처하도록 한다 (Linux 에서 재현 가능한 측정용).
+
+파일 형식: .npz (zlib 압축) 또는 .npz.zst (zstandard 설치 시)
+  meta   (N, 5) float64 - ts, left, top, width, height
+  f00000 ... (H, W, 4) uint8 BGRA
+  events JSON 문자열 - 정답 표시 [{"t": 초, "kind": "...", "x": .., "y": ..}, ...]
+"""
+
+import io
+import json
+import threading
+import time
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Recording:
+    """녹화된 캡처 목록 + 정답 이벤트"""
+
+    def __init__(self, captures=None, events=None):
+        self.captures = captures if captures is not None else []  # [(ts, left, top, frame), ...]
+        self.events = events if events is not None else []
+
+    def __len__(self):
+        return len(self.captures)
+
+    @property
+    def duration(self):
+        return self.captures[-1][0] if self.captures else 0.0
+
+    def add(self, ts, left, top, frame):
+        self.captures.append((ts, left, top, np.array(frame, dtype=np.uint8)))
+
+    def mark(self, ts, kind, x=None, y=None):
+        """정답 이벤트 추가 (예: 'belial_target', 'inventory_open')"""
+        self.events.append({"t": ts, "kind": kind, "x": x, "y": y})
+
+    def save(self, path):
+        arrays = {"meta": np.array([(ts, left, top, f.shape[1], f.shape[0])
+                                    for ts, left, top, f in self.captures],
+                                   dtype=np.float64).reshape(-1, 5),
+                  "events": np.array(json.dumps(self.events))}
+        for i, (_, _, _, frame) in enumerate(self.captures):
+            arrays[f"f{i:05d}"] = frame
+
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError("zstandard 모듈이 없습니다 (pip install zstandard)")
+            buf = io.BytesIO()
+            np.savez(buf, **arrays)
+            with open(path, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=3).compress(buf.getvalue()))
+        else:
+            np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError("zstandard 모듈이 없습니다 (pip install zstandard)")
+            with open(path, 'rb') as f:
+                data = np.load(io.BytesIO(zstandard.ZstdDecompressor().decompress(f.read())))
+        else:
+            data = np.load(path)
+
+        captures = []
+        for i, (ts, left, top, _, _) in enumerate(data["meta"]):
+            captures.append((float(ts), int(left), int(top), data[f"f{i:05d}"]))
+        events = json.loads(str(data["events"])) if "events" in data else []
+        return cls(captures, events)
+
+
+class RecordingBackend:
+    """캡처 백엔드 래퍼 - grab 결과를 Recording 에 저장"""
+
+    def __init__(self, inner, recording=None, max_captures=2000):
+        self.inner = inner
+        self.recording = recording if recording is not None else Recording()
+        self.max_captures = max_captures
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def bounds(self):
+        return self.inner.bounds()
+
+    def close(self):
+        close = getattr(self.inner, 'close', None)
+        if close is not None:
+            close()
+
+    def grab(self, left, top, width, height):
+        frame = self.inner.grab(left, top, width, height)
+        with self._lock:
+            if len(self.recording) < self.max_captures:
+                self.recording.add(time.perf_counter() - self._t0, left, top, frame)
+        return frame
+
+
+class ReplayBackend:
+    """녹화 재생 백엔드 - clock() 시점까지의 캡처를 가상 화면에 붙여 넣어 제공"""
+
+    def __init__(self, recording, clock):
+        self.recording = recording
+        self.clock = clock
+        caps = recording.captures
+        if caps:
+            self.left = min(left for _, left, _, _ in caps)
+            self.top = min(top for _, _, top, _ in caps)
+            right = max(left + f.shape[1] for _, left, _, f in caps)
+            bottom = max(top + f.shape[0] for _, _, top, f in caps)
+        else:
+            self.left = self.top = 0
+            right = bottom = 1
+        self.canvas = np.zeros((bottom - self.top, right - self.left, 4), dtype=np.uint8)
+        self.canvas[:, :, 3] = 255
+        self._next = 0
+
+    @property
+    def finished(self):
+        return self._next >= len(self.recording.captures)
+
+    def _advance(self):
+        now = self.clock()
+        caps = self.recording.captures
+        while self._next < len(caps) and caps[self._next][0] <= now:
+            _, left, top, frame = caps[self._next]
+            x0, y0 = left - self.left, top - self.top
+            self.canvas[y0:y0 + frame.shape[0], x0:x0 + frame.shape[1]] = frame
+            self._next += 1
+
+    def bounds(self):
+        return self.left, self.top, self.canvas.shape[1], self.canvas.shape[0]
+
+    def grab(self, left, top, width, height):
+        self._advance()
+        x0, y0 = left - self.left, top - self.top
+        h, w = self.canvas.shape[:2]
+        out = np.zeros((height, width, 4), dtype=np.uint8)
+        sx0, sy0 = max(0, x0), max(0, y0)
+        sx1, sy1 = min(w, x0 + width), min(h, y0 + height)
+        if sx0 < sx1 and sy0 < sy1:
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = self.canvas[sy0:sy1, sx0:sx1]
+        return out
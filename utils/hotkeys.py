@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+통합 핫키 디스패처
+
+keyboard 훅을 하나만 걸고, 눌린 키의 스캔 코드 (마우스는 'mouse4' 같은 이름) 와
+조합키로 미리 만든 dict 를 찾아 등록된 핸들러를 부른다.
+바인딩 하나가 바뀌면 그 키의 항목만 바꾼 새 테이블로 교체하므로
+unhook_all 후 재등록하는 동안 핫키가 먹지 않는 구간이 없다.
+벤치마크: python -m utils.hotkeys
+"""
+
+import threading
+from collections import namedtuple
+
+# 조합키 이름 (UI 표기) → keyboard 키 이름
+MODIFIER_KEYS = {"Ctrl": 'ctrl', "Alt": 'alt', "Shift": 'shift'}
+NO_MODIFIER = "없음"
+
+MOUSE_KEYS = {'mouse4': 'mouse4', 'xbutton1': 'mouse4', 'mouse5': 'mouse5', 'xbutton2': 'mouse5'}
+
+Binding = namedtuple('Binding', ['name', 'key', 'modifier', 'handler'])
+
+
+def is_mouse_key(key):
+    return key.lower() in MOUSE_KEYS
+
+
+class HotkeyDispatcher:
+    """(키, 조합키) → 핸들러 테이블 + 훅 하나
+
+    bind(name, key, modifier, handler) 는 같은 이름의 이전 바인딩을 대체한다.
+    listen(callback, transient) 는 모든 키 누름을 받는 리스너 (키 입력 다이얼로그 등) -
+    transient 리스너는 clear_transient() 로 한 번에 제거된다.
+    """
+
+    def __init__(self, keyboard_module=None):
+        self._keyboard = keyboard_module
+        self._lock = threading.Lock()
+        self._bindings = {}   # 이름 → Binding
+        self._codes = {}      # 이름 → 조회 코드 튜플 (스캔 코드 또는 마우스 이름)
+        # (테이블, 조합키 바인딩이 있는 코드 집합) - 읽기 전용, 튜플째로 교체
+        # 테이블: (코드, 조합키) → (Binding, ...)
+        self._state = ({}, frozenset())
+        self._listeners = ()  # ((callback, transient), ...)
+        self._hook = None
+        self.dispatched = 0
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            import keyboard
+            self._keyboard = keyboard
+        return self._keyboard
+
+    # =========================================
+    # 설치
+    # =========================================
+    def install(self):
+        """키보드 훅 설치 (한 번만)"""
+        with self._lock:
+            if self._hook is None:
+                self._hook = self.keyboard.hook(self._on_event)
+
+    def uninstall(self):
+        with self._lock:
+            if self._hook is not None:
+                try:
+                    self.keyboard.unhook(self._hook)
+                except Exception:
+                    pass
+                self._hook = None
+
+    # =========================================
+    # 바인딩
+    # =========================================
+    def _key_codes(self, key):
+        key = key.lower()
+        if key in MOUSE_KEYS:
+            return (MOUSE_KEYS[key],)
+        return tuple(self.keyboard.key_to_scan_codes(key))
+
+    def bind(self, name, key, modifier, handler):
+        """바인딩 추가/교체 - 바뀐 항목만 새 테이블에 반영. 키를 모르면 False"""
+        modifier = modifier or NO_MODIFIER
+        with self._lock:
+            old = self._bindings.get(name)
+            if old is not None and old.key == key and old.modifier == modifier and old.handler == handler:
+                return True
+            try:
+                codes = self._key_codes(key) if key else ()
+            except Exception as e:
+                print(f"[Hotkey] 알 수 없는 키 '{key}' ({name}): {e}")
+                codes = ()
+            table = dict(self._state[0])
+            if old is not None:
+                self._remove_entries(table, old, self._codes.get(name, ()))
+            binding = Binding(name, key, modifier, handler)
+            for code in codes:
+                entry = (code, modifier)
+                table[entry] = table.get(entry, ()) + (binding,)
+            self._bindings[name] = binding
+            self._codes[name] = codes
+            self._publish(table)
+            return bool(codes)
+
+    def unbind(self, name):
+        with self._lock:
+            old = self._bindings.pop(name, None)
+            if old is None:
+                return
+            table = dict(self._state[0])
+            self._remove_entries(table, old, self._codes.pop(name, ()))
+            self._publish(table)
+
+    def _publish(self, table):
+        modified = frozenset(code for code, modifier in table if modifier != NO_MODIFIER)
+        self._state = (table, modified)
+
+    @staticmethod
+    def _remove_entries(table, binding, codes):
+        for code in codes:
+            entry = (code, binding.modifier)
+            remaining = tuple(b for b in table.get(entry, ()) if b.name != binding.name)
+            if remaining:
+                table[entry] = remaining
+            else:
+                table.pop(entry, None)
+
+    def bindings(self):
+        return dict(self._bindings)
+
+    # =========================================
+    # 리스너
+    # =========================================
+    def listen(self, callback, transient=False):
+        """모든 키 누름 리스너 추가 - 제거용 callback 을 그대로 반환"""
+        with self._lock:
+            self._listeners = self._listeners + ((callback, transient),)
+        return callback
+
+    def unlisten(self, callback):
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if l[0] is not callback)
+
+    def clear_transient(self):
+        """transient 리스너 모두 제거 (키 입력 다이얼로그 종료 시)"""
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if not l[1])
+
+    # =========================================
+    # 디스패치
+    # =========================================
+    def _pressed_modifiers(self):
+        pressed = [NO_MODIFIER]
+        for name, key in MODIFIER_KEYS.items():
+            try:
+                if self.keyboard.is_pressed(key):
+                    pressed.append(name)
+            except Exception:
+                pass
+        return pressed
+
+    def _on_event(self, event):
+        if event.event_type != 'down':
+            return
+        for callback, _ in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[Hotkey] 리스너 오류: {e}")
+        self.dispatch(event.scan_code, event)
+
+    def dispatch(self, code, event=None):
+        """코드 (스캔 코드 또는 'mouse4'/'mouse5') 에 묶인 핸들러 실행 - 실행한 수 반환"""
+        table, modified = self._state
+        # 조합키 없는 바인딩이 대부분이므로 조합키 상태는 필요할 때만 확인
+        modifiers = self._pressed_modifiers() if code in modified else (NO_MODIFIER,)
+        count = 0
+        for modifier in modifiers:
+            for binding in table.get((code, modifier), ()):
+                try:
+                    binding.handler(event)
+                except Exception as e:
+                    print(f"[Hotkey] {binding.name} 핸들러 오류: {e}")
+                count += 1
+        self.dispatched += count
+        return count
+
+    def dispatch_mouse(self, button, event=None):
+        """마우스 버튼 ('mouse4' / 'mouse5') 누름 디스패치"""
+        return self.dispatch(MOUSE_KEYS.get(button.lower(), button.lower()), event)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(n=100000):
+    import time
+    import types
+
+    # 스캔 코드는 키 이름 순서대로 가짜로 배정
+    names = [f"f{i}" for i in range(1, 13)] + list("abcdefghijklmnopqrstuvwxyz")
+    fake = types.SimpleNamespace(key_to_scan_codes=lambda key: (names.index(key) + 1,),
+                                 is_pressed=lambda key: False,
+                                 hook=lambda cb: cb, unhook=lambda h: None)
+    dispatcher = HotkeyDispatcher(fake)
+    hits = [0]
+    keys = [f"f{i}" for i in range(1, 13)]
+    for i, key in enumerate(keys):
+        dispatcher.bind(f"feature{i}", key, NO_MODIFIER, lambda e: hits.__setitem__(0, hits[0] + 1))
+
+    # 기존 방식: 마우스 버튼마다 모든 기능의 트리거 키 문자열 비교
+    triggers = [(key, lambda e: hits.__setitem__(0, hits[0] + 1)) for key in keys]
+
+    def linear(button):
+        for key, handler in triggers:
+            if key.lower() == button:
+                handler(None)
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        linear(keys[i % 12])
+    linear_us = (time.perf_counter() - t0) / n * 1e6
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        dispatcher.dispatch(i % 12 + 1)
+    table_us = (time.perf_counter() - t0) / n * 1e6
+
+    t0 = time.perf_counter()
+    for i in range(1000):
+        dispatcher.bind("feature0", keys[i % 12], NO_MODIFIER, triggers[0][1])
+    rebind_us = (time.perf_counter() - t0) / 1000 * 1e6
+
+    print(f"바인딩 {len(keys)}개: 선형 비교 {linear_us:.2f} us | 테이블 조회 {table_us:.2f} us | "
+          f"바인딩 1개 교체 {rebind_us:.1f} us (전체 재등록 없음)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+입력 백엔드 (SendInput 묶음 전송)
+
+슬롯 동작(이동 → 조합키 누름 → 클릭 → 조합키 뗌)을 이벤트 목록으로 만들고
+Win32 SendInput 한 번으로 보낸다. 인벤토리 한 바퀴 전체도 한 번에 보낼 수 있다.
+Linux 등에서는 RecordingInput 이 이벤트를 기록하여 개수/시간을 측정한다.
+벤치마크: python -m utils.input_backend
+
+이벤트 형식
+  ('move', x, y)           커서 절대 이동 (화면 좌표)
+  ('button', name, down)   name = 'left' | 'right'
+  ('key', vk, down)        가상 키 코드
+"""
+
+import ctypes
+import sys
+import threading
+import time
+
+VK_CONTROL = 0x11
+# 이 앱이 보낸 입력 표시 (dwExtraInfo) - 마우스 훅이 자기 입력만 골라 버린다
+INJECTED_TAG = 0x4D435243
+
+
+# =========================================
+# 동작 → 이벤트 목록
+# =========================================
+def move(x, y):
+    return [('move', int(x), int(y))]
+
+
+def click(button='left'):
+    return [('button', button, True), ('button', button, False)]
+
+
+def key_tap(vk):
+    return [('key', vk, True), ('key', vk, False)]
+
+
+def modified_click(vk, button='left'):
+    """조합키 누른 채 클릭 (이동 없음)"""
+    return [('key', vk, True)] + click(button) + [('key', vk, False)]
+
+
+def slot_ctrl_click(x, y):
+    """슬롯 Ctrl+좌클릭 (버리기)"""
+    return move(x, y) + modified_click(VK_CONTROL, 'left')
+
+
+def slot_right_click(x, y):
+    """슬롯 우클릭 (팔기)"""
+    return move(x, y) + click('right')
+
+
+# =========================================
+# 백엔드
+# =========================================
+class InputBackend:
+    """입력 백엔드 인터페이스 - send(events) 한 번이 시스템 호출 한 번"""
+
+    def send(self, events):
+        raise NotImplementedError
+
+    def move_to(self, x, y):
+        self.send(move(x, y))
+
+    def click(self, button='left'):
+        self.send(click(button))
+
+
+class Win32ApiBackend(InputBackend):
+    """기존 방식 - 이벤트마다 SetCursorPos / keybd_event / mouse_event 호출"""
+
+    def __init__(self):
+        import win32api
+        import win32con
+        self._api = win32api
+        self._con = win32con
+        self._buttons = {
+            ('left', True): win32con.MOUSEEVENTF_LEFTDOWN,
+            ('left', False): win32con.MOUSEEVENTF_LEFTUP,
+            ('right', True): win32con.MOUSEEVENTF_RIGHTDOWN,
+            ('right', False): win32con.MOUSEEVENTF_RIGHTUP,
+        }
+
+    def send(self, events):
+        for event in events:
+            kind = event[0]
+            if kind == 'move':
+                self._api.SetCursorPos((event[1], event[2]))
+            elif kind == 'button':
+                self._api.mouse_event(self._buttons[(event[1], event[2])], 0, 0, 0, INJECTED_TAG)
+            elif kind == 'key':
+                flags = 0 if event[2] else self._con.KEYEVENTF_KEYUP
+                self._api.keybd_event(event[1], 0, flags, INJECTED_TAG)
+
+
+# SendInput 구조체 (winuser.h)
+_ULONG_PTR = ctypes.c_size_t
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong), ("dwExtraInfo", _ULONG_PTR)]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort), ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", _ULONG_PTR)]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_ulong), ("wParamL", ctypes.c_ushort), ("wParamH", ctypes.c_ushort)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUTUNION)]
+
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+KEYEVENTF_KEYUP = 0x0002
+
+_BUTTON_FLAGS = {
+    ('left', True): MOUSEEVENTF_LEFTDOWN,
+    ('left', False): MOUSEEVENTF_LEFTUP,
+    ('right', True): MOUSEEVENTF_RIGHTDOWN,
+    ('right', False): MOUSEEVENTF_RIGHTUP,
+}
+
+
+def pack_inputs(events, screen):
+    """이벤트 목록 → INPUT 배열 (screen = 가상 화면 left, top, width, height)"""
+    left, top, width, height = screen
+    inputs = (_INPUT * len(events))()
+    for i, event in enumerate(events):
+        item = inputs[i]
+        kind = event[0]
+        if kind == 'move':
+            # 절대 좌표는 가상 화면 기준 0 ~ 65535 로 정규화
+            item.type = INPUT_MOUSE
+            item.u.mi.dx = ((event[1] - left) * 65535 + (width - 1) // 2) // max(1, width - 1)
+            item.u.mi.dy = ((event[2] - top) * 65535 + (height - 1) // 2) // max(1, height - 1)
+            item.u.mi.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+            item.u.mi.dwExtraInfo = INJECTED_TAG
+        elif kind == 'button':
+            item.type = INPUT_MOUSE
+            item.u.mi.dwFlags = _BUTTON_FLAGS[(event[1], event[2])]
+            item.u.mi.dwExtraInfo = INJECTED_TAG
+        elif kind == 'key':
+            item.type = INPUT_KEYBOARD
+            item.u.ki.wVk = event[1]
+            item.u.ki.dwFlags = 0 if event[2] else KEYEVENTF_KEYUP
+            item.u.ki.dwExtraInfo = INJECTED_TAG
+    return inputs
+
+
+class SendInputBackend(InputBackend):
+    """Win32 SendInput - send() 한 번에 이벤트 전체를 한 배열로 전송"""
+
+    SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN = 76, 77
+    SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 78, 79
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._user32.SendInput.argtypes = (ctypes.c_uint, ctypes.c_void_p, ctypes.c_int)
+        self.refresh_screen()
+
+    def refresh_screen(self):
+        """모니터 구성이 바뀌면 다시 호출"""
+        metric = self._user32.GetSystemMetrics
+        self.screen = (metric(self.SM_XVIRTUALSCREEN), metric(self.SM_YVIRTUALSCREEN),
+                       metric(self.SM_CXVIRTUALSCREEN), metric(self.SM_CYVIRTUALSCREEN))
+
+    def send(self, events):
+        if not events:
+            return
+        inputs = pack_inputs(events, self.screen)
+        sent = self._user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+        if sent != len(inputs):
+            print(f"[Input] SendInput 일부만 전송됨: {sent}/{len(inputs)}")
+
+
+class RecordingInput(InputBackend):
+    """기록용 가짜 백엔드 - (시각, 이벤트 목록) 을 저장"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.batches = []
+        self.cursor = (0, 0)
+        self._lock = threading.Lock()
+
+    def send(self, events):
+        with self._lock:
+            self.batches.append((self.clock(), list(events)))
+            for event in events:
+                if event[0] == 'move':
+                    self.cursor = (event[1], event[2])
+
+    @property
+    def call_count(self):
+        return len(self.batches)
+
+    @property
+    def event_count(self):
+        return sum(len(events) for _, events in self.batches)
+
+    def clicks(self):
+        """(시각, 버튼, 커서, 누른 조합키 목록) - 버튼 누름마다"""
+        result = []
+        cursor = (0, 0)
+        held = set()
+        for t, events in self.batches:
+            for event in events:
+                if event[0] == 'move':
+                    cursor = (event[1], event[2])
+                elif event[0] == 'key':
+                    (held.add if event[2] else held.discard)(event[1])
+                elif event[0] == 'button' and event[2]:
+                    result.append((t, event[1], cursor, sorted(held)))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self.batches = []
+
+
+def default_input_backend():
+    """Windows 면 SendInput, 아니면 기록용 가짜 백엔드"""
+    if sys.platform == 'win32':
+        try:
+            return SendInputBackend()
+        except Exception as e:
+            print(f"[Input] SendInput 사용 불가, win32api 로 대체: {e}")
+            return Win32ApiBackend()
+    return RecordingInput()
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark():
+    slots = [(1690 + 37 + c * 74, 961 + 54 + r * 109) for r in range(3) for c in range(11)]
+    screen = (0, 0, 2560, 1440)
+
+    legacy = RecordingInput()
+    for x, y in slots:
+        # 기존 루프: 이벤트마다 호출 1번
+        for event in slot_ctrl_click(x, y):
+            legacy.send([event])
+
+    per_slot = RecordingInput()
+    for x, y in slots:
+        per_slot.send(slot_ctrl_click(x, y))
+
+    per_pass = RecordingInput()
+    per_pass.send([e for x, y in slots for e in slot_ctrl_click(x, y)])
+
+    same = legacy.clicks() and [c[1:] for c in legacy.clicks()] == [c[1:] for c in per_pass.clicks()]
+    print(f"슬롯 {len(slots)}개 버리기 한 바퀴")
+    for name, rec in (("기존 (이벤트별)", legacy), ("슬롯별 묶음", per_slot), ("한 바퀴 묶음", per_pass)):
+        print(f"  {name:14s}: 호출 {rec.call_count:4d}회 / 이벤트 {rec.event_count}개")
+    print(f"  클릭 순서/위치/조합키 동일: {bool(same)}")
+
+    runs = 200
+    events = [e for x, y in slots for e in slot_ctrl_click(x, y)]
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        pack_inputs(events, screen)
+    print(f"  INPUT 배열 구성: {(time.perf_counter() - t0) / runs * 1e6:.1f} us / 바퀴")
+
+
+if __name__ == "__main__":
+    _benchmark()
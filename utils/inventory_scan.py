@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+파이프라인 인벤토리 스캔 (신화장난꾸러기 1단계)
+
+기존 1단계는 슬롯마다 이동 → 고정 대기 (panel_delay) → 캡처 → 분석을 직렬로 했다.
+여기서는 커서가 슬롯 위에 있어야 하는 일 (패널 표시 감지 + 캡처) 만 슬롯 위에서 하고,
+색상 분석은 작업 스레드에서 커서가 다음 슬롯으로 이동하는 동안 한다.
+고정 대기 대신 설명 패널 윗부분을 빠르게 읽어 표시 완료를 감지한다 (panel_delay 는 최대 대기 시간).
+  - 패널 서명 (테두리/배경 색) 이 보이고 연속 두 번 같게 읽히면 바로 표시 완료
+    (도착 후 바뀌었거나 직전 슬롯에서 받아들인 패널과 다를 때만 - 남아 있던 이전 패널은 받지 않음)
+  - 서명을 아직 모르면 도착 후 바뀌었다가 PANEL_SETTLE_TIME 동안 그대로일 때 - 이때 본 패널/배경으로 서명을 배운다
+슬롯별 시간 (이동 / 대기 / 캡처 / 분석) 과 표시 지연 히스토그램을 기록해 요약한다.
+벤치마크: python -m utils.inventory_scan
+"""
+
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from utils.precise_timer import SPIN_THRESHOLD, sleep_until
+
+# 표시 감지에 읽는 패널 윗부분 높이 (px)
+PANEL_STRIP_ROWS = 32
+# 표시 감지 읽기 간격
+PANEL_POLL_INTERVAL = 0.005
+# 이 시간 동안 바뀌지 않아야 안정 (게임 한 프레임보다 길게 - 그리는 중인 프레임을 두 번 읽어도 통과하지 않도록)
+PANEL_SETTLE_TIME = 0.02
+# 서명을 쓰기 전에 배울 패널 수
+SIGNATURE_LEARN_PANELS = 3
+# 표시 지연 히스토그램 구간 (ms)
+LATENCY_BIN_MS = 10
+
+# frame: 패널 전체 캡처, waited: 도착 후 캡처까지 걸린 시간, grab: 그중 전체 캡처 시간,
+# ready: 최대 대기 전에 표시 감지됨, reads: 윗부분 읽기 횟수, latency: 표시 감지까지 시간 (못 하면 None)
+PanelWait = namedtuple('PanelWait', ['frame', 'waited', 'grab', 'ready', 'reads', 'latency'])
+
+# index: 슬롯 번호, move: 이동, wait: 패널 대기 (캡처 포함), grab: 전체 캡처,
+# analyze: 작업 스레드 분석 시간 (이동과 겹침), ready: 표시 감지됨 (False 면 최대 대기)
+SlotTiming = namedtuple('SlotTiming', ['index', 'move', 'wait', 'grab', 'analyze', 'ready'])
+
+# keep: 보존 색상이 보인 슬롯 번호 (스캔 순서), stopped: 중간에 중지됨, duration: 스캔 전체 시간
+ScanResult = namedtuple('ScanResult', ['keep', 'timings', 'stopped', 'duration'])
+
+
+class InlineExecutor:
+    """submit 즉시 그 자리에서 실행하는 executor (재생 하네스 / 벤치마크용)"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def _color_fractions(strip):
+    """BGRA → 4비트 양자화 색 (4096칸) 별 픽셀 비율"""
+    q = (strip[:, :, :3] >> 4).astype(np.int32)
+    index = (q[:, :, 0] << 8) | (q[:, :, 1] << 4) | q[:, :, 2]
+    return np.bincount(index.ravel(), minlength=4096) / max(1, index.size)
+
+
+class PanelSignature:
+    """패널 테두리/배경 색 서명 - 윗부분에서 서명 색 픽셀 비율로 패널이 떠 있는지 판단
+
+    from_colors 로 직접 정하거나, learn(패널, 배경) 으로 감지된 패널에서 배운다:
+    본 패널마다 공통으로 min_share 이상이고 배경에는 거의 없는 색이 서명이 된다.
+    서명 색마다 배운 비율의 match_ratio 이상이어야 맞음 (그리는 중인 프레임은 테두리가 없어 떨어진다).
+    """
+
+    def __init__(self, min_share=0.05, background_share=0.01, match_ratio=0.6):
+        self.min_share = min_share
+        self.background_share = background_share
+        self.match_ratio = match_ratio
+        self.panels = 0
+        self._panel_min = None       # 본 패널들의 색별 최소 비율
+        self._background_max = np.zeros(4096)
+        self._bins = None
+        self._expected = None  # 서명 색별 기대 비율
+
+    @classmethod
+    def from_colors(cls, hex_colors, share=0.3):
+        """패널 테두리/배경 색 (#RRGGBB) 로 바로 만든 서명 - 윗부분에서 합쳐 share 정도면 패널"""
+        signature = cls()
+        fractions = np.zeros(4096)
+        for hex_color in hex_colors:
+            r, g, b = (int(hex_color[k:k + 2], 16) >> 4 for k in (1, 3, 5))
+            fractions[(b << 8) | (g << 4) | r] = 1.0
+        signature._bins = np.flatnonzero(fractions)
+        signature._expected = np.full(len(signature._bins), share / len(signature._bins))
+        signature.panels = SIGNATURE_LEARN_PANELS
+        return signature
+
+    @property
+    def ready(self):
+        return self._bins is not None and len(self._bins) > 0 and self.panels >= SIGNATURE_LEARN_PANELS
+
+    def learn(self, panel_strip, background_strip=None):
+        panel = _color_fractions(panel_strip)
+        self._panel_min = panel if self._panel_min is None else np.minimum(self._panel_min, panel)
+        if background_strip is not None:
+            self._background_max = np.maximum(self._background_max, _color_fractions(background_strip))
+        self.panels += 1
+        self._bins = np.flatnonzero((self._panel_min >= self.min_share)
+                                    & (self._background_max < self.background_share))
+        self._expected = self._panel_min[self._bins]
+
+    def matches(self, strip):
+        if not self.ready:
+            return False
+        return bool(np.all(_color_fractions(strip)[self._bins] >= self.match_ratio * self._expected))
+
+
+class PanelDetector:
+    """설명 패널 표시 감지
+
+    wait(rect, timeout): 표시 완료를 감지하면 전체를 캡처해 반환.
+      - 서명이 준비됐으면: 윗부분이 서명과 맞고 연속 두 번 같게 읽히면 - 단 도착 후 한 번이라도 바뀌었거나
+        직전에 받아들인 패널과 다를 때만 (이전 슬롯 패널이 남아 있으면 그 슬롯 결과로 분석되므로)
+      - 아니면: 도착 직후 모습에서 바뀐 뒤 settle 초 동안 그대로면 - 그 패널/배경으로 서명을 배운다
+    빈 슬롯처럼 끝내 감지되지 않으면 timeout 까지 기다린 뒤 캡처한다 (기존 고정 대기와 같음).
+    감지까지 걸린 시간은 latencies 에 쌓여 histogram() 으로 볼 수 있다.
+    """
+
+    def __init__(self, grab, clock=time.perf_counter, sleep=None, spin=SPIN_THRESHOLD,
+                 interval=PANEL_POLL_INTERVAL, settle=PANEL_SETTLE_TIME, strip_rows=PANEL_STRIP_ROWS,
+                 signature=None):
+        self.grab = grab
+        self.clock = clock
+        self.sleep = sleep
+        self.spin = spin
+        self.interval = interval
+        self.settle = settle
+        self.strip_rows = strip_rows
+        self.signature = signature if signature is not None else PanelSignature()
+        self.latencies = []
+        self.timeouts = 0
+        self._accepted = None  # 마지막으로 받아들인 패널 윗부분
+
+    def _strip(self, rect):
+        left, top, width, height = rect
+        return self.grab(left, top, width, min(height, self.strip_rows))
+
+    def wait(self, rect, timeout):
+        start = self.clock()
+        deadline = start + max(0.0, timeout)
+        first = previous = self._strip(rect)
+        reads = 1
+        stable_since = None  # 처음 모습에서 바뀐 뒤 마지막으로 바뀐 시각
+        changed = False      # 도착 후 한 번이라도 바뀜
+        latency = None
+        while True:
+            now = self.clock()
+            if now >= deadline:
+                break
+            sleep_until(min(now + self.interval, deadline), self.clock, self.sleep, self.spin)
+            strip = self._strip(rect)
+            reads += 1
+            now = self.clock()
+            if np.array_equal(strip, previous):
+                if self.signature.matches(strip) and (changed or self._is_new(strip)):
+                    latency = now - start
+                    break
+                if stable_since is not None and now - stable_since >= self.settle:
+                    latency = now - start
+                    self.signature.learn(strip, first)
+                    break
+            else:
+                changed = True
+                stable_since = now if not np.array_equal(strip, first) else None
+                previous = strip
+
+        if latency is None:
+            self.timeouts += 1
+        else:
+            self.latencies.append(latency)
+            self._accepted = strip
+        grab_start = self.clock()
+        frame = self.grab(*rect)
+        end = self.clock()
+        return PanelWait(frame, end - start, end - grab_start, latency is not None, reads, latency)
+
+    def _is_new(self, strip):
+        """직전에 받아들인 패널과 다른가 (받아들인 적이 없으면 알 수 없으므로 False)"""
+        return self._accepted is not None and not np.array_equal(strip, self._accepted)
+
+    def reset_stats(self):
+        self.latencies = []
+        self.timeouts = 0
+        self._accepted = None
+
+    def histogram(self, bin_ms=LATENCY_BIN_MS):
+        """표시 지연 히스토그램 → [(구간 시작 ms, 개수), ...] (감지 못 한 수는 timeouts)"""
+        if not self.latencies:
+            return []
+        ms = np.array(self.latencies) * 1000
+        counts = np.bincount((ms // bin_ms).astype(int))
+        return [(i * bin_ms, int(c)) for i, c in enumerate(counts) if c]
+
+    def histogram_text(self, bin_ms=LATENCY_BIN_MS):
+        """표시/로그용 - '0-10ms 3 | 10-20ms 12 | 시간초과 2'"""
+        parts = [f"{lo}-{lo + bin_ms}ms {count}" for lo, count in self.histogram(bin_ms)]
+        if self.timeouts:
+            parts.append(f"시간초과 {self.timeouts}")
+        if self.latencies:
+            parts.append(f"p50 {np.percentile(self.latencies, 50) * 1000:.0f}ms")
+        return " | ".join(parts) or "표시 지연 -"
+
+
+def keep_color_analyzer(hex_color, tol):
+    """frame (BGRA) 에 보존 색상이 있는지 → bool 을 돌려주는 분석 함수"""
+    target = np.array([int(hex_color[5:7], 16), int(hex_color[3:5], 16), int(hex_color[1:3], 16)],
+                      dtype=np.int16)
+
+    def analyze(frame):
+        diff = np.abs(frame[:, :, :3].astype(np.int16) - target)
+        return bool(np.any((diff <= tol).all(axis=2)))
+
+    return analyze
+
+
+def _timed(analyze, frame, clock):
+    start = clock()
+    found = analyze(frame)
+    return found, clock() - start
+
+
+def scan_slots(slots, move, detector, analyze, timeout, should_continue=None, on_slot=None,
+               executor=None, clock=time.perf_counter):
+    """slots [(번호, x, y, 패널 rect), ...] 를 순서대로 호버하며 스캔 → ScanResult
+
+    move(x, y): 커서 이동 (도착까지 블록), analyze(frame) → bool (작업 스레드에서 실행)
+    on_slot(번호): 슬롯 캡처 직후 (진행 표시용)
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inv-scan")
+
+    start = clock()
+    pending = []  # (번호, 이동 시간, PanelWait, Future)
+    stopped = False
+    try:
+        for index, x, y, rect in slots:
+            if should_continue is not None and not should_continue():
+                stopped = True
+                break
+            t0 = clock()
+            move(x, y)
+            moved = clock() - t0
+            panel = detector.wait(rect, timeout)
+            pending.append((index, moved, panel, executor.submit(_timed, analyze, panel.frame, clock)))
+            if on_slot is not None:
+                on_slot(index)
+
+        keep, timings = [], []
+        for index, moved, panel, future in pending:
+            try:
+                found, analyzed = future.result()
+            except Exception as e:
+                print(f"Scan error: {e}")
+                found, analyzed = False, 0.0
+            if found:
+                keep.append(index)
+            timings.append(SlotTiming(index, moved, panel.waited, panel.grab, analyzed, panel.ready))
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+    return ScanResult(keep, timings, stopped, clock() - start)
+
+
+def _mean_ms(values):
+    return sum(values) / len(values) * 1000 if values else 0.0
+
+
+def timing_summary(result, panel_delay=None):
+    """표시/로그용 한 줄 요약 - panel_delay 를 주면 기존 고정 대기 방식 추정 시간도 붙인다"""
+    timings = result.timings
+    if not timings:
+        return "스캔 -"
+    waits = [t.wait for t in timings]
+    timeouts = sum(1 for t in timings if not t.ready)
+    text = (f"슬롯 {len(timings)}개 {result.duration:.2f}s | 이동 {_mean_ms([t.move for t in timings]):.0f}ms"
+            f" | 패널 {_mean_ms(waits):.0f}ms (최대 {max(waits) * 1000:.0f}, 시간초과 {timeouts})"
+            f" | 분석 {_mean_ms([t.analyze for t in timings]):.1f}ms")
+    if panel_delay is not None:
+        legacy = sum(t.move + panel_delay + t.grab + t.analyze for t in timings)
+        text += f" | 고정 대기 추정 {legacy:.2f}s"
+    return text
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(n_slots=33, panel_delay=0.08, move_time=0.15, seed=0):
+    """가상 시계 위의 가짜 패널 - 도착 후 15~60ms 에 패널이 두 단계로 그려지고 빈 슬롯은 그대로
+
+    처음 몇 슬롯은 바뀜 → 안정으로 감지하며 서명을 배우고, 그 뒤로는 서명으로 감지한다.
+    """
+    rng = np.random.default_rng(seed)
+    now = [0.0]
+    cursor = [None]
+    arrived = [0.0]
+    latency = rng.uniform(0.015, 0.06, n_slots)
+    keep = {3, 15, 29}
+    empty = set(rng.choice(sorted(set(range(n_slots)) - keep), n_slots // 4, replace=False).tolist())
+    w, h = 120, 200
+    background = np.full((h, w, 4), 30, dtype=np.uint8)
+    panels = []
+    for i in range(n_slots):
+        # 공통 테두리/배경 + 슬롯마다 다른 제목줄
+        panel = np.full((h, w, 4), 40, dtype=np.uint8)
+        panel[:2, :, :3] = panel[:, :2, :3] = panel[:, -2:, :3] = (0x60, 0x70, 0x80)
+        panel[8:24, 10:w - 10, :3] = 60 + 5 * i
+        if i in keep:
+            panel[h // 2, w // 2, :3] = (0xF0, 0xA8, 0xDF)
+        panels.append(panel)
+
+    def grab(left, top, width, height):
+        slot = cursor[0]
+        if slot is None or slot in empty or now[0] < arrived[0] + latency[slot]:
+            image = background
+        elif now[0] < arrived[0] + latency[slot] + 0.01:
+            image = panels[slot] // 2  # 그리는 중
+        else:
+            image = panels[slot]
+        return image[:height, :width].copy()
+
+    def move(slot):
+        now[0] += move_time
+        cursor[0] = slot
+        arrived[0] = now[0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    def clock():
+        return now[0]
+
+    analyze = keep_color_analyzer("#DFA8F0", 15)
+    slots = [(i, i, 0, (0, 0, w, h)) for i in range(n_slots)]
+
+    # 기존: 이동 → 고정 대기 → 캡처 → 분석
+    now[0] = 0.0
+    legacy_keep = []
+    for i, _, _, rect in slots:
+        move(i)
+        now[0] += panel_delay
+        if analyze(grab(*rect)):
+            legacy_keep.append(i)
+    legacy = now[0]
+
+    now[0] = 0.0
+    detector = PanelDetector(grab, clock=clock, sleep=sleep, spin=0.0)
+    result = scan_slots(slots, lambda x, y: move(x), detector, analyze, panel_delay,
+                        executor=InlineExecutor(), clock=clock)
+    print(f"슬롯 {n_slots}개 (빈 슬롯 {len(empty)}): 고정 대기 {legacy:.2f}s 보존 {legacy_keep} | "
+          f"표시 감지 {result.duration:.2f}s 보존 {result.keep}")
+    print("  " + timing_summary(result, panel_delay))
+    print("  표시 지연: " + detector.histogram_text())
+
+    # 이미 떠 있는 패널: 직전 슬롯에서 받아들인 패널이면 시간초과, 다른 패널이면 바로 감지
+    shown = [panels[1]]
+    still = PanelDetector(lambda left, top, width, height: shown[0][:height, :width].copy(), clock=clock,
+                          sleep=sleep, spin=0.0, signature=detector.signature)
+    still._accepted = panels[1][:PANEL_STRIP_ROWS].copy()
+    stale = still.wait((0, 0, w, h), panel_delay)
+    shown[0] = panels[2]
+    fresh = still.wait((0, 0, w, h), panel_delay)
+    print(f"  남은 이전 패널: 감지 {stale.ready} ({stale.waited * 1000:.0f}ms) | "
+          f"바로 바뀐 패널: 감지 {fresh.ready} ({fresh.waited * 1000:.0f}ms)")
+
+    # 실제 분석 시간 (이 시간이 작업 스레드에서 이동과 겹친다)
+    frame = np.random.default_rng(seed).integers(0, 255, size=(719, 492, 4), dtype=np.uint8)
+    t0 = time.perf_counter()
+    for _ in range(20):
+        analyze(frame)
+    print(f"  설명 패널 492x719 분석 {(time.perf_counter() - t0) / 20 * 1000:.2f} ms/슬롯")
+
+
+if __name__ == "__main__":
+    _benchmark()
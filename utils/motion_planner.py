@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+커서 이동 계획기
+
+시작/끝 좌표와 이동 시간으로 시각 → 좌표 궤적 (이징 곡선 + 선택적 흔들림/오버슈트) 을 만들고,
+고해상도 타이머의 절대 마감에 맞춰 SetCursorPos 를 부른다.
+매 틱마다 "지금 시각" 의 좌표를 계산하므로 늦게 깬 틱이 이동 시간을 늘리지 않는다.
+이동 중에 목표가 바뀌면 (retarget / track) 현재 위치에서 남은 시간으로 궤적을 다시 만든다.
+벤치마크: python -m utils.motion_planner
+"""
+
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+
+from utils.precise_timer import SPIN_THRESHOLD, sleep_until
+
+# 재목표 시 최소 이동 시간 (거의 끝난 궤적을 순간이동으로 바꾸지 않도록)
+MIN_RETARGET_TIME = 0.03
+# track 콜백 호출 간격
+TRACK_INTERVAL = 0.03
+
+# requested / achieved: 요청 / 실제 이동 시간, steps: SetCursorPos 횟수,
+# late: 다음 틱 마감을 이미 지나 건너뛴 틱 수, retargets: 이동 중 목표 변경 횟수
+MoveResult = namedtuple('MoveResult', ['requested', 'achieved', 'steps', 'late', 'retargets'])
+
+
+# =========================================
+# 이징 곡선 (0~1 → 0~1)
+# =========================================
+def ease_linear(u):
+    return u
+
+
+def ease_smoothstep(u):
+    """기존 smooth_move_to 곡선 (ease-in-out)"""
+    return u * u * (3 - 2 * u)
+
+
+def ease_out_cubic(u):
+    """빠르게 출발해 천천히 도착"""
+    return 1 - (1 - u) ** 3
+
+
+def ease_out_back(u, overshoot):
+    """목표를 overshoot (거리 대비 대략 비율) 만큼 지나쳤다가 돌아옴"""
+    c1 = overshoot * 17.0  # c1=1.7 일 때 최대 약 10%
+    c3 = c1 + 1
+    return 1 + c3 * (u - 1) ** 3 + c1 * (u - 1) ** 2
+
+
+EASINGS = {
+    'linear': ease_linear,
+    'smoothstep': ease_smoothstep,
+    'out_cubic': ease_out_cubic,
+}
+
+
+# ease: EASINGS 이름, jitter: 진행 방향 수직 흔들림 최대 px, overshoot: 지나침 비율 (0 이면 없음),
+# rate: 초당 SetCursorPos 횟수
+MotionProfile = namedtuple('MotionProfile', ['ease', 'jitter', 'overshoot', 'rate'])
+
+PROFILES = {
+    'smooth': MotionProfile('smoothstep', 0.0, 0.0, 144),
+    'fast': MotionProfile('out_cubic', 0.0, 0.0, 144),
+    'human': MotionProfile('smoothstep', 1.5, 0.04, 144),
+}
+DEFAULT_PROFILE = PROFILES['smooth']
+
+
+class Trajectory:
+    """start → end, t0 부터 duration 초 - position(t) 로 임의 시각의 좌표"""
+
+    def __init__(self, start, end, t0, duration, profile=DEFAULT_PROFILE, rng=None):
+        self.start = (float(start[0]), float(start[1]))
+        self.end = (int(end[0]), int(end[1]))
+        self.t0 = t0
+        self.duration = max(0.0, duration)
+        self.end_time = t0 + self.duration
+        self.profile = profile
+        self._ease = EASINGS.get(profile.ease, ease_smoothstep)
+        # 흔들림: 끝점에서 0 이 되는 느린 사인파 (궤적마다 주파수/위상 고정)
+        rng = rng or random
+        self._wobble = (rng.uniform(1.0, 2.5), rng.uniform(0, 2 * math.pi))
+        dx, dy = self.end[0] - self.start[0], self.end[1] - self.start[1]
+        length = math.hypot(dx, dy) or 1.0
+        self._normal = (-dy / length, dx / length)
+
+    def progress(self, t):
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, max(0.0, (t - self.t0) / self.duration))
+
+    def position(self, t):
+        """시각 t 의 좌표 (정수) - duration 이후는 정확히 end"""
+        u = self.progress(t)
+        if u >= 1.0:
+            return self.end
+        if self.profile.overshoot > 0:
+            e = ease_out_back(u, self.profile.overshoot)
+        else:
+            e = self._ease(u)
+        x = self.start[0] + (self.end[0] - self.start[0]) * e
+        y = self.start[1] + (self.end[1] - self.start[1]) * e
+        if self.profile.jitter > 0:
+            freq, phase = self._wobble
+            offset = self.profile.jitter * math.sin(math.pi * u) * math.sin(2 * math.pi * freq * u + phase)
+            x += self._normal[0] * offset
+            y += self._normal[1] * offset
+        return int(round(x)), int(round(y))
+
+    def samples(self, rate):
+        """[(t, x, y), ...] - rate Hz 간격 (미리보기/테스트용)"""
+        n = max(1, int(math.ceil(self.duration * rate)))
+        return [(self.t0 + self.duration * i / n,) + self.position(self.t0 + self.duration * i / n)
+                for i in range(n + 1)]
+
+
+class CursorMover:
+    """궤적을 절대 마감 시각에 맞춰 재생하는 커서 이동기
+
+    move_to 는 이동이 끝날 때까지 호출 스레드에서 블록한다 (클릭은 도착 후).
+    다른 스레드는 retarget(x, y) 로, 호출자는 track() 콜백으로 이동 중 목표를 바꿀 수 있다.
+    """
+
+    def __init__(self, get_pos, set_pos, profile=DEFAULT_PROFILE, clock=time.perf_counter,
+                 sleep=None, spin=SPIN_THRESHOLD, seed=None):
+        self.get_pos = get_pos
+        self.set_pos = set_pos
+        self.profile = profile
+        self.clock = clock
+        self.sleep = sleep
+        self.spin = spin
+        self.last_result = None
+        self.moves = 0
+        self.total_requested = 0.0
+        self.total_achieved = 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def retarget(self, x, y):
+        """진행 중인 이동의 목표 변경 (다음 틱에 반영)"""
+        with self._lock:
+            self._pending = (int(x), int(y))
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+        return pending
+
+    def move_to(self, x, y, duration, profile=None, track=None, track_interval=TRACK_INTERVAL):
+        """(x, y) 로 duration 초 동안 이동 → MoveResult
+
+        track(): 이동 중 track_interval 마다 호출 - 새 목표 (x, y) 또는 None
+        """
+        profile = profile or self.profile
+        start = self.clock()
+        self._take_pending()
+        if duration <= 0:
+            self.set_pos((int(x), int(y)))
+            return self._finish(MoveResult(duration, self.clock() - start, 1, 0, 0))
+
+        trajectory = Trajectory(self.get_pos(), (x, y), start, duration, profile, self._rng)
+        interval = 1.0 / max(1, profile.rate)
+        next_tick = start
+        next_track = start + track_interval
+        steps = late = retargets = 0
+        position = None
+        while True:
+            now = self.clock()
+            target = self._take_pending()
+            if target is None and track is not None and now >= next_track:
+                next_track = now + track_interval
+                target = track()
+            if target is not None and tuple(target) != trajectory.end:
+                remaining = max(trajectory.end_time - now, MIN_RETARGET_TIME)
+                current = position or trajectory.position(now)
+                trajectory = Trajectory(current, target, now, remaining, profile, self._rng)
+                retargets += 1
+
+            new_position = trajectory.position(now)
+            if new_position != position:
+                self.set_pos(new_position)
+                position = new_position
+                steps += 1
+            if now >= trajectory.end_time:
+                break
+
+            next_tick += interval
+            if next_tick < now:
+                # 밀린 틱은 몰아서 보내지 않고 지금부터 다시
+                late += 1
+                next_tick = now + interval
+            sleep_until(min(next_tick, trajectory.end_time), self.clock, self.sleep, self.spin)
+
+        return self._finish(MoveResult(duration, self.clock() - start, steps, late, retargets))
+
+    def _finish(self, result):
+        self.last_result = result
+        self.moves += 1
+        self.total_requested += result.requested
+        self.total_achieved += result.achieved
+        return result
+
+    def stats_text(self):
+        """표시용 - 실제 / 요청 평균 이동 시간"""
+        if not self.moves:
+            return "이동 -"
+        return (f"이동 {self.total_achieved / self.moves * 1000:.0f}/"
+                f"{self.total_requested / self.moves * 1000:.0f}ms")
+
+
+def win32_cursor_mover(**kwargs):
+    """GetCursorPos/SetCursorPos 로 움직이는 CursorMover - 기능마다 하나씩 (이동 통계가 섞이지 않게)"""
+    import win32api
+    return CursorMover(lambda: win32api.GetCursorPos(), lambda pos: win32api.SetCursorPos(pos), **kwargs)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _legacy_move(get_pos, set_pos, target_x, target_y, duration=0.15):
+    """기존 smooth_move_to (SetCursorPos + time.sleep(duration / steps))"""
+    start_x, start_y = get_pos()
+    steps = max(20, int(duration * 144))
+    for i in range(1, steps + 1):
+        t = i / steps
+        t = t * t * (3 - 2 * t)
+        set_pos((int(start_x + (target_x - start_x) * t), int(start_y + (target_y - start_y) * t)))
+        time.sleep(duration / steps)
+
+
+def _benchmark(moves=10, duration=0.15):
+    cursor = [(0, 0)]
+
+    def get_pos():
+        return cursor[0]
+
+    def set_pos(pos):
+        cursor[0] = pos
+
+    t0 = time.perf_counter()
+    for i in range(moves):
+        _legacy_move(get_pos, set_pos, 500 * (i % 2), 300)
+    legacy = (time.perf_counter() - t0) / moves
+
+    mover = CursorMover(get_pos, set_pos)
+    for i in range(moves):
+        mover.move_to(500 * (i % 2), 300, duration)
+    # Windows 기본 타이머 (15.6ms 틱) 에서는 sleep 한 번이 틱 하나로 올림된다
+    steps = max(20, int(duration * 144))
+    windows_legacy = steps * math.ceil((duration / steps) / 0.0156) * 0.0156
+    print(f"{duration * 1000:.0f}ms 이동 x{moves}: 기존 sleep 루프 {legacy * 1000:.1f} ms "
+          f"(Windows 15.6ms 틱 추정 {windows_legacy * 1000:.0f} ms) | "
+          f"계획기 {mover.stats_text()} (마지막 {mover.last_result.steps}스텝, 늦은 틱 {mover.last_result.late})")
+
+    # 이동 중 재목표: 절반쯤에서 목표가 200px 옮겨짐
+    cursor[0] = (0, 0)
+    calls = [0]
+
+    def track():
+        calls[0] += 1
+        return (700, 300) if calls[0] >= 2 else None
+
+    result = mover.move_to(500, 300, duration, track=track)
+    print(f"재목표: 도착 {cursor[0]} | 재목표 {result.retargets}회 | 실제 {result.achieved * 1000:.1f} ms")
+
+    for name, profile in PROFILES.items():
+        samples = Trajectory((0, 0), (400, 0), 0.0, duration, profile, random.Random(1)).samples(144)
+        peak = max(x for _, x, _ in samples)
+        wobble = max(abs(y) for _, _, y in samples)
+        print(f"  프로파일 {name:6s}: 최대 x {peak} (목표 400) | 수직 흔들림 최대 {wobble}px")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+마우스 버튼 이벤트 서비스
+
+저수준 마우스 훅 (WH_MOUSE_LL) 하나가 버튼 누름/뗌을 큐에 넣고,
+디스패치 스레드가 구독자 (핫키 디스패처, 키 입력 다이얼로그) 에게 전달한다.
+10ms 마다 GetAsyncKeyState 를 부르는 폴링과 달리 입력이 없으면 CPU 를 쓰지 않고,
+한 틱보다 짧게 눌렀다 뗀 버튼도 놓치지 않는다.
+훅 설치에 실패하면 폴링 소스로, 테스트 (Linux) 에서는 FakeMouseSource 를 쓴다.
+벤치마크: python -m utils.mouse_hook
+"""
+
+import ctypes
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from utils.input_backend import INJECTED_TAG
+
+# button: 'left' / 'right' / 'middle' / 'mouse4' / 'mouse5', down: 누름 여부, time: perf_counter
+MouseButtonEvent = namedtuple('MouseButtonEvent', ['button', 'down', 'time'])
+
+SIDE_BUTTONS = ('mouse4', 'mouse5')
+CLICK_BUTTONS = ('left', 'right', 'mouse4', 'mouse5')
+
+# 버튼 → 설정/표시에 쓰는 키 이름 (액션 키 다이얼로그)
+BUTTON_KEY_NAMES = {'left': "좌클릭", 'right': "우클릭", 'mouse4': "mouse4", 'mouse5': "mouse5"}
+
+# 윈도우 메시지 → (버튼, 누름)
+_BUTTON_MESSAGES = {
+    0x0201: ('left', True), 0x0202: ('left', False),      # WM_LBUTTONDOWN / UP
+    0x0204: ('right', True), 0x0205: ('right', False),    # WM_RBUTTONDOWN / UP
+    0x0207: ('middle', True), 0x0208: ('middle', False),  # WM_MBUTTONDOWN / UP
+}
+_WM_XBUTTONDOWN = 0x020B
+_WM_XBUTTONUP = 0x020C
+_XBUTTONS = {1: 'mouse4', 2: 'mouse5'}
+
+_WH_MOUSE_LL = 14
+_WM_QUIT = 0x0012
+# SendInput 등으로 주입된 이벤트 표시 - 그중 dwExtraInfo 가 INJECTED_TAG 인 것만 이 앱의 입력
+_LLMHF_INJECTED = 0x00000001
+
+# 폴링 소스용 가상 키 코드
+_POLL_KEYS = (('left', 0x01), ('right', 0x02), ('middle', 0x04), ('mouse4', 0x05), ('mouse5', 0x06))
+
+
+def is_own_input(flags, extra_info):
+    """훅 이벤트가 이 앱이 보낸 입력인가 (주입됨 + INJECTED_TAG)"""
+    return bool(flags & _LLMHF_INJECTED) and (extra_info or 0) == INJECTED_TAG
+
+
+def decode_message(message, mouse_data=0):
+    """훅 메시지 → (버튼, 누름) - 버튼 메시지가 아니면 None"""
+    if message in _BUTTON_MESSAGES:
+        return _BUTTON_MESSAGES[message]
+    if message in (_WM_XBUTTONDOWN, _WM_XBUTTONUP):
+        button = _XBUTTONS.get((mouse_data >> 16) & 0xFFFF)
+        if button:
+            return button, message == _WM_XBUTTONDOWN
+    return None
+
+
+# =========================================
+# 이벤트 소스
+# =========================================
+class Win32MouseHookSource:
+    """WH_MOUSE_LL 훅 - 전용 스레드에서 메시지 루프를 돌린다
+
+    훅 콜백은 OS 입력 처리를 막으므로 큐에 넣기만 하고 바로 반환한다.
+    이 앱이 보낸 클릭 (INJECTED_TAG 표시) 만 핫키로 잡히지 않도록 버린다.
+    마우스 소프트웨어 (G Hub, Synapse 등) 가 재지정해 주입한 버튼은 그대로 전달한다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.error = None
+        self._thread = None
+        self._thread_id = None
+        self._proc = None
+        self._ready = threading.Event()
+
+    def start(self, emit):
+        self._ready.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(emit,), daemon=True, name="MouseHook")
+        self._thread.start()
+        self._ready.wait(2.0)
+        if self.error is not None:
+            raise self.error
+
+    def _run(self, emit):
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        class MSLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [('pt', wintypes.POINT), ('mouseData', wintypes.DWORD), ('flags', wintypes.DWORD),
+                        ('time', wintypes.DWORD), ('dwExtraInfo', ctypes.c_void_p)]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.SetWindowsHookExW.restype = ctypes.c_void_p
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, HOOKPROC, ctypes.c_void_p, wintypes.DWORD)
+        user32.CallNextHookEx.restype = LRESULT
+        user32.CallNextHookEx.argtypes = (ctypes.c_void_p, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.UnhookWindowsHookEx.argtypes = (ctypes.c_void_p,)
+        kernel32.GetModuleHandleW.restype = ctypes.c_void_p
+
+        def proc(n_code, w_param, l_param):
+            if n_code == 0:  # HC_ACTION
+                decoded = _BUTTON_MESSAGES.get(w_param)
+                if decoded is not None or w_param in (_WM_XBUTTONDOWN, _WM_XBUTTONUP):
+                    info = ctypes.cast(l_param, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                    if not is_own_input(info.flags, info.dwExtraInfo):
+                        decoded = decoded or decode_message(w_param, info.mouseData)
+                        if decoded is not None:
+                            emit(MouseButtonEvent(decoded[0], decoded[1], self.clock()))
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        self._proc = HOOKPROC(proc)  # GC 방지
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hook = user32.SetWindowsHookExW(_WH_MOUSE_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            self.error = ctypes.WinError()
+            self._ready.set()
+            return
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWindowsHookEx(hook)
+
+    def stop(self):
+        if self._thread_id is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, _WM_QUIT, 0, 0)
+            self._thread_id = None
+
+
+class PollingMouseSource:
+    """GetAsyncKeyState 폴링 (훅을 설치할 수 없을 때 대체) - 상태 변화만 이벤트로"""
+
+    def __init__(self, interval=0.01, get_key_state=None, clock=time.perf_counter):
+        self.interval = interval
+        self.clock = clock
+        self._get_key_state = get_key_state
+        self._stop = threading.Event()
+
+    def start(self, emit):
+        if self._get_key_state is None:
+            self._get_key_state = ctypes.windll.user32.GetAsyncKeyState
+        self._stop.clear()
+        threading.Thread(target=self._run, args=(emit,), daemon=True, name="MousePoll").start()
+
+    def _run(self, emit):
+        state = {button: False for button, _ in _POLL_KEYS}
+        while not self._stop.is_set():
+            for button, vk in _POLL_KEYS:
+                try:
+                    down = bool(self._get_key_state(vk) & 0x8000)
+                except Exception:
+                    continue
+                if down != state[button]:
+                    state[button] = down
+                    emit(MouseButtonEvent(button, down, self.clock()))
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+class FakeMouseSource:
+    """테스트용 소스 - press/release/click 으로 이벤트를 직접 넣는다"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._emit = None
+
+    def start(self, emit):
+        self._emit = emit
+
+    def stop(self):
+        self._emit = None
+
+    def _send(self, button, down):
+        if self._emit is not None:
+            self._emit(MouseButtonEvent(button, down, self.clock()))
+
+    def press(self, button):
+        self._send(button, True)
+
+    def release(self, button):
+        self._send(button, False)
+
+    def click(self, button):
+        self.press(button)
+        self.release(button)
+
+
+def default_mouse_source():
+    if sys.platform == 'win32':
+        return Win32MouseHookSource()
+    return FakeMouseSource()
+
+
+# =========================================
+# 서비스
+# =========================================
+class MouseHookService:
+    """이벤트 소스 하나 → 큐 → 구독자들
+
+    subscribe(callback, transient) 의 callback(MouseButtonEvent) 는 디스패치 스레드에서 불린다
+    (UI 작업은 호출자가 after() 로 넘길 것). transient 구독은 clear_transient() 로 한 번에 제거된다.
+    """
+
+    def __init__(self, source=None, clock=time.perf_counter):
+        self.source = source
+        self.clock = clock
+        self.pressed = frozenset()  # 지금 눌려 있는 버튼
+        self.delivered = 0
+        self._lock = threading.Lock()
+        self._subscribers = ()  # ((callback, transient), ...)
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """소스 시작 + 디스패치 스레드 (한 번만) - 훅 설치 실패 시 폴링으로 대체"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.source is None:
+                self.source = default_mouse_source()
+            try:
+                self.source.start(self._queue.put)
+            except Exception as e:
+                print(f"[MouseHook] 훅 설치 실패, 폴링으로 대체: {e}")
+                self.source = PollingMouseSource(clock=self.clock)
+                self.source.start(self._queue.put)
+            self._thread = threading.Thread(target=self._run, daemon=True, name="MouseDispatch")
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            try:
+                self.source.stop()
+            except Exception:
+                pass
+            self._queue.put(None)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            self.deliver(event)
+
+    def deliver(self, event):
+        """이벤트 하나를 구독자에게 전달 (디스패치 스레드)"""
+        if event.down:
+            self.pressed = self.pressed | {event.button}
+        else:
+            self.pressed = self.pressed - {event.button}
+        self.delivered += 1
+        for callback, _ in self._subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[MouseHook] 구독자 오류: {e}")
+
+    # =========================================
+    # 구독
+    # =========================================
+    def subscribe(self, callback, transient=False):
+        """구독 추가 - 제거용 callback 을 그대로 반환"""
+        with self._lock:
+            self._subscribers = self._subscribers + ((callback, transient),)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s[0] is not callback)
+
+    def clear_transient(self):
+        """transient 구독 모두 제거 (키 입력 다이얼로그 종료 시)"""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if not s[1])
+
+    def capture_button(self, callback, buttons=SIDE_BUTTONS, arm_delay=0.3):
+        """키 입력 다이얼로그용 - arm_delay 뒤 buttons 중 하나를 눌렀다 떼면 callback(버튼) 한 번
+
+        다이얼로그를 연 클릭처럼 이미 눌려 있던 버튼은 무시하고,
+        뗄 때 알리므로 바로 새 핫키를 등록해도 이번 누름으로 실행되지 않는다.
+        """
+        armed_at = self.clock() + arm_delay
+        held = set(self.pressed)
+        captured = []
+
+        def on_event(event):
+            if event.button not in buttons:
+                return
+            if event.down:
+                if not captured and event.time >= armed_at and event.button not in held:
+                    captured.append(event.button)
+                return
+            held.discard(event.button)
+            if captured and captured[0] == event.button:
+                self.unsubscribe(on_event)
+                callback(event.button)
+
+        return self.subscribe(on_event, transient=True)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(n=2000, poll_interval=0.01):
+    import random
+
+    # 버튼을 2~40ms 눌렀다 뗌 - 10ms 폴링은 틱 사이에 끝난 누름을 놓친다
+    rng = random.Random(1)
+    presses = []
+    t = 0.0
+    for _ in range(n):
+        t += rng.uniform(0.05, 0.2)
+        presses.append((t, rng.uniform(0.002, 0.04)))
+
+    missed, poll_delays = 0, []
+    for start, length in presses:
+        tick = (int(start / poll_interval) + 1) * poll_interval
+        if tick < start + length:
+            poll_delays.append(tick - start)
+        else:
+            missed += 1
+    poll_delays.sort()
+
+    # 이벤트 소스 → 큐 → 구독자 까지 실제 지연
+    service = MouseHookService(FakeMouseSource())
+    received = []
+    ack = threading.Event()
+
+    def on_event(event):
+        if event.down:
+            received.append(time.perf_counter() - event.time)
+        else:
+            ack.set()
+
+    service.subscribe(on_event)
+    service.start()
+    cpu0 = time.process_time()
+    for _ in range(n):
+        ack.clear()
+        service.source.click('mouse4')
+        ack.wait(1.0)
+    service.stop()
+    cpu_us = (time.process_time() - cpu0) / n * 1e6
+    received.sort()
+
+    idle_wakeups = 1.0 / poll_interval
+    print(f"누름 {n}회 (2~40ms): 10ms 폴링 놓침 {missed}회 ({missed / n * 100:.1f}%) | "
+          f"감지 지연 p50 {poll_delays[len(poll_delays) // 2] * 1000:.2f} ms")
+    print(f"이벤트 큐: 놓침 0회 | 전달 지연 p50 {received[len(received) // 2] * 1e6:.1f} us / "
+          f"p99 {received[int(len(received) * 0.99)] * 1e6:.1f} us | 이벤트당 CPU {cpu_us:.1f} us")
+    print(f"입력 없을 때 깨어남: 폴링 {idle_wakeups:.0f}회/s | 훅 0회/s")
+
+
+if __name__ == "__main__":
+    _benchmark()
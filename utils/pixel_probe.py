@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+픽셀 프로브 묶음 캡처
+
+등록된 단일 픽셀 프로브들을 최소 경계 영역(또는 몇 개의 작은 영역)으로 묶어
+한 번에 캡처하고, 원본 BGRA 버퍼에서 바로 색상을 비교한다.
+프로브가 늘어나도 캡처 횟수는 그룹 수만큼만 늘어난다.
+"""
+
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from utils.color_match import hex_to_rgb
+
+
+# color 는 (r, g, b)
+Probe = namedtuple('Probe', ['name', 'x', 'y', 'color', 'tol'])
+
+# 한 번에 캡처할 최대 면적 (이보다 크면 그룹을 나눈다)
+MAX_GROUP_AREA = 64 * 1024
+
+
+def group_regions(items, max_area=MAX_GROUP_AREA):
+    """items [(bbox, 값), ...] 를 경계 영역 면적이 max_area 이하인 그룹으로 묶는다 → [(bbox, [값, ...]), ...]
+
+    bbox 는 (left, top, width, height) - 혼자 max_area 보다 큰 영역은 그대로 한 그룹
+    """
+    groups = []  # [x0, y0, x1, y1, [값]] (x1, y1 포함)
+    for (left, top, width, height), value in sorted(items, key=lambda item: (item[0][1], item[0][0])):
+        right, bottom = left + width - 1, top + height - 1
+        best = None
+        best_area = None
+        for g in groups:
+            x0, y0 = min(g[0], left), min(g[1], top)
+            x1, y1 = max(g[2], right), max(g[3], bottom)
+            area = (x1 - x0 + 1) * (y1 - y0 + 1)
+            if area <= max_area and (best_area is None or area < best_area):
+                best, best_area = g, area
+        if best is None:
+            groups.append([left, top, right, bottom, [value]])
+        else:
+            best[0], best[1] = min(best[0], left), min(best[1], top)
+            best[2], best[3] = max(best[2], right), max(best[3], bottom)
+            best[4].append(value)
+    return [((x0, y0, x1 - x0 + 1, y1 - y0 + 1), members)
+            for x0, y0, x1, y1, members in groups]
+
+
+def group_probes(probes, max_area=MAX_GROUP_AREA):
+    """프로브를 경계 영역 면적이 max_area 이하인 그룹으로 묶는다 → [(bbox, [probe, ...]), ...]
+
+    bbox 는 (left, top, width, height)
+    """
+    return group_regions([((p.x, p.y, 1, 1), p) for p in probes], max_area)
+
+
+class PixelProbeSet:
+    """이름으로 등록하는 픽셀 프로브 모음
+
+    register/bind 로 선언만 하면 read() 한 번에 모든 프로브 결과를 얻는다.
+    """
+
+    def __init__(self, max_area=MAX_GROUP_AREA):
+        self.max_area = max_area
+        self._lock = threading.Lock()
+        self._probes = {}
+        self._plan = []  # [(bbox, names, xs, ys, targets, tols), ...]
+
+    def register(self, name, x, y, color, tol=0):
+        """프로브 추가/갱신 (color 는 '#RRGGBB')"""
+        with self._lock:
+            self._probes[name] = Probe(name, int(x), int(y), hex_to_rgb(color), int(tol))
+            self._rebuild()
+
+    def remove(self, name):
+        with self._lock:
+            if self._probes.pop(name, None) is not None:
+                self._rebuild()
+
+    def bind(self, name, x_var, y_var, color_var, tol=0):
+        """Tk 변수와 연결 - 값이 바뀌면 프로브도 자동 갱신"""
+        def on_change(*args):
+            try:
+                self.register(name, x_var.get(), y_var.get(), color_var.get(), tol)
+            except Exception:
+                pass  # 입력 중인 잘못된 값은 무시 (이전 프로브 유지)
+
+        on_change()
+        for var in (x_var, y_var, color_var):
+            var.trace_add("write", on_change)
+
+    def _rebuild(self):
+        """캡처 계획 재계산 (lock 보유 상태에서 호출)"""
+        plan = []
+        for bbox, members in group_probes(self._probes.values(), self.max_area):
+            left, top = bbox[0], bbox[1]
+            plan.append((
+                bbox,
+                [p.name for p in members],
+                np.array([p.x - left for p in members]),
+                np.array([p.y - top for p in members]),
+                # BGR 순서 (버퍼와 동일)
+                np.array([p.color[::-1] for p in members], dtype=np.int16),
+                np.array([p.tol for p in members], dtype=np.int16)[:, None],
+            ))
+        self._plan = plan
+
+    def read(self, capture, max_age=0.0):
+        """모든 프로브 검사 → {name: 일치 여부}"""
+        with self._lock:
+            plan = self._plan
+        result = {}
+        for bbox, names, xs, ys, targets, tols in plan:
+            frame = capture.region(*bbox, max_age=max_age)
+            pixels = frame[ys, xs, :3].astype(np.int16)
+            hits = (np.abs(pixels - targets) <= tols).all(axis=1)
+            result.update(zip(names, hits.tolist()))
+        return result
+
+    def regions(self):
+        """현재 캡처 계획의 영역 목록 [(left, top, width, height), ...]"""
+        with self._lock:
+            return [plan[0] for plan in self._plan]
+
+    def __len__(self):
+        return len(self._probes)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+고해상도 타이머 + 절대 마감 기반 주기 루프
+
+time.sleep(0.01) 같은 짧은 대기는 Windows 에서 15.6ms 타이머 틱으로 반올림되고,
+루프 안 작업 시간만큼 주기가 계속 밀린다 (drift).
+RateLoop 는 perf_counter 기준 절대 마감 시각을 쌓아 가므로 작업 시간이 주기에 더해지지 않고,
+대기는 고해상도 waitable timer (Windows 10 1803+) 로 하다가 마지막 구간만 스핀한다.
+타이머 핸들은 스레드마다 만들어지므로 작업 스레드는 끝날 때 release_thread() 로 닫는다.
+벤치마크: python -m utils.precise_timer
+"""
+
+import atexit
+import ctypes
+import sys
+import threading
+import time
+
+# 마감 직전 이 시간부터는 스핀 (타이머 깨어남 오차 보정)
+SPIN_THRESHOLD = 0.0008
+
+# Windows waitable timer 상수
+_CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+_TIMER_ALL_ACCESS = 0x1F0003
+_INFINITE = 0xFFFFFFFF
+
+
+class _Win32Timer:
+    """스레드별 고해상도 waitable timer - 만들 수 없으면 timeBeginPeriod(1) + sleep"""
+
+    def __init__(self):
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.CreateWaitableTimerExW.restype = ctypes.c_void_p
+        self._kernel32.CreateWaitableTimerExW.argtypes = (ctypes.c_void_p, ctypes.c_wchar_p,
+                                                          ctypes.c_ulong, ctypes.c_ulong)
+        self._kernel32.SetWaitableTimer.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_longlong),
+                                                    ctypes.c_long, ctypes.c_void_p, ctypes.c_void_p,
+                                                    ctypes.c_int)
+        self._kernel32.WaitForSingleObject.argtypes = (ctypes.c_void_p, ctypes.c_ulong)
+        self._kernel32.CloseHandle.argtypes = (ctypes.c_void_p,)
+        self._local = threading.local()
+        self.high_resolution = self._handle() is not None
+        if not self.high_resolution:
+            # 구버전 Windows: 시스템 타이머 해상도를 1ms 로
+            try:
+                ctypes.windll.winmm.timeBeginPeriod(1)
+                atexit.register(ctypes.windll.winmm.timeEndPeriod, 1)
+            except Exception as e:
+                print(f"[Timer] timeBeginPeriod 실패: {e}")
+
+    def _handle(self):
+        handle = getattr(self._local, 'handle', 0)
+        if handle == 0:
+            handle = self._kernel32.CreateWaitableTimerExW(
+                None, None, _CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, _TIMER_ALL_ACCESS)
+            self._local.handle = handle
+        return handle or None
+
+    def release_thread(self):
+        """현재 스레드의 타이머 핸들 닫기 - 다시 sleep 하면 새로 만든다"""
+        handle = getattr(self._local, 'handle', 0)
+        if handle:
+            self._kernel32.CloseHandle(handle)
+        self._local.handle = 0
+
+    def sleep(self, seconds):
+        handle = self._handle() if self.high_resolution else None
+        if handle is None:
+            time.sleep(seconds)
+            return
+        # 음수 = 상대 시간, 100ns 단위
+        due = ctypes.c_longlong(-max(1, int(seconds * 1e7)))
+        if self._kernel32.SetWaitableTimer(handle, ctypes.byref(due), 0, None, None, 0):
+            self._kernel32.WaitForSingleObject(handle, _INFINITE)
+        else:
+            time.sleep(seconds)
+
+
+def _make_timer():
+    if sys.platform == 'win32':
+        try:
+            return _Win32Timer()
+        except Exception as e:
+            print(f"[Timer] 고해상도 타이머 사용 불가: {e}")
+    return None
+
+
+_timer = _make_timer()
+
+# 모듈 공용 대기 함수 (HIGH_RESOLUTION: waitable timer 사용 여부)
+coarse_sleep = _timer.sleep if _timer else time.sleep
+HIGH_RESOLUTION = bool(_timer and _timer.high_resolution)
+
+
+def release_thread():
+    """이 스레드의 고해상도 타이머 핸들 닫기 (작업 스레드 종료 시)"""
+    if _timer is not None:
+        _timer.release_thread()
+
+
+def sleep_until(deadline, clock=time.perf_counter, sleep=None, spin=SPIN_THRESHOLD):
+    """perf_counter 기준 deadline 까지 대기 - 타이머 대기 후 마지막 spin 초는 스핀"""
+    sleep = sleep or coarse_sleep
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return
+        if remaining > spin:
+            sleep(remaining - spin)
+
+
+def precise_sleep(seconds, clock=time.perf_counter):
+    """time.sleep 대체 - 짧은 대기도 요청한 만큼만"""
+    if seconds > 0:
+        sleep_until(clock() + seconds, clock)
+
+
+class RateLoop:
+    """목표 주기로 도는 루프의 대기 담당
+
+    loop = RateLoop(0.01)
+    while running:
+        작업()
+        loop.wait()
+
+    마감은 start + n * interval 로 쌓이므로 작업 시간이 주기에 더해지지 않는다.
+    한 주기 넘게 밀리면 밀린 틱을 몰아서 실행하지 않고 현재 시각부터 다시 맞춘다 (overruns 증가).
+    """
+
+    def __init__(self, interval, clock=time.perf_counter, sleep=None):
+        self.interval = interval
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks = 0
+        self.overruns = 0
+        self.reset()
+
+    @classmethod
+    def from_rate(cls, hz, **kwargs):
+        return cls(1.0 / hz, **kwargs)
+
+    def reset(self):
+        """지금부터 다시 주기 시작 (일시정지 후 재개 등)"""
+        self.next_deadline = self.clock() + self.interval
+
+    def set_interval(self, interval):
+        if interval != self.interval:
+            self.interval = interval
+            self.reset()
+
+    def wait(self):
+        """다음 마감까지 대기 - 반환값: 마감 대비 지연 (초)"""
+        now = self.clock()
+        if now - self.next_deadline > self.interval:
+            # 한 주기 이상 밀림: 몰아치기 대신 재동기화
+            self.overruns += 1
+            self.next_deadline = now
+        else:
+            sleep_until(self.next_deadline, self.clock, self.sleep)
+        lag = self.clock() - self.next_deadline
+        self.next_deadline += self.interval
+        self.ticks += 1
+        return lag
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _measure(interval, n, work, use_rate_loop):
+    """주기 n 번 - (틱 간격 오차 목록, 전체 drift) 초 단위"""
+    stamps = []
+    loop = RateLoop(interval) if use_rate_loop else None
+    start = time.perf_counter()
+    for _ in range(n):
+        stamps.append(time.perf_counter())
+        work_end = time.perf_counter() + work
+        while time.perf_counter() < work_end:
+            pass
+        if loop:
+            loop.wait()
+        else:
+            time.sleep(interval)
+    end = time.perf_counter()
+    errors = [abs((b - a) - interval) for a, b in zip(stamps, stamps[1:])]
+    drift = (end - start) - n * interval
+    return errors, drift
+
+
+def _benchmark():
+    print(f"플랫폼 {sys.platform} | 고해상도 waitable timer: {HIGH_RESOLUTION}")
+    work = 0.0005  # 틱당 작업 0.5ms (클릭/캡처 흉내)
+    for interval, n in ((0.001, 500), (0.004, 250), (0.01, 150)):
+        for name, use_loop in (("time.sleep", False), ("RateLoop", True)):
+            errors, drift = _measure(interval, n, work, use_loop)
+            print(f"  {interval * 1000:4.0f}ms x{n:3d} {name:10s}: "
+                  f"오차 p50 {_percentile(errors, 0.5) * 1000:6.3f} ms | "
+                  f"p99 {_percentile(errors, 0.99) * 1000:6.3f} ms | "
+                  f"drift {drift * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,643 @@
+# -*- coding: utf-8 -*-
+"""
+감지 루프 녹화 재생 하네스
+
+가짜 입력 모듈(pyautogui / keyboard / win32api ...)과 가상 시계를 주입하고
+녹화(utils.frame_record)를 ReplayBackend 로 재생하여 실제 감지 코드를 그대로 실행한다.
+Windows 데스크톱 없이 감지 지연과 정확도를 재현 가능하게 측정한다.
+
+사용법: python -m utils.replay_harness belial|belial_multi|quick|inventory|discard|grid [녹화.npz]
+(녹화 파일이 없으면 합성 녹화를 만들어 사용)
+"""
+
+import sys
+import time
+import types
+
+import numpy as np
+
+from utils.frame_record import Recording, ReplayBackend
+from utils.input_backend import RecordingInput
+from utils.inventory_scan import InlineExecutor
+
+
+# =========================================
+# 가상 시계 / 가짜 모듈
+# =========================================
+class FakeClock:
+    """sleep 하면 즉시 시간만 흐르는 가상 시계 (time 모듈 대체)"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    perf_counter = monotonic = thread_time = time
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+    def __call__(self):
+        return self.now
+
+
+class SyncThreading:
+    """threading 대체 - Thread.start() 가 그 자리에서 실행 (재현성)"""
+
+    class Thread:
+        def __init__(self, target=None, args=(), kwargs=None, daemon=None):
+            self.target, self.args, self.kwargs = target, args, kwargs or {}
+
+        def start(self):
+            self.target(*self.args, **self.kwargs)
+
+    def __getattr__(self, name):
+        import threading
+        return getattr(threading, name)
+
+
+class Var:
+    """customtkinter 변수 대체 (get/set/trace_add)"""
+
+    def __init__(self, master=None, value=None):
+        self._value = value
+        self._traces = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for callback in list(self._traces):
+            callback()
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+
+
+class _Null:
+    """위젯 대체 - 어떤 호출도 무시"""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+class _Constants(types.ModuleType):
+    """win32con 대체 - 필요한 상수는 임의의 고유 정수"""
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = abs(hash(name)) % 0xFFFF
+        setattr(self, name, value)
+        return value
+
+
+class FakeInput:
+    """가짜 입력 API - 모든 입력을 (시각, 종류, 값, 커서) 로 기록"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.cursor = (0, 0)
+        self.events = []
+
+    def _log(self, kind, value=None):
+        self.events.append((self.clock.now, kind, value, self.cursor))
+
+    def set_cursor(self, pos):
+        self.cursor = (int(pos[0]), int(pos[1]))
+
+    def modules(self):
+        """sys.modules 에 넣을 가짜 모듈 dict"""
+        fake = self
+
+        pyautogui = types.ModuleType('pyautogui')
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0
+        pyautogui.position = lambda: fake.cursor
+        pyautogui.moveTo = lambda x, y, *a, **k: fake.set_cursor((x, y))
+        pyautogui.click = lambda *a, **k: fake._log('click', k.get('button', 'left'))
+        pyautogui.rightClick = lambda *a, **k: fake._log('click', 'right')
+        pyautogui.press = lambda key, *a, **k: fake._log('key', key)
+        pyautogui.keyDown = lambda key, *a, **k: fake._log('key_down', key)
+        pyautogui.keyUp = lambda key, *a, **k: fake._log('key_up', key)
+
+        keyboard = types.ModuleType('keyboard')
+        keyboard.press_and_release = lambda key, *a, **k: fake._log('key', key)
+        keyboard.press = lambda key: fake._log('key_down', key)
+        keyboard.release = lambda key: fake._log('key_up', key)
+        keyboard.is_pressed = lambda key: False
+        keyboard.on_press_key = lambda *a, **k: None
+        keyboard.on_press = lambda *a, **k: None
+        keyboard.on_release_key = lambda *a, **k: None
+        keyboard.unhook_all = lambda: None
+        keyboard.unhook = lambda *a: None
+
+        win32con = _Constants('win32con')
+
+        win32api = types.ModuleType('win32api')
+        win32api.GetCursorPos = lambda: fake.cursor
+        win32api.SetCursorPos = fake.set_cursor
+        win32api.GetAsyncKeyState = lambda vk: 0
+        win32api.GetSystemMetrics = lambda i: 0
+
+        def mouse_event(flags, *args):
+            if flags == win32con.MOUSEEVENTF_LEFTDOWN:
+                fake._log('click', 'left')
+            elif flags == win32con.MOUSEEVENTF_RIGHTDOWN:
+                fake._log('click', 'right')
+
+        def keybd_event(vk, scan, flags, extra):
+            fake._log('key_up' if flags == win32con.KEYEVENTF_KEYUP else 'key_down', vk)
+
+        win32api.mouse_event = mouse_event
+        win32api.keybd_event = keybd_event
+
+        win32gui = types.ModuleType('win32gui')
+        win32gui.GetParent = lambda hwnd: hwnd
+        win32gui.GetWindowLong = lambda *a: 0
+        win32gui.SetWindowLong = lambda *a: 0
+
+        ctk = types.ModuleType('customtkinter')
+        ctk.IntVar = ctk.StringVar = ctk.DoubleVar = ctk.BooleanVar = Var
+
+        return {'pyautogui': pyautogui, 'keyboard': keyboard, 'win32api': win32api,
+                'win32con': win32con, 'win32gui': win32gui, 'customtkinter': ctk}
+
+    def clicks(self):
+        return [(t, cursor) for t, kind, value, cursor in self.events if kind == 'click'
+                or (kind == 'key' and value == 'f')]
+
+
+class CursorRecordingInput(RecordingInput):
+    """RecordingInput + SendInput 처럼 move 이벤트가 가짜 커서도 옮긴다"""
+
+    def __init__(self, fake_input):
+        super().__init__(fake_input.clock)
+        self.fake_input = fake_input
+
+    def send(self, events):
+        super().send(events)
+        for event in events:
+            if event[0] == 'move':
+                self.fake_input.set_cursor((event[1], event[2]))
+
+
+def install_fakes(fake_input):
+    """가짜 모듈 설치 - 이미 import 된 features.* 의 전역 참조도 교체한다"""
+    fakes = fake_input.modules()
+    sys.modules.update(fakes)
+    for module_name, module in list(sys.modules.items()):
+        if module_name.startswith('features.') and module is not None:
+            for name, fake in fakes.items():
+                if name in vars(module):
+                    setattr(module, name, fake)
+
+
+# =========================================
+# 재생 호스트
+# =========================================
+def make_host(recording, clock=None):
+    """가짜 입력/가상 시계로 믹스인들을 조립한 호스트 → (host, fake_input, backend)"""
+    clock = clock or FakeClock()
+    fake_input = FakeInput(clock)
+    install_fakes(fake_input)
+
+    import features.belial
+    import features.discard
+    import features.inventory
+    import features.quick_button
+    import features.sell
+    import utils.screen_capture
+    from utils.screen_capture import ScreenCapture
+
+    for module in (features.belial, features.discard, features.inventory, features.quick_button,
+                   features.sell, utils.screen_capture):
+        module.time = clock
+    features.inventory.threading = SyncThreading()
+
+    class ReplayHost(features.belial.BelialMixin, features.inventory.InventoryMixin,
+                     features.quick_button.QuickButtonMixin, features.discard.DiscardMixin,
+                     features.sell.SellMixin):
+        def __init__(self):
+            self.ui_calls = []  # (시각, 함수 이름)
+            self.init_discard_vars()
+            self.init_sell_vars()
+            self.init_belial_vars()
+            self.init_inventory_vars()
+            self.init_quick_button_vars()
+
+        def after(self, ms, func=None, *args):
+            # 위젯 갱신은 실행하지 않고 기록만 한다
+            self.ui_calls.append((clock.now, getattr(func, '__name__', 'lambda')))
+
+        def __getattr__(self, name):
+            if name.endswith(('_label', '_btn')):
+                return _Null()
+            raise AttributeError(name)
+
+        def validate_hex(self, hex_color):
+            return isinstance(hex_color, str) and len(hex_color) == 7 and hex_color[0] == '#'
+
+        def is_chatting(self):
+            return False
+
+        def check_modifier(self, modifier):
+            return True
+
+    host = ReplayHost()
+    backend = ReplayBackend(recording, clock)
+    host.screen_capture = ScreenCapture(backend)
+    host.input_backend = CursorRecordingInput(fake_input)
+    host.clock = clock
+    # 커서 이동도 가상 시계로 (스핀 없이 마감까지 바로 sleep)
+    for mover in (host.cursor_mover, host.inv_cursor_mover):
+        mover.clock = clock
+        mover.sleep = clock.sleep
+        mover.spin = 0.0
+    host.inv_panel_detector.clock = clock
+    host.inv_panel_detector.sleep = clock.sleep
+    host.inv_panel_detector.spin = 0.0
+    host.inv_scan_executor = InlineExecutor()
+    return host, fake_input, backend
+
+
+def _match_targets(targets, clicks, radius):
+    """정답 대상별 첫 클릭까지의 지연 → (latencies, 오클릭 수)
+
+    이미 나타난 대상 근처의 클릭은 재클릭으로 보고 오클릭에 넣지 않는다.
+    """
+    def near(target, x, y):
+        return abs(x - target['x']) <= radius and abs(y - target['y']) <= radius
+
+    latencies = []
+    for target in targets:
+        for t, (x, y) in clicks:
+            if t >= target['t'] and near(target, x, y):
+                latencies.append(t - target['t'])
+                break
+    false_hits = sum(1 for t, (x, y) in clicks
+                     if not any(t >= target['t'] and near(target, x, y) for target in targets))
+    return latencies, false_hits
+
+
+def _report(name, latencies, n_targets, false_hits, compute_ms):
+    lat = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    print(f"[{name}] 정답 {n_targets} | 감지 {len(latencies)} | 오감지 {false_hits} | "
+          f"지연 p50 {np.nanpercentile(lat, 50):.1f} ms / max {np.nanmax(lat):.1f} ms | "
+          f"틱당 계산 {np.mean(compute_ms):.2f} ms")
+
+
+# =========================================
+# 시나리오
+# =========================================
+def run_belial(recording, radius=40):
+    """search_and_click 루프 재생 - 정답 이벤트 'belial_target'"""
+    host, fake_input, backend = make_host(recording)
+    host.is_running = host.detection_active = True
+    clock = host.clock
+    compute_ms = []
+    while clock.now <= recording.duration + 0.5:
+        t0 = time.perf_counter()
+        found = host.search_and_click()
+        elapsed = time.perf_counter() - t0
+        compute_ms.append(elapsed * 1000)
+        clock.sleep(elapsed)  # 실제 계산 시간도 지연에 포함
+        if found:
+            clock.sleep(host.click_delay.get())
+        clock.sleep(0.01)
+
+    targets = [e for e in recording.events if e['kind'] == 'belial_target']
+    latencies, false_hits = _match_targets(targets, fake_input.clicks(), radius)
+    _report("belial", latencies, len(targets), false_hits, compute_ms)
+    return latencies, false_hits
+
+
+def run_quick(recording):
+    """monitor_inventory_image 재생 - 정답 이벤트 'inventory_open' / 'inventory_close'"""
+    host, fake_input, backend = make_host(recording)
+    clock = host.clock
+    host.discard_running = True
+    compute_ms = []
+    poller = host.quick_poller
+    end = recording.duration + 0.5
+
+    def replay_wait():
+        clock.sleep(poller.interval)
+        if clock.now > end:
+            host.quick_btn_monitoring = False
+
+    def replay_end_tick():
+        compute_ms.append((time.perf_counter() - tick_start[0]) * 1000)
+
+    tick_start = [0.0]
+
+    def replay_begin_tick():
+        tick_start[0] = time.perf_counter()
+
+    poller.wait = replay_wait
+    poller.begin_tick = replay_begin_tick
+    poller.end_tick = replay_end_tick
+    host.quick_btn_monitoring = True
+    host.monitor_inventory_image()
+
+    shows = [t for t, name in host.ui_calls if name == 'show_quick_button']
+    hides = [t for t, name in host.ui_calls if name == 'hide_quick_button']
+    latencies = []
+    for e in recording.events:
+        calls = shows if e['kind'] == 'inventory_open' else hides if e['kind'] == 'inventory_close' else None
+        if calls is None:
+            continue
+        after = [t for t in calls if t >= e['t']]
+        if after:
+            latencies.append(after[0] - e['t'])
+    n_events = sum(e['kind'] in ('inventory_open', 'inventory_close') for e in recording.events)
+    false_hits = len(shows) + len(hides) - len(latencies)
+    _report("quick", latencies, n_events, false_hits, compute_ms)
+    return latencies, false_hits
+
+
+def run_inventory(recording=None, keep=(3, 15, 29), empty=(7, 8, 20, 26)):
+    """run_inventory_cleanup 재생 - 보존 슬롯을 즐겨찾기하고 나머지를 버리는지
+
+    recording 이 없으면 HoverPanelBackend (커서 위치에 따라 패널이 바뀌는 가상 화면) 를 쓴다.
+    녹화 파일은 정답 이벤트 'keep_slot' (x = 슬롯 번호) 을 쓴다.
+    """
+    host, fake_input, backend = make_host(recording or Recording())
+    if recording is None:
+        from utils.screen_capture import ScreenCapture
+        host.screen_capture = ScreenCapture(HoverPanelBackend(host, fake_input, host.clock, keep, empty))
+        expected = sorted(keep)
+    else:
+        expected = sorted(e['x'] for e in recording.events if e['kind'] == 'keep_slot')
+    host.inv_skip_empty.set(True)
+    positions = host.get_inventory_positions()
+    host.inv_cleanup_active = True
+    t0 = time.perf_counter()
+    host.run_inventory_cleanup()
+    compute_ms = [(time.perf_counter() - t0) * 1000]
+
+    # 스페이스 2번 (즐겨찾기) 을 누른 커서 위치 → 슬롯 번호
+    slot_of = {(x, y): i for i, (x, y, _) in enumerate(positions)}
+    favorites = sorted({slot_of.get(cursor) for t, kind, value, cursor in fake_input.events
+                        if kind == 'key' and value == 'space'} - {None})
+    hits = len(set(favorites) & set(expected))
+    # 2단계 Ctrl+클릭 (입력 백엔드 기록)
+    discarded = sum(1 for _, button, _, held in host.input_backend.clicks() if held)
+    print(f"[inventory] 보존 정답 {expected} | 감지 {favorites} | 일치 {hits}/{len(expected)} | "
+          f"버림 {discarded} (입력 호출 {host.input_backend.call_count}회) | "
+          f"전체 {host.clock.now:.2f}s (가상) | 계산 {compute_ms[0]:.1f} ms")
+    return favorites, expected
+
+
+def run_discard(empty=(7, 8, 20, 26, 27, 28, 29, 30, 31, 32)):
+    """run_discard_loop / run_sell_loop 재생 - 아이템 칸에만 입력을 보내는지"""
+    for name, button in (('discard', 'left'), ('sell', 'right')):
+        host, fake_input, _ = make_host(Recording())
+        from utils.screen_capture import ScreenCapture
+        host.screen_capture = ScreenCapture(HoverPanelBackend(host, fake_input, host.clock, (), empty))
+        host.inv_skip_empty.set(True)
+        positions = host.get_inventory_positions()
+        setattr(host, f"{name}_active", True)
+        getattr(host, f"run_{name}_loop")()
+
+        slot_of = {(x, y): i for i, (x, y, _) in enumerate(positions)}
+        clicked = sorted(slot_of.get(cursor) for _, b, cursor, _ in host.input_backend.clicks() if b == button)
+        expected = [i for i in range(len(positions)) if i not in set(empty)]
+        print(f"[{name}] 아이템 칸 {len(expected)} | 입력 {len(clicked)} "
+              f"({'일치' if clicked == expected else f'불일치 {clicked}'}) | "
+              f"이벤트 {host.input_backend.event_count}개 | 전체 {host.clock.now:.2f}s (가상)")
+
+
+def run_grid(recording, cols=11, rows=3):
+    """격자 분류 임계값 확인 - 녹화된 인벤토리 캡처마다 빈칸/즐겨찾기 판정을 정답과 비교
+
+    녹화: 인벤토리 영역만 캡처 (inv_x1..x2, inv_y1..y2)
+    정답 이벤트: 'empty_cell' / 'favorited_cell' (x = 칸 번호 줄*cols+열, t = 그 캡처 시각)
+    건너뛰면 안 되는 칸 (아이템인데 빈칸, 표시 없는데 즐겨찾기) 이 0 이어야 한다.
+    """
+    from utils.inventory_grid import EMPTY, GridAnalyzer
+
+    analyzer = GridAnalyzer()
+    times = np.array([ts for ts, _, _, _ in recording.captures])
+    truth = [({}, {}) for _ in recording.captures]  # 캡처별 (빈칸, 즐겨찾기) 정답
+    for event in recording.events:
+        if event['kind'] in ('empty_cell', 'favorited_cell'):
+            i = int(np.abs(times - event['t']).argmin())
+            truth[i][event['kind'] == 'favorited_cell'][int(event['x'])] = True
+
+    wrong_skip = missed = 0
+    empty_texture, item_texture = [], []
+    for (ts, left, top, frame), (empty, favorited) in zip(recording.captures, truth):
+        grid = analyzer.analyze(frame, left, top, cols, rows)
+        for index in range(cols * rows):
+            row, col = divmod(index, cols)
+            skipped = grid.states[row, col] == EMPTY or grid.favorited[row, col]
+            should_skip = index in empty or index in favorited
+            (empty_texture if index in empty else item_texture).append(float(grid.texture[row, col]))
+            if skipped and not should_skip:
+                wrong_skip += 1
+                print(f"  {ts:.2f}s 칸 {index}: 건너뜀 ({grid.states[row, col]}, "
+                      f"즐겨찾기 {bool(grid.favorited[row, col])}, 질감 {grid.texture[row, col]:.1f})")
+            elif should_skip and not skipped:
+                missed += 1
+    print(f"[grid] 캡처 {len(recording)} | 칸 {len(recording) * cols * rows} | "
+          f"건너뛰면 안 되는데 건너뜀 {wrong_skip} | 건너뛸 수 있었는데 처리 {missed} | "
+          f"질감 빈칸 최대 {max(empty_texture, default=0):.1f} / 아이템 최소 {min(item_texture, default=0):.1f}")
+    return wrong_skip, missed
+
+
+class HoverPanelBackend:
+    """인벤토리 + 설명 패널 가상 화면 - 커서가 멈춘 슬롯의 패널을 지연 후 그린다
+
+    커서가 슬롯 중앙에서 처음 캡처된 뒤 슬롯마다 10~40ms 후 한 프레임 (16ms) 은 어둡게 그리는 중,
+    그 뒤로 완성된 패널 (테두리 + 슬롯별 제목줄, 보존 슬롯은 가운데에 보존 색상) 을 보인다.
+    empty 슬롯은 인벤토리에서 빈칸으로 그려지고 패널 없이 배경만 보인다.
+    """
+
+    BACKGROUND = 20
+
+    def __init__(self, host, fake_input, clock, keep=(), empty=(), latency=(0.01, 0.04), seed=0):
+        self.fake_input = fake_input
+        self.clock = clock
+        cols = host.inv_cols.get()
+        cell_w = (host.inv_x2.get() - host.inv_x1.get()) / cols
+        x1, y1 = host.inv_desc_x1.get(), host.inv_desc_y1.get()
+        w = host.inv_desc_x2.get() - x1
+        h = host.inv_desc_y2.get() - y1
+        rng = np.random.default_rng(seed)
+        self.slots = {}  # 슬롯 중앙 (x, y) → (번호, 패널 rect, 지연)
+        for i, (x, y, col) in enumerate(host.get_inventory_positions()):
+            self.slots[(x, y)] = (i, (x1 + int(col * cell_w), y1, w, h), rng.uniform(*latency))
+        self.keep, self.empty = set(keep), set(empty)
+        self.size = (w, h)
+
+        # 인벤토리 영역 (격자 번호 = 줄 * cols + 열)
+        from utils.inventory_grid import synthetic_inventory
+        inv_x1, inv_y1 = host.inv_x1.get(), host.inv_y1.get()
+        inv_w, inv_h = host.inv_x2.get() - inv_x1, host.inv_y2.get() - inv_y1
+        rows = host.inv_rows.get()
+        cell_h = inv_h / rows
+        grid_index = {i: int((y - inv_y1) // cell_h) * cols + col
+                      for i, (x, y, col) in enumerate(host.get_inventory_positions())}
+        inventory = synthetic_inventory(cols, rows, inv_w, inv_h, empty={grid_index[i] for i in self.empty},
+                                        rarity={grid_index[i]: "신화" for i in self.keep}, seed=seed)
+        self.layers = [(inv_x1, inv_y1, inventory)]
+        self._hover = (None, 0.0)  # (커서 위치, 처음 본 시각)
+        self._panels = {}
+
+    def _panel(self, i):
+        if i not in self._panels:
+            w, h = self.size
+            panel = np.full((h, w, 4), 40, dtype=np.uint8)
+            panel[:, :, 3] = 255
+            panel[:2, :, :3] = panel[-2:, :, :3] = panel[:, :2, :3] = panel[:, -2:, :3] = (0x60, 0x70, 0x80)
+            panel[8:24, 10:w - 10, :3] = 30 + (i * 37) % 200  # 제목줄 (슬롯마다 다름)
+            if i in self.keep:
+                panel[h // 2, w // 2, :3] = (0xF0, 0xA8, 0xDF)  # #DFA8F0 (BGR)
+            self._panels[i] = panel
+        return self._panels[i]
+
+    def bounds(self):
+        left = min(rect[0] for _, rect, _ in self.slots.values())
+        top = min(rect[1] for _, rect, _ in self.slots.values())
+        right = max(rect[0] + rect[2] for _, rect, _ in self.slots.values())
+        return left, top, right - left, self.size[1]
+
+    @staticmethod
+    def _paste(out, left, top, image, px, py):
+        ph, pw = image.shape[:2]
+        height, width = out.shape[:2]
+        sx0, sy0 = max(left, px), max(top, py)
+        sx1, sy1 = min(left + width, px + pw), min(top + height, py + ph)
+        if sx0 < sx1 and sy0 < sy1:
+            out[sy0 - top:sy1 - top, sx0 - left:sx1 - left] = image[sy0 - py:sy1 - py, sx0 - px:sx1 - px]
+
+    def grab(self, left, top, width, height):
+        cursor = self.fake_input.cursor
+        if self._hover[0] != cursor:
+            self._hover = (cursor, self.clock.now)
+        out = np.full((height, width, 4), self.BACKGROUND, dtype=np.uint8)
+        out[:, :, 3] = 255
+        for px, py, image in self.layers:
+            self._paste(out, left, top, image, px, py)
+        slot = self.slots.get(cursor)
+        if slot is None or slot[0] in self.empty:
+            return out
+        i, (px, py, _, _), latency = slot
+        shown = self.clock.now - self._hover[1] - latency
+        if shown >= 0:
+            self._paste(out, left, top, self._panel(i) if shown >= 0.016 else self._panel(i) // 2, px, py)
+        return out
+
+
+# =========================================
+# 합성 녹화
+# =========================================
+def synthetic_belial_recording(width=2200, height=1200, fps=30, seconds=2.0, seed=0, appear=None):
+    """노이즈 화면 위에 벨리알 텍스트 블롭이 0.5초 / 1.2초에 나타나는 녹화
+
+    appear: [(시각, x, y), ...] - 여러 개를 같은 시각에 넣으면 동시 드랍
+    """
+    from constants import DEFAULT_COLORS
+    from utils.color_match import colors_to_bgr
+
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 120, size=(height, width, 4), dtype=np.uint8)
+    base[:, :, 3] = 255
+    bgr = colors_to_bgr(DEFAULT_COLORS).astype(np.uint8)
+    appear = appear or [(0.5, 800, 400), (1.2, 1500, 900)]
+
+    rec = Recording()
+    for t, x, y in appear:
+        rec.mark(t, 'belial_target', x + 40, y + 6)
+    frame = base.copy()
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        for at, x, y in appear:
+            if abs(t - at) < 0.5 / fps:
+                frame = frame.copy()
+                frame[y:y + 12, x:x + 80, :3] = bgr[0]
+        rec.add(t, 0, 0, frame)
+    return rec
+
+
+def synthetic_quick_recording(fps=30, seconds=2.0):
+    """인벤토리 인식 픽셀이 0.4초에 켜지고 1.3초에 꺼지는 녹화 (인식 영역만)"""
+    rec = Recording()
+    rec.mark(0.4, 'inventory_open')
+    rec.mark(1.3, 'inventory_close')
+    left, top = 1700, 250
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        frame = np.zeros((60, 200, 4), dtype=np.uint8)
+        frame[:, :, 3] = 255
+        if 0.4 <= t < 1.3:
+            frame[267 - top, 1738 - left, :3] = (0xCA, 0xDB, 0xE4)  # #E4DBCA (BGR)
+        rec.add(t, left, top, frame)
+    return rec
+
+
+def synthetic_grid_recording(cols=11, rows=3, frames=5):
+    """빈칸/즐겨찾기 정답이 붙은 인벤토리 캡처 녹화 - 헷갈리기 쉬운 칸 포함
+
+    - 모서리에 금색 계열 무늬가 조금 있는 아이템 (즐겨찾기 아님)
+    - 무늬가 거의 없는 어두운 아이템 (빈칸 아님)
+    """
+    from utils.inventory_grid import FAVORITE_MARKER_COLOR, _bgr, synthetic_inventory
+
+    rec = Recording()
+    width, height = 811, 326
+    cell_w, cell_h = width / cols, height / rows
+    gold = _bgr(FAVORITE_MARKER_COLOR).astype(np.uint8)
+    for f in range(frames):
+        rng = np.random.default_rng(100 + f)
+        cells = rng.permutation(cols * rows).tolist()
+        empty, favorited = set(cells[:8]), set(cells[8:11])
+        gilded, dim = cells[11:14], cells[14:16]
+        frame = synthetic_inventory(cols, rows, width, height, empty=empty, favorited=favorited, seed=f)
+        for index in gilded + dim:
+            row, col = divmod(index, cols)
+            x0, y0 = int(col * cell_w), int(row * cell_h)
+            x1, y1 = int((col + 1) * cell_w), int((row + 1) * cell_h)
+            if index in dim:
+                frame[y0 + 6:y1 - 6, x0 + 6:x1 - 6, :3] = 40 + rng.integers(0, 30, size=(y1 - y0 - 12, x1 - x0 - 12, 3),
+                                                                             dtype=np.uint8)
+            else:
+                frame[y0 + 6:y0 + 11, x0 + 6:x0 + 11, :3] = gold  # 모서리 무늬 5x5
+        ts = f * 0.5
+        rec.add(ts, 0, 0, frame)
+        for index in empty:
+            rec.mark(ts, 'empty_cell', index)
+        for index in favorited:
+            rec.mark(ts, 'favorited_cell', index)
+    return rec
+
+
+def main(argv):
+    scenario = argv[1] if len(argv) > 1 else 'belial'
+    path = argv[2] if len(argv) > 2 else None
+    if scenario == 'belial':
+        run_belial(Recording.load(path) if path else synthetic_belial_recording())
+    elif scenario == 'belial_multi':
+        # 한 번에 4개 드랍 - 한 프레임에서 모두 찾아 한 번에 클릭
+        drops = [(0.5, 300, 200), (0.5, 1700, 250), (0.5, 900, 800), (0.5, 1400, 1000)]
+        run_belial(Recording.load(path) if path else synthetic_belial_recording(appear=drops))
+    elif scenario == 'quick':
+        run_quick(Recording.load(path) if path else synthetic_quick_recording())
+    elif scenario == 'inventory':
+        run_inventory(Recording.load(path) if path else None)
+    elif scenario == 'discard':
+        run_discard()
+    elif scenario == 'grid':
+        run_grid(Recording.load(path) if path else synthetic_grid_recording())
+    else:
+        print("사용법: python -m utils.replay_harness belial|belial_multi|quick|inventory|discard|grid [녹화.npz]")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
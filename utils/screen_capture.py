@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+공유 화면 캡처 서비스
+
+ColorClickerApp 이 하나를 소유하며 모든 감지 기능이 같은 캡처 경로를 쓴다.
+- grab(): 해당 영역을 즉시 새로 캡처
+- set_consumer(): 기능별로 읽을 영역을 등록 (공유 캡처 범위)
+- region(share=True): 요청 영역 + 등록된 영역들을 덮는 경계를 캡처하여 캐시 (다른 기능이 재사용)
+- region(max_age=...): 캐시된 프레임이 충분히 최신이고 영역을 포함하면 그 뷰를 반환
+반환값은 모두 (H, W, 4) BGRA NumPy 배열 (가능하면 복사 없는 뷰)
+감지 스레드는 끝날 때 release_thread() 로 그 스레드의 캡처 자원을 닫는다.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+# 공유 캡처 경계가 등록 영역 면적 합의 이 배수를 넘으면 (멀리 떨어진 영역들) 요청 영역만 캡처
+MAX_SHARE_WASTE = 2.0
+
+
+class MssBackend:
+    """mss 캡처 백엔드 - 스레드별로 mss 인스턴스를 한 번만 만들어 재사용"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _sct(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            import mss
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+
+    def bounds(self):
+        """전체 가상 화면 (left, top, width, height)"""
+        mon = self._sct().monitors[0]
+        return mon['left'], mon['top'], mon['width'], mon['height']
+
+    def grab(self, left, top, width, height):
+        shot = self._sct().grab({"left": left, "top": top, "width": width, "height": height})
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        """현재 스레드의 mss 인스턴스를 닫는다 (스레드 종료 시)"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is not None:
+            self._local.sct = None
+            sct.close()
+
+
+class ArrayBackend:
+    """배열/이미지 파일 백엔드 - 합성 프레임으로 감지 코드를 구동 (Linux 테스트용)"""
+
+    def __init__(self, frame=None, origin=(0, 0)):
+        self.origin = origin
+        self.frame = None
+        if frame is not None:
+            self.set_frame(frame)
+
+    @classmethod
+    def from_file(cls, path, origin=(0, 0)):
+        """PNG 등 이미지 파일로 생성"""
+        from PIL import Image
+        rgb = np.array(Image.open(path).convert('RGB'))
+        return cls(rgb_to_bgra(rgb), origin)
+
+    def set_frame(self, frame):
+        """(H, W, 4) BGRA 또는 (H, W, 3) BGR 프레임 교체"""
+        if frame.shape[2] == 3:
+            alpha = np.full(frame.shape[:2] + (1,), 255, dtype=np.uint8)
+            frame = np.concatenate([frame, alpha], axis=2)
+        self.frame = frame
+
+    def bounds(self):
+        h, w = self.frame.shape[:2]
+        return self.origin[0], self.origin[1], w, h
+
+    def grab(self, left, top, width, height):
+        ox, oy = self.origin
+        x0, y0 = left - ox, top - oy
+        h, w = self.frame.shape[:2]
+        if 0 <= x0 and 0 <= y0 and x0 + width <= w and y0 + height <= h:
+            return self.frame[y0:y0 + height, x0:x0 + width]
+        # 화면 밖은 검은색 (ImageGrab 과 동일)
+        out = np.zeros((height, width, 4), dtype=np.uint8)
+        sx0, sy0 = max(0, x0), max(0, y0)
+        sx1, sy1 = min(w, x0 + width), min(h, y0 + height)
+        if sx0 < sx1 and sy0 < sy1:
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = self.frame[sy0:sy1, sx0:sx1]
+        return out
+
+
+class ScreenCapture:
+    """공유 화면 캡처 서비스"""
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MssBackend()
+        self._lock = threading.Lock()
+        self._shared = None  # (frame, left, top, timestamp)
+        self._consumers = {}  # {이름: [(left, top, width, height), ...]}
+        self.grab_count = 0
+        self.shared_hits = 0
+
+    def grab(self, left, top, width, height):
+        """영역을 즉시 새로 캡처"""
+        self.grab_count += 1
+        return self.backend.grab(left, top, width, height)
+
+    def set_consumer(self, name, regions):
+        """name 기능이 읽을 영역 목록 등록 (None/빈 목록이면 해제) - 공유 캡처가 함께 덮는다"""
+        with self._lock:
+            if regions:
+                self._consumers[name] = [tuple(r) for r in regions]
+            else:
+                self._consumers.pop(name, None)
+
+    def share_bounds(self, left, top, width, height):
+        """공유 캡처 영역 - 요청 영역과 등록된 영역들을 덮는 경계 (left, top, width, height)
+
+        등록된 다른 영역이 없거나 경계가 너무 낭비되면 (MAX_SHARE_WASTE) 요청 영역만.
+        """
+        with self._lock:
+            boxes = [r for regions in self._consumers.values() for r in regions]
+        boxes.append((left, top, width, height))
+        x0 = min(b[0] for b in boxes)
+        y0 = min(b[1] for b in boxes)
+        x1 = max(b[0] + b[2] for b in boxes)
+        y1 = max(b[1] + b[3] for b in boxes)
+        union = (x1 - x0) * (y1 - y0)
+        if union > MAX_SHARE_WASTE * sum(b[2] * b[3] for b in boxes):
+            return left, top, width, height
+        return x0, y0, x1 - x0, y1 - y0
+
+    def shared_frame(self, left, top, width, height):
+        """영역 (left, top, width, height) 를 캡처하여 공유 캐시에 저장 → (frame, left, top)"""
+        frame = self.grab(left, top, width, height)
+        with self._lock:
+            self._shared = (frame, left, top, time.perf_counter())
+        return frame, left, top
+
+    def full_frame(self):
+        """전체 화면을 캡처하여 공유 캐시에 저장 → (frame, left, top)"""
+        return self.shared_frame(*self.backend.bounds())
+
+    def region(self, left, top, width, height, max_age=0.0, share=False):
+        """영역 뷰 반환
+
+        share=True 면 share_bounds() 영역을 새로 캡처해 캐시하고 그 뷰를 반환한다.
+        캐시가 max_age 초 이내이고 영역을 포함하면 캡처 없이 뷰를 반환한다.
+        """
+        if share:
+            frame, fl, ft = self.shared_frame(*self.share_bounds(left, top, width, height))
+        else:
+            with self._lock:
+                shared = self._shared
+            frame = None
+            if shared is not None and max_age > 0:
+                cached, fl, ft, ts = shared
+                if time.perf_counter() - ts <= max_age:
+                    frame = cached
+                    self.shared_hits += 1
+            if frame is None:
+                return self.grab(left, top, width, height)
+
+        x0, y0 = left - fl, top - ft
+        fh, fw = frame.shape[:2]
+        if 0 <= x0 and 0 <= y0 and x0 + width <= fw and y0 + height <= fh:
+            return frame[y0:y0 + height, x0:x0 + width]
+        return self.grab(left, top, width, height)
+
+    def release_thread(self):
+        """현재 스레드의 캡처 자원 정리 (감지 스레드가 끝날 때 호출)"""
+        close = getattr(self.backend, 'close', None)
+        if close is not None:
+            close()
+
+    def pixel(self, x, y, max_age=0.0):
+        """(x, y) 픽셀의 (r, g, b)"""
+        b, g, r = self.region(x, y, 1, 1, max_age)[0, 0, :3].tolist()
+        return r, g, b
+
+    def start_recording(self, max_captures=2000):
+        """이후 모든 캡처를 녹화 (utils.frame_record)"""
+        from utils.frame_record import RecordingBackend
+        if not isinstance(self.backend, RecordingBackend):
+            self.backend = RecordingBackend(self.backend, max_captures=max_captures)
+        return self.backend.recording
+
+    def stop_recording(self, path=None):
+        """녹화 종료 → Recording (path 가 있으면 저장)"""
+        from utils.frame_record import RecordingBackend
+        if not isinstance(self.backend, RecordingBackend):
+            return None
+        recording = self.backend.recording
+        self.backend = self.backend.inner
+        if path:
+            recording.save(path)
+        return recording
+
+    def grab_image(self, left, top, width, height):
+        """영역을 PIL RGB 이미지로 캡처 (돋보기 등 UI 용)"""
+        return to_image(self.grab(left, top, width, height))
+
+
+def rgb_to_bgra(rgb):
+    """(H, W, 3) RGB → (H, W, 4) BGRA"""
+    h, w = rgb.shape[:2]
+    out = np.empty((h, w, 4), dtype=np.uint8)
+    out[:, :, :3] = rgb[:, :, ::-1]
+    out[:, :, 3] = 255
+    return out
+
+
+def to_image(bgra):
+    """BGRA 배열 → PIL RGB 이미지"""
+    from PIL import Image
+    return Image.fromarray(np.ascontiguousarray(bgra[:, :, 2::-1]))
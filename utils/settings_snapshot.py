@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+설정 스냅샷 (Tk 변수 → 불변 객체)
+
+워커 스레드가 루프마다 IntVar.get() 을 부르면 매번 Tcl 인터프리터를 거친다.
+SnapshotPublisher 는 Tk 변수 트레이스(메인 스레드) 에서 불변 데이터클래스를 새로 만들어
+.current 에 한 번에 대입하고, 워커는 .current 의 일반 속성만 읽는다.
+벤치마크: python -m utils.settings_snapshot
+"""
+
+import sys
+from dataclasses import dataclass
+
+# __slots__ 데이터클래스는 Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def frozen_settings(cls):
+    """불변 설정 데이터클래스 데코레이터 (frozen + __slots__)"""
+    return dataclass(frozen=True, **_SLOTS)(cls)
+
+
+class SnapshotPublisher:
+    """Tk 변수가 바뀔 때마다 build() 로 새 스냅샷을 만들어 게시
+
+    build() 는 메인 스레드 (생성 시점, 트레이스 콜백) 에서만 호출된다.
+    .current 교체는 속성 대입 한 번이라 워커는 항상 완전한 스냅샷 하나를 본다.
+    build() 가 실패하면 (입력 중인 빈 칸 등) 이전 스냅샷을 유지한다.
+    """
+
+    def __init__(self, build, variables=(), on_publish=None):
+        self._build = build
+        self._listeners = []
+        self.current = None
+        self.version = 0
+        if on_publish is not None:
+            self._listeners.append(on_publish)
+        self.publish()
+        self.watch(*variables)
+
+    def watch(self, *variables):
+        """변수 추가 - 값이 바뀌면 다시 게시"""
+        for var in variables:
+            var.trace_add('write', self._on_write)
+
+    def subscribe(self, callback):
+        """callback(snapshot) - 새 스냅샷이 게시될 때마다 (메인 스레드)"""
+        self._listeners.append(callback)
+
+    def _on_write(self, *args):
+        self.publish()
+
+    def publish(self):
+        """지금 변수 값으로 스냅샷 재생성 - 값이 같으면 그대로 둔다"""
+        try:
+            snapshot = self._build()
+        except Exception:
+            return self.current
+        if snapshot != self.current:
+            self.current = snapshot
+            self.version += 1
+            for callback in list(self._listeners):
+                callback(snapshot)
+        return self.current
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(n=200000):
+    import time
+    import tkinter
+
+    @frozen_settings
+    class _Example:
+        search_x1: int
+        search_y1: int
+        cooldown_distance: int
+        cooldown_time: float
+
+    interp = tkinter.Tcl()
+    variables = [tkinter.IntVar(interp, 6), tkinter.IntVar(interp, 7),
+                 tkinter.IntVar(interp, 50), tkinter.DoubleVar(interp, 0.1)]
+    publisher = SnapshotPublisher(lambda: _Example(*(v.get() for v in variables)), variables)
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        for v in variables:
+            v.get()
+    tk_us = (time.perf_counter() - t0) / n * 1e6
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        s = publisher.current
+        s.search_x1, s.search_y1, s.cooldown_distance, s.cooldown_time
+    snap_us = (time.perf_counter() - t0) / n * 1e6
+
+    variables[2].set(80)
+    print(f"설정 4개 읽기: Tk 변수 {tk_us:.2f} us | 스냅샷 {snap_us:.3f} us "
+          f"(메인 스레드 기준 - 워커에서는 Tk 호출이 메인 루프를 거쳐 훨씬 느림)")
+    print(f"값 변경 후 스냅샷: cooldown_distance={publisher.current.cooldown_distance} (게시 {publisher.version}회)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+한 프레임 다중 대상 클릭 (벨리알)
+
+한 번 캡처한 프레임에서 조건을 통과한 대상을 모두 모아 정책 순서로 정렬하고,
+한 번에 이어서 클릭한다. 두 번째 대상부터는 전체 화면을 다시 검색하지 않고
+대상 주변만 작게 캡처해 아직 그 자리에 있는지 (그리고 제외 색상이 없는지) 확인한다.
+벤치마크: python -m utils.target_sweep
+"""
+
+import math
+import time
+from collections import namedtuple
+
+from utils.blob_detect import find_text_blobs
+from utils.color_match import match_mask
+
+# 화면 좌표 - (x, y): 클릭 위치, (x0, y0, x1, y1): 블롭 영역 (포함), count: 픽셀 수
+Target = namedtuple('Target', ['x', 'y', 'x0', 'y0', 'x1', 'y1', 'count'])
+
+# clicked / rejected: 클릭한 / 재확인에서 빠진 대상, stopped: 중간에 중지됨
+SweepResult = namedtuple('SweepResult', ['clicked', 'rejected', 'stopped', 'duration'])
+
+# 한 번에 클릭할 최대 대상 수 (나머지는 다음 프레임에서)
+MAX_SWEEP_TARGETS = 8
+# 이동 중 대상 재탐색 범위 (블롭 영역 바깥 px)
+RELOCATE_MARGIN = 40
+# 최단 경로 정책에서 2-opt 개선을 적용할 최대 대상 수
+_TWO_OPT_LIMIT = 12
+
+
+def target_from_blob(blob, left, top):
+    """프레임 좌표 Blob → 화면 좌표 Target"""
+    return Target(left + int(round(blob.cx)), top + int(round(blob.cy)),
+                  left + blob.x0, top + blob.y0, left + blob.x1, top + blob.y1, blob.count)
+
+
+# =========================================
+# 정렬 정책 - policy(targets, cursor) → 클릭 순서 목록
+# =========================================
+def _dist(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def path_length(cursor, targets):
+    """커서에서 출발해 targets 순서로 이동하는 총 거리"""
+    total, pos = 0.0, cursor
+    for t in targets:
+        total += _dist(pos, (t.x, t.y))
+        pos = (t.x, t.y)
+    return total
+
+
+def order_color(targets, cursor):
+    """색상 목록 순서 그대로 (기존 동작)"""
+    return list(targets)
+
+
+def order_nearest(targets, cursor):
+    """커서에서 가까운 순"""
+    return sorted(targets, key=lambda t: _dist(cursor, (t.x, t.y)))
+
+
+def order_largest(targets, cursor):
+    """픽셀이 많은 (큰 글씨) 순"""
+    return sorted(targets, key=lambda t: -t.count)
+
+
+def order_path(targets, cursor):
+    """총 이동 거리가 짧은 순서 - 최근접 이웃 경로 후 2-opt 개선 (끝점 자유)"""
+    remaining = list(targets)
+    route, pos = [], cursor
+    while remaining:
+        nearest = min(remaining, key=lambda t: _dist(pos, (t.x, t.y)))
+        remaining.remove(nearest)
+        route.append(nearest)
+        pos = (nearest.x, nearest.y)
+
+    if 3 <= len(route) <= _TWO_OPT_LIMIT:
+        points = [cursor] + [(t.x, t.y) for t in route]
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(points) - 1):
+                for j in range(i + 1, len(points)):
+                    # 구간 [i, j] 를 뒤집었을 때 바뀌는 두 간선만 비교 (j 가 끝이면 간선 하나)
+                    before = _dist(points[i - 1], points[i])
+                    after = _dist(points[i - 1], points[j])
+                    if j + 1 < len(points):
+                        before += _dist(points[j], points[j + 1])
+                        after += _dist(points[i], points[j + 1])
+                    if after < before - 1e-9:
+                        points[i:j + 1] = points[i:j + 1][::-1]
+                        route[i - 1:j] = route[i - 1:j][::-1]
+                        improved = True
+    return route
+
+
+# 이름 → (표시 이름, 정책 함수)
+TARGET_POLICIES = {
+    'path': ("최단 경로", order_path),
+    'nearest': ("가까운 순", order_nearest),
+    'largest': ("큰 글씨 순", order_largest),
+    'color': ("색상 순서", order_color),
+}
+DEFAULT_POLICY = 'path'
+
+
+def register_policy(name, label, policy):
+    """정렬 정책 추가 - policy(targets, cursor) → 목록"""
+    TARGET_POLICIES[name] = (label, policy)
+
+
+def policy_label(name):
+    return TARGET_POLICIES.get(name, TARGET_POLICIES[DEFAULT_POLICY])[0]
+
+
+def policy_from_label(label):
+    for name, (text, _) in TARGET_POLICIES.items():
+        if text == label:
+            return name
+    return DEFAULT_POLICY
+
+
+def order_targets(targets, cursor, policy=DEFAULT_POLICY):
+    """정책 이름으로 정렬 (모르는 이름이면 기본 정책)"""
+    _, func = TARGET_POLICIES.get(policy, TARGET_POLICIES[DEFAULT_POLICY])
+    return func(targets, cursor)
+
+
+# =========================================
+# 재확인 + 클릭
+# =========================================
+def verify_target(capture, target, colors, exclude_colors=(), tol=0, exclude_range=0):
+    """대상 영역만 새로 캡처해 확인 - 대상 색상이 남아 있고 중심 주변에 제외 색상이 없으면 True"""
+    pad = max(0, exclude_range)
+    left, top = target.x0 - pad, target.y0 - pad
+    width = target.x1 - target.x0 + 1 + 2 * pad
+    height = target.y1 - target.y0 + 1 + 2 * pad
+    try:
+        patch = capture.grab(left, top, width, height)
+    except Exception:
+        return False  # 확인 못 하면 이번엔 건너뜀 (다음 프레임 검색에서 다시)
+
+    inner = patch[pad:pad + target.y1 - target.y0 + 1, pad:pad + target.x1 - target.x0 + 1]
+    if not match_mask(inner, colors, tol).any():
+        return False
+    if exclude_colors and pad > 0:
+        cx, cy = target.x - left, target.y - top
+        around = patch[max(0, cy - pad):cy + pad + 1, max(0, cx - pad):cx + pad + 1]
+        if match_mask(around, exclude_colors, tol).any():
+            return False
+    return True
+
+
+def relocate_target(capture, target, colors, tol=0, margin=RELOCATE_MARGIN, exclude_colors=(),
+                    exclude_range=0):
+    """대상 주변 (margin px) 만 캡처해 같은 블롭의 현재 위치 → Target (못 찾거나 제외되면 None)
+
+    화면이 움직여 글씨가 밀린 경우 커서 이동 중 목표를 옮기는 데 쓴다.
+    옮긴 위치는 처음 대상처럼 verify_target 의 제외 색상 확인을 다시 통과해야 한다.
+    """
+    left, top = target.x0 - margin, target.y0 - margin
+    try:
+        patch = capture.grab(left, top, target.x1 - target.x0 + 1 + 2 * margin,
+                             target.y1 - target.y0 + 1 + 2 * margin)
+        blobs = find_text_blobs(patch, colors, tol)
+    except Exception:
+        return None
+    if not blobs:
+        return None
+    nearest = min(blobs, key=lambda b: _dist((left + b.cx, top + b.cy), (target.x, target.y)))
+    moved = target_from_blob(nearest, left, top)
+    if exclude_colors and not verify_target(capture, moved, colors, exclude_colors, tol, exclude_range):
+        return None
+    return moved
+
+
+def sweep_targets(targets, click, verify=None, should_continue=None, clock=time.perf_counter):
+    """targets 순서대로 click(target) - 첫 대상은 방금 캡처한 프레임 기준이라 재확인하지 않는다"""
+    start = clock()
+    clicked, rejected = [], []
+    stopped = False
+    for i, target in enumerate(targets):
+        if should_continue is not None and not should_continue():
+            stopped = True
+            break
+        if i > 0 and verify is not None and not verify(target):
+            rejected.append(target)
+            continue
+        click(target)
+        clicked.append(target)
+    return SweepResult(clicked, rejected, stopped, clock() - start)
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _benchmark(n_targets=5, trials=200, seed=0):
+    import numpy as np
+
+    from utils.screen_capture import ArrayBackend, ScreenCapture
+
+    rng = np.random.default_rng(seed)
+    cursor = (1100, 600)
+
+    # 정책별 평균 이동 거리 (대상 n 개가 동시에 떨어진 경우)
+    totals = {name: 0.0 for name in TARGET_POLICIES}
+    for _ in range(trials):
+        targets = [Target(int(x), int(y), int(x) - 40, int(y) - 6, int(x) + 40, int(y) + 6, int(c))
+                   for x, y, c in zip(rng.integers(100, 2100, n_targets), rng.integers(100, 1100, n_targets),
+                                      rng.integers(200, 900, n_targets))]
+        for name in TARGET_POLICIES:
+            totals[name] += path_length(cursor, order_targets(targets, cursor, name))
+    print(f"대상 {n_targets}개 이동 거리 (평균 {trials}회):")
+    for name, total in totals.items():
+        print(f"  {policy_label(name):8s}: {total / trials:7.0f} px")
+
+    # 재확인 캡처 vs 전체 화면 재검색 (계산 시간)
+    from constants import DEFAULT_COLORS
+    from utils.color_match import colors_to_bgr
+
+    frame = rng.integers(0, 120, size=(1200, 2200, 4), dtype=np.uint8)
+    bgr = colors_to_bgr(DEFAULT_COLORS).astype(np.uint8)
+    frame[600:612, 800:880, :3] = bgr[0]
+    capture = ScreenCapture(ArrayBackend(frame))
+    target = Target(840, 606, 800, 600, 879, 611, 960)
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        find_text_blobs(capture.grab(0, 0, 2200, 1200), DEFAULT_COLORS, 0, 5)
+    rescan_ms = (time.perf_counter() - t0) / 20 * 1000
+
+    t0 = time.perf_counter()
+    for _ in range(200):
+        ok = verify_target(capture, target, DEFAULT_COLORS, [["#37EAD5", "#37EAD5"]], 0, 3)
+    verify_ms = (time.perf_counter() - t0) / 200 * 1000
+    print(f"다음 대상 확인: 전체 재검색 {rescan_ms:.2f} ms | 주변 재확인 {verify_ms:.3f} ms (결과 {ok})")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+템플릿 매칭 (FFT 상관 + 적분 영상 + 피라미드)
+
+SSD = Σ(I²) - 2·Σ(I·T) + Σ(T²) 를 적분 영상(Σ I²)과 FFT 상호상관(Σ I·T)으로
+한 번에 계산한다. 가장 작은 피라미드 단계에서 전체를 계산한 뒤 후보 주변만
+원본 해상도로 좁혀 가며, 마지막에는 기존과 같은 평균 절대 차이 유사도로 채점한다.
+벤치마크: python -m utils.template_match
+"""
+
+import numpy as np
+
+try:
+    from scipy import fft as _fft
+except ImportError:
+    _fft = None
+
+# 가장 작은 단계에서도 템플릿 짧은 변이 이 크기 이상이 되도록 축소
+MIN_TEMPLATE_SIDE = 8
+# 가장 작은 단계에서 다음 단계로 넘길 후보 수
+COARSE_CANDIDATES = 5
+# 단계마다 후보 주변을 다시 검색할 반경 (픽셀)
+REFINE_RADIUS = 2
+
+
+def downsample(image):
+    """2x2 평균으로 절반 크기 축소 (H, W, C) float32"""
+    h, w = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    image = image[:h, :w]
+    return (image[0::2, 0::2] + image[1::2, 0::2] + image[0::2, 1::2] + image[1::2, 1::2]) * 0.25
+
+
+def window_sums(values, h, w):
+    """적분 영상으로 모든 (h, w) 창의 합 → (H-h+1, W-w+1)"""
+    sat = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=sat[1:, 1:])
+    return sat[h:, w:] - sat[:-h, w:] - sat[h:, :-w] + sat[:-h, :-w]
+
+
+def _fft_len(n):
+    if _fft is not None:
+        return _fft.next_fast_len(n, real=True)
+    return n
+
+
+def _rfft2(a, fshape):
+    # SciPy 는 float32 그대로, 여러 스레드로 계산 (없으면 NumPy float64)
+    if _fft is not None:
+        return _fft.rfft2(a, s=fshape, axes=(0, 1), workers=-1)
+    return np.fft.rfft2(a, s=fshape, axes=(0, 1))
+
+
+def _irfft2(a, fshape):
+    if _fft is not None:
+        return _fft.irfft2(a, s=fshape, workers=-1)
+    return np.fft.irfft2(a, s=fshape)
+
+
+class TemplateMatcher:
+    """템플릿 1개의 float 배열/피라미드/FFT 를 미리 계산해 재사용"""
+
+    def __init__(self, template):
+        template = np.asarray(template)[:, :, :3].astype(np.float32)
+        self.shape = template.shape
+        self.levels = [template]
+        while min(self.levels[-1].shape[:2]) // 2 >= MIN_TEMPLATE_SIDE:
+            self.levels.append(downsample(self.levels[-1]))
+        self._sq_sums = [float((t.astype(np.float64) ** 2).sum()) for t in self.levels]
+        self._fft_cache = {}  # (level, fft_shape) → 템플릿 스펙트럼
+
+    def _template_fft(self, level, fshape):
+        key = (level, fshape)
+        spec = self._fft_cache.get(key)
+        if spec is None:
+            flipped = self.levels[level][::-1, ::-1]
+            spec = _rfft2(np.ascontiguousarray(flipped), fshape)
+            self._fft_cache[key] = spec
+        return spec
+
+    def ssd_map(self, image, level=0):
+        """image 의 모든 위치에 대한 SSD 맵 (H-h+1, W-w+1)"""
+        tmpl = self.levels[level]
+        H, W = image.shape[:2]
+        h, w = tmpl.shape[:2]
+        fshape = (_fft_len(H + h - 1), _fft_len(W + w - 1))
+        spec = _rfft2(image, fshape) * self._template_fft(level, fshape)
+        corr = _irfft2(spec.sum(axis=2), fshape)[h - 1:H, w - 1:W]
+        energy = window_sums((image.astype(np.float64) ** 2).sum(axis=2), h, w)
+        return energy - 2 * corr + self._sq_sums[level]
+
+    def _local_ssd(self, image, level, x, y, radius):
+        """(x, y) 주변 ±radius 위치의 SSD 를 직접 계산 → (ssd, x, y) 최솟값"""
+        tmpl = self.levels[level]
+        h, w = tmpl.shape[:2]
+        best = None
+        for cy in range(max(0, y - radius), min(image.shape[0] - h, y + radius) + 1):
+            for cx in range(max(0, x - radius), min(image.shape[1] - w, x + radius) + 1):
+                d = image[cy:cy + h, cx:cx + w] - tmpl
+                ssd = float(np.einsum('ijk,ijk->', d, d))
+                if best is None or ssd < best[0]:
+                    best = (ssd, cx, cy)
+        return best
+
+    def match(self, screenshot):
+        """가장 비슷한 위치 → (similarity, (x, y))
+
+        similarity 는 기존 match_template 과 같은 1 - 평균 절대 차이 / 255.
+        """
+        th, tw = self.shape[:2]
+        sh, sw = screenshot.shape[:2]
+        if sh < th or sw < tw:
+            return 0.0, None
+
+        image = np.asarray(screenshot)[:, :, :3].astype(np.float32)
+        pyramid = [image]
+        n_levels = 1
+        while n_levels < len(self.levels):
+            nxt = downsample(pyramid[-1])
+            lh, lw = self.levels[n_levels].shape[:2]
+            if nxt.shape[0] < lh or nxt.shape[1] < lw:
+                break
+            pyramid.append(nxt)
+            n_levels += 1
+
+        # 가장 작은 단계: 전체 SSD 맵에서 후보 선택
+        top = n_levels - 1
+        ssd = self.ssd_map(pyramid[top], top)
+        k = min(COARSE_CANDIDATES, ssd.size)
+        flat = np.argpartition(ssd.ravel(), k - 1)[:k]
+        candidates = [(int(i % ssd.shape[1]), int(i // ssd.shape[1])) for i in flat]
+
+        # 큰 단계로 올라가며 후보 주변만 재검색
+        for level in range(top - 1, -1, -1):
+            refined = set()
+            for x, y in candidates:
+                _, rx, ry = self._local_ssd(pyramid[level], level, x * 2, y * 2, REFINE_RADIUS)
+                refined.add((rx, ry))
+            candidates = list(refined)
+
+        # 원본 해상도에서 기존 유사도로 채점
+        tmpl = self.levels[0]
+        best_score, best_pos = -1.0, None
+        for x, y in candidates:
+            for cy in range(max(0, y - 1), min(sh - th, y + 1) + 1):
+                for cx in range(max(0, x - 1), min(sw - tw, x + 1) + 1):
+                    diff = np.abs(image[cy:cy + th, cx:cx + tw] - tmpl)
+                    score = 1 - float(diff.mean()) / 255
+                    if score > best_score:
+                        best_score, best_pos = score, (cx, cy)
+        return best_score, best_pos
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _legacy_match(screenshot_np, template_np):
+    """기존 match_template 슬라이딩 윈도우 (비교용) → (similarity, pos)"""
+    sh, sw = screenshot_np.shape[:2]
+    th, tw = template_np.shape[:2]
+    stride = 4
+    best_match = 0
+    best_pos = None
+    for y in range(0, sh - th, stride):
+        for x in range(0, sw - tw, stride):
+            region = screenshot_np[y:y+th, x:x+tw]
+            diff = np.abs(region.astype(np.float32) - template_np.astype(np.float32))
+            similarity = 1 - (np.mean(diff) / 255)
+            if similarity > best_match:
+                best_match = similarity
+                best_pos = (x, y)
+    return best_match, best_pos
+
+
+def _synthetic_screenshot(template, width=1920, height=1080, pos=(1401, 733), seed=0):
+    """노이즈 배경 위에 템플릿을 붙인 RGB 스크린샷"""
+    rng = np.random.default_rng(seed)
+    shot = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    th, tw = template.shape[:2]
+    shot[pos[1]:pos[1] + th, pos[0]:pos[0] + tw] = template
+    return shot
+
+
+def _benchmark():
+    import os
+    import time
+    from PIL import Image
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in ("sell.png", "door.png"):
+        path = os.path.join(root, name)
+        if not os.path.exists(path):
+            print(f"{name}: 없음")
+            continue
+        template = np.array(Image.open(path).convert('RGB'))
+        shot = _synthetic_screenshot(template)
+
+        t0 = time.perf_counter()
+        legacy_score, legacy_pos = _legacy_match(shot, template)
+        legacy_t = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        matcher = TemplateMatcher(template)
+        prep_t = time.perf_counter() - t0
+
+        matcher.match(shot)  # FFT 캐시 준비
+        runs = 10
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            score, pos = matcher.match(shot)
+        fast_t = (time.perf_counter() - t0) / runs
+
+        print(f"{name} {template.shape[1]}x{template.shape[0]} on 1920x1080: "
+              f"legacy {legacy_t * 1000:8.1f} ms ({legacy_score:.3f} @ {legacy_pos}) | "
+              f"pyramid {fast_t * 1000:6.1f} ms ({score:.3f} @ {pos}) | "
+              f"prep {prep_t * 1000:.2f} ms | x{legacy_t / fast_t:.0f}")
+
+
+if __name__ == "__main__":
+    _benchmark()
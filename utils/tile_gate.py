@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+타일 단위 프레임 변화 게이트
+
+검색 영역을 타일로 나누고 이전 프레임과 달라진 타일만 색상 매칭을 다시 한다.
+변화 비교는 BGRA 픽셀을 uint32 하나로 보고 원본 해상도에서 수행하므로 결과는
+매 프레임 전체 검색과 동일하다. 바뀌지 않은 타일의 블롭은 이전 계산을 재사용한다.
+벤치마크: python -m utils.tile_gate [frames.npz]
+"""
+
+import numpy as np
+
+from utils.blob_detect import find_text_blobs, refine_blob
+from utils.color_match import match_mask
+
+# 타일 크기 (원본 픽셀 기준, step 의 배수로 맞춰짐)
+DEFAULT_TILE = 64
+# 바뀐 타일 비율이 이 값을 넘으면 전체를 한 번에 다시 매칭
+FULL_RESCAN_RATIO = 0.5
+
+
+def _pixels_u32(frame):
+    """(H, W, 3|4) BGR(A) → (H, W) uint32 (픽셀당 비교 1번)"""
+    if frame.shape[2] == 4 and frame.strides[2] == 1 and frame.strides[1] == 4:
+        return frame.view(np.uint32)[:, :, 0]
+    sub = frame.astype(np.uint32)
+    return sub[:, :, 0] | (sub[:, :, 1] << 8) | (sub[:, :, 2] << 16)
+
+
+class TileMaskCache:
+    """타일별 색상 마스크 캐시
+
+    tile_scans / tile_skips: 다시 매칭한 / 건너뛴 타일 수 (누적)
+    frame_skips: 바뀐 타일이 없어 이전 결과를 재사용한 프레임 수
+    이전 프레임은 복사하지 않고 참조로 보관하므로 넘긴 프레임을 직접 수정하면 안 된다.
+    """
+
+    def __init__(self, tile=DEFAULT_TILE):
+        self.tile = tile
+        self.tile_scans = 0
+        self.tile_skips = 0
+        self.frame_skips = 0
+        self.frames = 0
+        self.invalidate()
+
+    def invalidate(self):
+        """캐시 초기화 (다음 프레임은 전체 매칭)"""
+        self._key = None
+        self._prev = None
+        self._masks = None
+        self._tiles = None
+        self._blobs = None
+        self._refined = {}
+
+    def reset_counters(self):
+        self.tile_scans = self.tile_skips = self.frame_skips = self.frames = 0
+
+    def _changed_tiles(self, pixels, px):
+        """원본 픽셀 기준 바뀐 타일 (ty, tx) bool 배열 - 바뀐 행 띠만 열 방향으로 나눔"""
+        diff = pixels != self._prev
+        h, w = diff.shape
+        n_ty, n_tx = -(-h // px), -(-w // px)
+        tiles = np.zeros((n_ty, n_tx), dtype=bool)
+        rows = np.zeros(n_ty * px, dtype=bool)
+        rows[:h] = diff.any(axis=1)
+        cols = np.zeros(n_tx * px, dtype=bool)
+        for ty in np.nonzero(rows.reshape(n_ty, px).any(axis=1))[0]:
+            cols[:w] = diff[ty * px:(ty + 1) * px].any(axis=0)
+            tiles[ty] = cols.reshape(n_tx, px).any(axis=1)
+        return tiles
+
+    def match(self, frame, colors, tol=0, step=1):
+        """match_mask 와 같은 (K, H', W') 마스크 - 바뀐 타일만 다시 계산
+
+        반환값: (masks, changed) - changed 는 이전 프레임 대비 바뀐 부분이 있으면 True
+        """
+        step = max(1, step)
+        self.frames += 1
+        cell = max(1, self.tile // step)   # 샘플 격자 기준 타일 크기
+        px = cell * step                   # 원본 픽셀 기준 타일 크기
+        key = (tuple(c[0] if isinstance(c, (list, tuple)) else c for c in colors),
+               tol, step, frame.shape)
+        pixels = _pixels_u32(frame)
+        h, w = pixels.shape
+
+        if key != self._key or self._prev is None:
+            self._key = key
+            self._prev = pixels
+            self._masks = match_mask(frame, colors, tol, step)
+            self._tiles = np.ones((-(-h // px), -(-w // px)), dtype=bool)
+            self._blobs = None
+            self._refined = {}
+            self.tile_scans += self._tiles.size
+            return self._masks, True
+
+        tiles = self._changed_tiles(pixels, px)
+        n_changed = int(tiles.sum())
+        self.tile_skips += tiles.size - n_changed
+        self.tile_scans += n_changed
+        self._tiles = tiles
+        if n_changed == 0:
+            self.frame_skips += 1
+            return self._masks, False
+
+        if n_changed > tiles.size * FULL_RESCAN_RATIO:
+            self._masks = match_mask(frame, colors, tol, step)
+        else:
+            for ty, tx in zip(*np.nonzero(tiles)):
+                ty, tx = int(ty), int(tx)
+                sub = frame[ty * px:(ty + 1) * px, tx * px:(tx + 1) * px]
+                self._masks[:, ty * cell:(ty + 1) * cell, tx * cell:(tx + 1) * cell] = \
+                    match_mask(sub, colors, tol, step)
+        self._prev = pixels
+        return self._masks, True
+
+    def find_text_blobs(self, frame, colors, tol=0, step=1, gap=1, min_pixels=1):
+        """find_text_blobs 와 같은 결과 - 바뀌지 않은 부분은 이전 계산 재사용"""
+        masks, changed = self.match(frame, colors, tol, step)
+        if not changed and self._blobs is not None:
+            return self._blobs
+
+        step = max(1, step)
+        cell = max(1, self.tile // step)
+        tiles = self._tiles
+        previous = self._refined
+        refined = {}
+
+        def refine(blob):
+            # 원본 해상도 계산 창 (샘플 격자 ±1칸) 이 걸친 타일이 그대로면 재사용
+            ty0, ty1 = max(0, blob.y0 - 1) // cell, (blob.y1 + 1) // cell
+            tx0, tx1 = max(0, blob.x0 - 1) // cell, (blob.x1 + 1) // cell
+            result = previous.get(blob)
+            if result is None or tiles[ty0:ty1 + 1, tx0:tx1 + 1].any():
+                result = refine_blob(frame, blob, colors, tol, step)
+            refined[blob] = result
+            return result
+
+        self._blobs = find_text_blobs(frame, colors, tol, step, gap, min_pixels,
+                                      masks=masks, refine=refine)
+        self._refined = refined
+        return self._blobs
+
+    def stats_text(self):
+        total = self.tile_scans + self.tile_skips
+        ratio = self.tile_skips / total if total else 0.0
+        return f"타일 건너뜀 {ratio:.0%} ({self.frame_skips}/{self.frames} 프레임 재사용)"
+
+
+# =========================================
+# 벤치마크
+# =========================================
+def _synthetic_sequence(width=2131, height=1161, n_frames=60, idle_every=0, seed=0):
+    """대부분 정지된 화면 + 움직이는 120x120 영역 (캐릭터/이펙트)
+
+    idle_every > 0 이면 그 간격마다 움직임 없는 프레임을 넣는다.
+    """
+    from constants import DEFAULT_COLORS
+    from utils.color_match import _synthetic_frame
+
+    base = _synthetic_frame(width, height, DEFAULT_COLORS, seed)
+    rng = np.random.default_rng(seed + 1)
+    frames = []
+    for i in range(n_frames):
+        if idle_every and i % idle_every and frames:
+            frames.append(frames[-1])
+            continue
+        frame = base.copy()
+        x = 200 + (i * 17) % (width - 400)
+        frame[500:620, x:x + 120] = rng.integers(0, 255, size=(120, 120, 4), dtype=np.uint8)
+        frames.append(frame)
+    return frames, DEFAULT_COLORS
+
+
+def _benchmark(path=None):
+    import time
+    from constants import DEFAULT_COLORS
+
+    if path:
+        # 녹화 파일: frames (N, H, W, 4) BGRA
+        sequences = [(path, list(np.load(path)['frames']), DEFAULT_COLORS)]
+    else:
+        sequences = [
+            ("moving", *_synthetic_sequence()),
+            ("idle 3/4", *_synthetic_sequence(idle_every=4)),
+        ]
+    step, tol = 5, 0
+
+    for name, frames, colors in sequences:
+        t0 = time.perf_counter()
+        full = [find_text_blobs(f, colors, tol, step) for f in frames]
+        full_t = (time.perf_counter() - t0) / len(frames)
+
+        for tile in (32, 64, 128):
+            cache = TileMaskCache(tile)
+            t0 = time.perf_counter()
+            gated = [cache.find_text_blobs(f, colors, tol, step) for f in frames]
+            gated_t = (time.perf_counter() - t0) / len(frames)
+            same = gated == full
+            print(f"{name:9s} tile {tile:3d}: full {full_t * 1000:6.2f} ms | gated {gated_t * 1000:6.2f} ms "
+                  f"| x{full_t / gated_t:.1f} | {cache.stats_text()} | same: {same}")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+게임 UI 상태 분류기
+
+상태별로 픽셀 프로브/작은 템플릿 서명을 등록하고, 한 번의 평가로 모두 판정한다.
+캡처는 프로브 묶음 (utils.pixel_probe.group_probes) 과 같은 방식으로 가까운 영역끼리만 묶어서 한다.
+원시 판정이 debounce 틱 연속으로 같을 때만 상태를 바꾸고 구독자에게 알린다.
+"""
+
+import threading
+from enum import Enum
+
+from utils.pixel_probe import PixelProbeSet, group_regions
+
+
+class UiState(Enum):
+    NONE = "none"
+    INVENTORY = "inventory"   # 인벤토리 열림
+    SELL = "sell"             # 상인 판매창 열림
+    STASH = "stash"           # 창고 열림
+
+
+class FrameView:
+    """캡처해 둔 영역들을 ScreenCapture 처럼 조회 (어느 영역에도 없으면 원본 캡처로 폴백)"""
+
+    def __init__(self, frames, capture):
+        self.frames = frames  # [(frame, left, top), ...]
+        self.capture = capture
+
+    def region(self, left, top, width, height, max_age=0.0):
+        for frame, fl, ft in self.frames:
+            x0, y0 = left - fl, top - ft
+            fh, fw = frame.shape[:2]
+            if 0 <= x0 and 0 <= y0 and x0 + width <= fw and y0 + height <= fh:
+                return frame[y0:y0 + height, x0:x0 + width]
+        return self.capture.region(left, top, width, height, max_age)
+
+
+class UiStateClassifier:
+    """UI 상태 분류 + 디바운스 + 구독
+
+    서명은 등록 순서대로 평가하며 먼저 일치한 상태가 선택된다.
+    (판매창처럼 인벤토리를 포함하는 상태를 먼저 등록)
+    """
+
+    def __init__(self, debounce=3):
+        self.debounce = debounce
+        self.probes = PixelProbeSet()
+        self._signatures = []  # [(state, kind, spec), ...]
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.state = UiState.NONE
+        self.last_frame = None  # 마지막 classify 에서 캡처한 영역 목록 (변화 감지용)
+        self._candidate = UiState.NONE
+        self._streak = 0
+
+    # ----- 서명 등록 -----
+    def add_probe_signature(self, state, probe_names, require_all=False):
+        """이미 self.probes 에 등록된 프로브 이름들로 상태 판정"""
+        with self._lock:
+            self._signatures.append((state, 'probe', (tuple(probe_names), require_all)))
+
+    def add_template_signature(self, state, matcher, region, threshold=0.8):
+        """region (left, top, width, height) 안에서 TemplateMatcher 유사도로 상태 판정
+
+        캡처는 BGRA 이므로 matcher 도 BGR 순서 배열로 만들어야 한다.
+        """
+        with self._lock:
+            self._signatures.append((state, 'template', (matcher, tuple(region), threshold)))
+
+    def subscribe(self, callback):
+        """callback(old_state, new_state) - 디바운스된 상태가 바뀔 때 (분류 스레드에서) 호출"""
+        self._subscribers.append(callback)
+
+    # ----- 평가 -----
+    def _capture_regions(self, signatures):
+        """프로브 묶음 영역 + 템플릿 영역을 가까운 것끼리 묶은 캡처 영역 목록
+
+        전부를 덮는 경계 하나로 캡처하면 멀리 떨어진 프로브 사이 화면까지 읽으므로
+        프로브 묶음과 같은 면적 한도 (max_area) 로 묶는다.
+        """
+        boxes = self.probes.regions()
+        boxes += [spec[1] for _, kind, spec in signatures if kind == 'template']
+        return [bbox for bbox, _ in group_regions([(box, None) for box in boxes], self.probes.max_area)]
+
+    def regions(self):
+        """classify 가 캡처하는 영역 목록 [(left, top, width, height), ...]"""
+        with self._lock:
+            signatures = list(self._signatures)
+        return self._capture_regions(signatures)
+
+    def classify(self, capture, max_age=0.0):
+        """디바운스 없이 현재 프레임의 원시 상태 판정"""
+        with self._lock:
+            signatures = list(self._signatures)
+        regions = self._capture_regions(signatures)
+        if not regions:
+            self.last_frame = None
+            return UiState.NONE
+
+        frames = [(capture.region(*box, max_age=max_age), box[0], box[1]) for box in regions]
+        self.last_frame = [frame for frame, _, _ in frames]
+        view = FrameView(frames, capture)
+        hits = self.probes.read(view)
+        for state, kind, spec in signatures:
+            if kind == 'probe':
+                names, require_all = spec
+                values = [hits.get(name, False) for name in names]
+                if all(values) if require_all else any(values):
+                    return state
+            else:
+                matcher, (left, top, width, height), threshold = spec
+                score, _ = matcher.match(view.region(left, top, width, height))
+                if score >= threshold:
+                    return state
+        return UiState.NONE
+
+    def update(self, capture, max_age=0.0):
+        """한 틱 평가 후 디바운스된 상태 반환"""
+        return self.feed(self.classify(capture, max_age))
+
+    def feed(self, raw):
+        """원시 판정 1개 반영 → 디바운스된 상태"""
+        if raw == self._candidate:
+            self._streak += 1
+        else:
+            self._candidate = raw
+            self._streak = 1
+        if raw != self.state and self._streak >= self.debounce:
+            self._set_state(raw)
+        return self.state
+
+    @property
+    def pending(self):
+        """디바운스 확인 중인 다른 판정이 있으면 True"""
+        return self._candidate != self.state
+
+    def reset(self):
+        """감지 중지 시 NONE 으로 즉시 전환"""
+        self._candidate = UiState.NONE
+        self._streak = 0
+        if self.state != UiState.NONE:
+            self._set_state(UiState.NONE)
+
+    def _set_state(self, new):
+        old, self.state = self.state, new
+        for callback in list(self._subscribers):
+            try:
+                callback(old, new)
+            except Exception as e:
+                print(f"[UiState] 구독자 오류: {e}")